@@ -8,8 +8,7 @@ WINDOW_WIDTH = 350
 WINDOW_HEIGHT = 500
 WINDOW_TITLE = '카카오톡 답변 추천 (완전 자동화 버전)'
 
-# 타이머 설정 (밀리초)
-WINDOW_SCAN_INTERVAL = 10000  # 10초마다 창 스캔
+# 타이머 설정 (밀리초, 카카오톡 창 목록은 창 이벤트로 바로 갱신되므로 주기적으로 스캔하지 않음)
 CLIPBOARD_CHECK_INTERVAL = 3000  # 3초마다 클립보드 확인
 
 # 카카오톡 대화 영역 클릭 위치 (비율)
@@ -34,6 +33,24 @@ INPUT_AREA_POSITIONS = [
 # 재시도 위치 (대화 가져오기 실패 시)
 RETRY_POSITIONS = [(0.3, 0.3), (0.7, 0.3), (0.5, 0.6)]
 
+# =====================================================
+# 🆕 대화 가져오기 방식 설정 (앞에서부터 시도해서 메시지가 하나 이상 파싱된 첫 방식 사용)
+# =====================================================
+# "uia": UI Automation으로 메시지 목록을 직접 읽음 (pip install uiautomation, 클릭 / 클립보드 사용 안 함,
+#        카카오톡 버전에 따라 메시지 형식이 달라 직접 켜야 함)
+# "archive": (상위 폴더에서) PYTHONPATH=clients_o1 python -m core.chat_archive 내보낸파일.txt 로 미리 넣어둔 대화 저장소에서 마지막 메시지들을 읽음
+#            (넣은 뒤에 온 메시지는 없으므로 "uia" / "clipboard"보다 뒤에 두세요)
+# "export": 카카오톡 "대화 내보내기"로 저장한 파일 중 대화방 이름이 맞는 가장 최근 파일을 읽음
+# "clipboard": 대화 영역 클릭 → Ctrl+A → Ctrl+C (클립보드 내용이 바뀜)
+CHAT_SOURCES = ["clipboard"]  # 예: ["uia", "clipboard", "export", "archive"]
+CHAT_EXPORT_DIR = ""  # 대화 내보내기 파일을 저장하는 폴더 (비우면 "export" 사용 안 함)
+
+# 대화 저장소 (몇 년치 내보내기 파일도 날짜 구분선 단위로 나눠 여러 프로세스로 파싱한 뒤 SQLite에 저장)
+CHAT_ARCHIVE_FILE = ""  # 저장소 파일 (예: "chat_archive.db", 비우면 "archive" 사용 안 함)
+CHAT_ARCHIVE_MESSAGES = 300  # 저장소에서 가져올 마지막 메시지 수
+CHAT_ARCHIVE_WORKERS = 0  # 파싱 프로세스 수 (0이면 CPU 수)
+CHAT_ARCHIVE_CHUNK_MB = 8  # 한 프로세스에 맡길 구간 크기 (MB)
+
 # GPT 설정
 GPT_MODEL = "gpt-3.5-turbo"
 GPT_TEMPERATURE = 0.8
@@ -49,8 +66,8 @@ FINE_TUNED_MODEL_ID = ""  # 파인튜닝된 모델 ID (예: "ft:gpt-3.5-turbo-01
 # =====================================================
 PARSER_TYPE = "date"  # "count" 또는 "date"
 
-# count: 최근 N개 메시지 기준 파싱 (chat_parser.py)
-# date: 최근 하루 기준 파싱 (chat_date_parser.py)
+# count: 최근 N개 메시지 기준 파싱 (core/chat_parser.py)
+# date: 최근 하루 기준 파싱 (core/chat_date_parser.py)
 
 # 개수 기반 파싱 설정 (PARSER_TYPE = "count"일 때)
 MAX_RECENT_MESSAGES = 20  # 최근 몇 개 메시지까지 가져올지
@@ -58,6 +75,105 @@ MAX_RECENT_MESSAGES = 20  # 최근 몇 개 메시지까지 가져올지
 # 날짜 기반 파싱 설정 (PARSER_TYPE = "date"일 때)
 DATE_LIMIT_HOURS = 24  # 최근 몇 시간까지 가져올지 (기본 24시간 = 하루)
 
+# 큰 대화 병렬 파싱 (날짜 기반 파서만, 날짜 구분선 단위로 나눠 여러 프로세스에서 파싱, 결과는 순서대로 파싱한 것과 같음)
+PARALLEL_PARSE_WORKERS = 0  # 파싱 프로세스 수 (0이면 CPU 수, 1이면 사용 안 함)
+PARALLEL_PARSE_MIN_MB = 2  # 기간 안의 구간이 이보다 큰 대화만 나눠서 파싱 (MB, 문자 수 기준)
+
+# =====================================================
+# 🆕 답변 생성 설정 (긍정/중립/부정 동시 요청)
+# =====================================================
+TONE_MAX_WORKERS = 3  # 동시에 보낼 최대 요청 수
+TONE_TIMEOUT_SECONDS = 20  # 톤별 최대 대기 시간 (초과하면 "음..."으로 대체)
+
+# separate: 톤마다 개별 프롬프트로 3번 요청 (동시에 요청)
+# combined: 한 번의 요청으로 3개 톤을 JSON으로 받음 (입력 토큰 1/3, 해석 실패 시 separate로 대체)
+TONE_GENERATION_MODE = "separate"  # 파인튜닝 모델은 JSON 형식을 잘 지키지 않을 수 있어 기본은 separate
+COMBINED_MAX_TOKENS = 300  # combined 모드 응답 최대 토큰 (답변 3개 + JSON 형식)
+STREAM_SUGGESTIONS = True  # 톤별 답변을 받는 대로 버튼에 표시하고 첫 줄이 완성되면 바로 중단 (separate 모드)
+
+# =====================================================
+# 🆕 답변 캐시 설정 (같은 대화로 다시 생성하면 API를 다시 호출하지 않음)
+# =====================================================
+SUGGESTION_CACHE_ENABLED = True
+SUGGESTION_CACHE_SIZE = 256  # 메모리에 보관할 최대 답변 수
+SUGGESTION_CACHE_TTL_SECONDS = 3600  # 답변 보관 시간 (초)
+SUGGESTION_CACHE_DB = ""  # SQLite 파일 경로 (예: "suggestion_cache.db", 비우면 메모리만 사용)
+SUGGESTION_CACHE_LAST_MESSAGES = 20  # 캐시 키에 사용할 마지막 메시지 수
+
+# 자동 모드 답변 미리 생성 (상대방 메시지가 오면 클릭 전에 답변을 만들어 캐시에 저장, 답변 캐시와 MY_CHAT_NAMES 필요)
+SPECULATIVE_GENERATION = False
+SPECULATION_DEBOUNCE_MS = 1500  # 대화가 이 시간 동안 바뀌지 않으면 생성 시작 (밀리초)
+SPECULATION_MAX_CALLS_PER_HOUR = 30  # 미리 생성에 쓸 시간당 최대 API 호출 수
+MY_CHAT_NAMES = []  # 내 카카오톡 이름 (마지막 메시지가 내 것이면 미리 생성하지 않음, 비우면 미리 생성 안 함)
+
+# =====================================================
+# 🆕 HTTP 연결 설정 (API 서버 연결을 재사용해서 TLS 연결 시간 절약)
+# =====================================================
+HTTP_POOL_SIZE = 10  # 최대 동시 연결 수
+HTTP_KEEPALIVE_SECONDS = 60  # 쓰지 않는 연결을 유지할 시간 (초)
+HTTP_CONNECT_TIMEOUT = 5  # 연결 제한 시간 (초)
+HTTP_READ_TIMEOUT = 30  # 응답 제한 시간 (초)
+HTTP_USE_HTTP2 = True  # h2 패키지가 설치되어 있으면 HTTP/2 사용
+HTTP_WARMUP_ON_SELECT = True  # 카카오톡 창을 선택하면 API 서버에 미리 연결
+
+# 디버그 통계 표시 (HTTP 요청 / 새 연결 / 재사용 횟수)
+SHOW_DEBUG_STATS = False
+DEBUG_STATS_INTERVAL = 1000  # 갱신 주기 (밀리초)
+
+# =====================================================
+# 🆕 답변 생성 백엔드 설정 (실행할 때 --provider로 바꿀 수 있음)
+# =====================================================
+# "anthropic": Claude / "openai": 기본 GPT 모델 / "openai_finetuned": 파인튜닝된 고경우 GPT 모델
+# 선택한 백엔드의 SDK만 불러오므로 나머지 SDK는 설치하지 않아도 됩니다.
+# SDK import와 API 클라이언트 생성은 창을 띄운 뒤 작업 스레드에서 합니다.
+PROVIDER_WARMUP_DELAY_MS = 300  # 창을 띄우고 이 시간 뒤에 미리 생성 (-1이면 첫 답변 요청 때 생성)
+SUGGESTION_PROVIDER = "openai_finetuned"
+
+# 다른 백엔드로 바꿔 실행할 때 사용하는 설정
+ANTHROPIC_API_KEY = ""
+CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
+CLAUDE_TEMPERATURE = 0.8
+CLAUDE_MAX_TOKENS = 150
+USE_KOKYUNGWOO_MODE = True  # Claude 백엔드에서 고경우 프롬프트 사용
+
+# Claude 모델 선택 옵션 (--provider anthropic으로 실행할 때)
+CLAUDE_MODEL_OPTIONS = {
+    "claude-3-5-sonnet-20241022": "Claude 3.5 Sonnet (최신, 고성능)",
+    "claude-3-5-haiku-20241022": "Claude 3.5 Haiku (빠름, 경제적)",
+    "claude-3-opus-20240229": "Claude 3 Opus (최고 성능)",
+}
+ENABLE_MODEL_SELECTION = False  # 모델 선택 UI 표시 여부
+
+# 톤별 지시 (프롬프트 캐시가 재사용되도록 요청마다 같은 내용이어야 하므로 상수로 고정)
+# 고경우 모드
+KOKYUNGWOO_TONE_INSTRUCTIONS = {
+    "긍정적": """🎯 긍정적이고 밝은 고경우 답변을 해주세요:
+- 밝고 적극적인 반응
+- ㅋㅋ, ㅇㅇ 같은 긍정적 감정표현 사용
+- "좋아", "ㄱㄱ", "오케이" 등의 긍정어 활용
+- 예: "ㅇㅇ 좋지 ㅋㅋ", "ㄱㄱ해보자", "오케이~"
+""",
+    "중립적": """🎯 중립적이고 무난한 고경우 답변을 해주세요:
+- 균형잡힌 무난한 반응
+- "음...", "그냥", "몰루" 등의 중립적 표현
+- 강한 감정 없이 담담하게
+- 예: "음... 그냥그냥", "몰루", "아무거나"
+""",
+    "부정적": """🎯 부정적이고 소극적인 고경우 답변을 해주세요:
+- 조심스럽거나 소극적인 반응
+- ㅠㅠ, ㅗㅜ 같은 부정적 감정표현 사용
+- "싫어", "ㄴㄴ", "망했다" 등의 부정어 활용
+- 예: "ㄴㄴ 싫어", "망햇지 ㅠㅠ", "RIP"
+""",
+}
+
+# 기본 모드
+BASIC_TONE_INSTRUCTIONS = {
+    "긍정적": "밝고 적극적이며 긍정적인 톤으로 답변해주세요. 상황을 낙관적으로 보고 활발한 반응을 보이세요.",
+    "중립적": "균형잡히고 무난한 톤으로 답변해주세요. 과도한 감정 표현 없이 객관적이고 차분하게 반응하세요.",
+    "부정적": "조심스럽고 소극적인 톤으로 답변해주세요. 상황에 대해 걱정스럽거나 부정적인 시각으로 반응하세요.",
+}
+
 # =====================================================
 
 # 기본 모델용 시스템 프롬프트 - 긍정/중립/부정 구분
@@ -191,17 +307,53 @@ STYLES = {
     """,
 }
 
+# 화면 테마 (문구 / 색상, core/ui_components.py와 core/app.py에서 사용)
+THEME = {
+    'brand': "",  # 상태 / 알림 문구 앞에 붙는 이름 (비우면 안 붙임)
+    'title': "카카오톡 답변 도우미",
+    'chat_placeholder': (
+        "1. 카카오톡 창을 선택하세요\n"
+        "2. '대화 가져오기' 버튼을 클릭하세요\n"
+        "3. 답변을 생성하고 선택하세요"
+    ),
+    'generate_button': "🤖 답변 추천 받기",  # {provider}는 사용 중인 백엔드 이름
+    'generate_color': COLORS['primary'],
+    'generate_hover': COLORS['primary_hover'],
+    'generate_text_color': '#3C1E1E',
+    'suggestion_title': "💬 고경우 답변 추천 (클릭하여 전송)",
+    'suggestion_title_color': COLORS['text'],
+    'suggestion_frame_border': f"1px solid {COLORS['border']}",
+    'suggestion_colors': ['#E6FFFA', '#F0F9FF', '#FFF5E6'],  # 긍정 / 중립 / 부정
+    'suggestion_border': '#E2E8F0',
+    'suggestion_hover': '#CBD5E0',
+    'suggestion_hover_border': '#A0AEC0',
+    'loading_text': "답변 생성 중...",
+    'window_style': "",  # 메인 창에 덧붙일 스타일
+}
+
 # 최소 대화 내용 길이
 MIN_CHAT_LENGTH = 10
 
 # 지연 시간 (초)
+# 상태를 확인할 수 있는 대기(포커스 / 선택 / 복사)는 최대 대기 시간으로, 확인할 수 없는 대기는 고정 대기 시간으로 사용
 DELAYS = {
-    'click_stabilize': 0.2,
-    'key_input': 0.01,
     'focus_wait': 0.3,
+    'select_wait': 0.3,
     'copy_wait': 0.5,
     'paste_wait': 0.3,
     'send_wait': 0.5,
 }
 
-# =====================================================
\ No newline at end of file
+# =====================================================
+
+# =====================================================
+# 🆕 대기 설정 (고정 sleep 대신 포커스 / 클립보드 변경을 확인하며 대기)
+# =====================================================
+ADAPTIVE_WAITS = True  # False면 예전처럼 DELAYS 시간만큼 기다림
+WAIT_POLL_INITIAL = 0.005  # 처음 확인 간격 (초, 확인할 때마다 1.5배씩 늘어남)
+WAIT_POLL_MAX = 0.02  # 최대 확인 간격 (초)
+WAIT_TIMEOUT_MARGIN = 3.0  # 최대 대기 시간 = 최근 대기 시간 95% 지점 x 이 값 (DELAYS 값을 넘지 않음, focus_wait는 줄이지 않음)
+WAIT_STATS_FILE = "wait_stats.json"  # 관측한 대기 시간 저장 파일 (비우면 저장 안 함)
+
+# 직접 입력 (붙여넣기가 안 될 때): 글자마다 입력하지 않고 SendInput 한 번에 묶어서 입력
+TYPE_CHUNK_UNITS = 200  # 한 번에 보낼 최대 글자 수 (UTF-16 코드 단위, 이모지는 2개)
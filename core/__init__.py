@@ -0,0 +1,4 @@
+# core - 세 클라이언트(clients / clients_o1 / client_claude)가 함께 쓰는 모듈
+#
+# 각 클라이언트 폴더에는 config.py(설정 / 화면 테마 / 기본 답변 생성 백엔드)와 실행용 main.py만 있습니다.
+# 모듈은 실행한 폴더의 config를 "from config import ..."로 불러옵니다.
@@ -0,0 +1,1120 @@
+# app.py - 메인 애플리케이션 (각 클라이언트 폴더의 main.py가 그 폴더의 config로 실행)
+
+import argparse
+import sys
+import time
+import traceback
+
+STARTED_AT = time.perf_counter()  # 창을 띄우기까지 걸린 시간 측정용
+
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QMessageBox, QComboBox
+from PyQt5.QtCore import Qt, QPoint, QTimer
+from PyQt5.QtGui import QFont
+
+# 로컬 모듈들
+import config
+from config import *
+from .window_handler import SafeWindowHandler
+from .chat_source import create_chat_sources
+from .window_scanner import WindowManager
+from .ui_components import UIComponents
+from .incremental_parser import IncrementalCountParser, IncrementalDateParser
+from .clipboard_watcher import ClipboardWatcher
+from .tone_runner import ToneRunner, TONES, FALLBACK_SUGGESTION
+from .tone_response import build_combined_instruction, clean_suggestion, parse_multi_tone_response, FirstLineStream
+from .suggestion_cache import SuggestionCache, make_cache_key
+from .prompt_cache import TokenUsage
+from .providers import PROVIDER_LABELS, create_provider, resolve_provider_name
+from .workers import TaskWorker, TaskCancelled, FrameTimeProbe, shutdown_workers
+from .http_transport import PooledTransport
+from .speculation import HourlyBudget, should_speculate
+
+# 파서 선택에 따른 import
+if PARSER_TYPE == "date":
+    from .chat_date_parser import KakaoTalkDateParser as ChatParser
+
+    PARSER_NAME = "날짜 기반 파서"
+    PARSER_DESCRIPTION = f"최근 {DATE_LIMIT_HOURS}시간"
+else:  # PARSER_TYPE == "count" (기본값)
+    from .chat_parser import KakaoTalkChatParser as ChatParser
+
+    PARSER_NAME = "개수 기반 파서"
+    PARSER_DESCRIPTION = f"최근 {MAX_RECENT_MESSAGES}개 메시지"
+
+# 상태 / 알림 문구 앞에 붙는 브랜드 이름 (config의 THEME, 예: "Claude ")
+BRAND_PREFIX = f"{THEME['brand']} " if THEME['brand'] else ""
+
+# API 클라이언트가 함께 쓰는 HTTP 연결 풀 (keep-alive로 TLS 연결 재사용)
+http_transport = PooledTransport(HTTP_POOL_SIZE, HTTP_KEEPALIVE_SECONDS, HTTP_CONNECT_TIMEOUT,
+                                 HTTP_READ_TIMEOUT, HTTP_USE_HTTP2)
+
+
+class KakaoTalkAssistant(QWidget):
+    """카카오톡 답변 추천 메인 애플리케이션"""
+
+    def __init__(self, provider):
+        super().__init__()
+
+        # 윈도우 설정
+        window_title = WINDOW_TITLE
+
+        # 파서 정보를 타이틀에 추가
+        if PARSER_TYPE == "date":
+            window_title += f" - 날짜 모드 ({DATE_LIMIT_HOURS}시간)"
+        else:
+            window_title += f" - 개수 모드 ({MAX_RECENT_MESSAGES}개)"
+
+        if provider.persona_mode:
+            window_title += " - 고경우 모드"
+
+        self.setWindowTitle(window_title)
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+        # 창 크기 및 위치
+        self.resize(WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.position_window()
+
+        # 변수 초기화
+        self.window_manager = WindowManager()
+        # 선택된 파서 사용 (날짜 파서는 DATE_LIMIT_HOURS 범위 적용)
+        # 자동 모드 클립보드는 증분 파싱 (같은 대화에 몇 줄만 늘어나면 새로 붙은 부분만 파싱)
+        if PARSER_TYPE == "date":
+            self.chat_parser = ChatParser(limit_hours=DATE_LIMIT_HOURS)
+            self.incremental_parser = IncrementalDateParser(self.chat_parser)
+        else:
+            self.chat_parser = ChatParser()
+            self.incremental_parser = IncrementalCountParser(self.chat_parser, MAX_RECENT_MESSAGES)
+        self.old_pos = None
+        self.dragging = False
+        self.clipboard_watcher = ClipboardWatcher()
+        self.chat_source = None  # 대화 가져오기 백엔드 (처음 가져올 때 작업 스레드에서 생성)
+        self.parallel_parser = None  # 큰 대화 병렬 파싱 드라이버 (처음 파싱할 때 생성)
+        self.tone_runner = ToneRunner(TONE_MAX_WORKERS, TONE_TIMEOUT_SECONDS)
+        self.provider = provider
+        self.token_usage = provider.token_usage
+        self.suggestion_cache = None
+        if SUGGESTION_CACHE_ENABLED:
+            self.suggestion_cache = SuggestionCache(SUGGESTION_CACHE_SIZE, SUGGESTION_CACHE_TTL_SECONDS,
+                                                    SUGGESTION_CACHE_DB or None)
+
+        # 작업 스레드 (가져오기 / 자동 모드 분석 / 답변 생성)
+        self.fetch_worker = None
+        self.clipboard_worker = None
+        self.generation_worker = None
+        self.frame_probe = FrameTimeProbe(parent=self)
+
+        # 자동 모드 답변 미리 생성 (클릭 전에 캐시에 저장)
+        self.speculation_worker = None
+        self.speculation_content = None
+        self.speculation_waiting = False  # 미리 생성 중에 답변 받기를 누름
+        self.speculation_budget = HourlyBudget(SPECULATION_MAX_CALLS_PER_HOUR)
+        self.provider_worker = None  # SDK import / API 클라이언트 미리 생성
+
+        # 파서 정보 출력
+        print(f"🔧 {PARSER_NAME} 활성화 - {PARSER_DESCRIPTION}")
+        print(f"🤖 답변 생성: {self.provider.display_name} ({self.provider.model})")
+
+        # UI 초기화
+        self.init_ui()
+
+        # 타이머 설정
+        self.setup_timers()
+
+        # 윈도우 스캔 시작
+        self.start_window_scanning()
+
+        # 창이 뜬 뒤 한가할 때 SDK import / API 클라이언트 생성 (첫 답변 요청이 기다리지 않도록)
+        if PROVIDER_WARMUP_DELAY_MS >= 0:
+            QTimer.singleShot(PROVIDER_WARMUP_DELAY_MS, self._prepare_provider)
+
+    def position_window(self):
+        """화면 오른쪽에 배치"""
+        screen_geometry = QApplication.desktop().screenGeometry()
+        self.move(screen_geometry.width() - self.width() - 20,
+                  screen_geometry.height() // 2 - self.height() // 2)
+
+    def setup_timers(self):
+        """타이머 설정 (창 목록은 주기적으로 스캔하지 않고 창 이벤트로 갱신)"""
+        # 클립보드 확인 타이머
+        self.clip_timer = QTimer(self)
+        self.clip_timer.timeout.connect(self.check_clipboard)
+
+        # 답변 미리 생성 대기 타이머 (대화가 계속 바뀌는 동안은 기다림)
+        self.speculation_timer = QTimer(self)
+        self.speculation_timer.setSingleShot(True)
+        self.speculation_timer.timeout.connect(self._start_speculation)
+
+        # 디버그 통계 갱신 타이머
+        if SHOW_DEBUG_STATS:
+            self.debug_timer = QTimer(self)
+            self.debug_timer.timeout.connect(self.update_debug_stats)
+            self.debug_timer.start(DEBUG_STATS_INTERVAL)
+
+    def init_ui(self):
+        """UI 초기화"""
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(10, 10, 10, 10)
+
+        # 타이틀 바
+        title_frame, close_button = UIComponents.create_title_frame()
+        close_button.clicked.connect(self.close)
+        main_layout.addWidget(title_frame)
+
+        # 상태 표시
+        self.status_label = UIComponents.create_status_label()
+        main_layout.addWidget(self.status_label)
+
+        # 디버그 통계 (연결 재사용 등)
+        if SHOW_DEBUG_STATS:
+            self.debug_stats_label = UIComponents.create_debug_stats_label()
+            main_layout.addWidget(self.debug_stats_label)
+
+        # 창 선택 영역
+        window_frame, self.window_combo, refresh_btn = UIComponents.create_window_selection_frame()
+        self.window_combo.currentTextChanged.connect(self.on_window_selected)
+        refresh_btn.clicked.connect(self.scan_kakao_windows)
+        main_layout.addWidget(window_frame)
+
+        # Claude 모델 선택 (선택 사항, Claude 백엔드일 때만)
+        if ENABLE_MODEL_SELECTION and self.provider.name == "anthropic":
+            model_frame, self.model_combo = self.create_model_selection_frame()
+            main_layout.addWidget(model_frame)
+
+        # 대화 내용 영역
+        self.chat_text = UIComponents.create_chat_text_area()
+        main_layout.addWidget(self.chat_text)
+
+        # 버튼 영역
+        button_layout, fetch_btn, self.auto_btn, generate_btn = UIComponents.create_button_layout(self.provider.label)
+        fetch_btn.clicked.connect(self.safe_fetch_chat)
+        self.auto_btn.clicked.connect(self.toggle_auto_mode)
+        generate_btn.clicked.connect(self.generate_suggestions)
+        main_layout.addLayout(button_layout)
+
+        # 추천 답변 영역
+        self.suggestions_frame, self.suggestion_buttons = UIComponents.create_suggestions_frame()
+        for i, btn in enumerate(self.suggestion_buttons):
+            btn.clicked.connect(lambda checked, idx=i: self.safe_use_suggestion(idx))
+        main_layout.addWidget(self.suggestions_frame)
+
+        self.setLayout(main_layout)
+        UIComponents.set_main_window_style(self)
+
+    def create_model_selection_frame(self):
+        """Claude 모델 선택 프레임 생성"""
+        from PyQt5.QtWidgets import QFrame, QLabel
+
+        frame = QFrame()
+        frame.setStyleSheet(STYLES['window_frame'])
+        layout = QVBoxLayout(frame)
+
+        label = QLabel("Claude 모델:")
+        label.setFont(QFont("맑은 고딕", 9, QFont.Bold))
+        layout.addWidget(label)
+
+        model_combo = QComboBox()
+        model_combo.setStyleSheet(STYLES['combo_box'])
+
+        # 모델 옵션 추가
+        for model_id, model_name in CLAUDE_MODEL_OPTIONS.items():
+            model_combo.addItem(model_name, model_id)
+
+        # 기본 모델 선택
+        try:
+            default_index = list(CLAUDE_MODEL_OPTIONS.keys()).index(self.provider.model)
+            model_combo.setCurrentIndex(default_index)
+        except ValueError:
+            # 기본 모델이 목록에 없으면 첫 번째로 설정
+            model_combo.setCurrentIndex(0)
+            self.provider.model = list(CLAUDE_MODEL_OPTIONS.keys())[0]
+
+        model_combo.currentIndexChanged.connect(self.on_model_changed)
+        layout.addWidget(model_combo)
+
+        return frame, model_combo
+
+    def on_model_changed(self, index):
+        """모델 변경 처리"""
+        model_id = self.model_combo.itemData(index)
+        if model_id:
+            self.provider.model = model_id
+            print(f"🔄 Claude 모델 변경: {model_id}")
+            UIComponents.update_status_label(
+                self.status_label,
+                f"모델 변경: {CLAUDE_MODEL_OPTIONS.get(model_id, model_id)}",
+                "info"
+            )
+
+    def start_window_scanning(self):
+        """윈도우 추적 시작 (창이 생기거나 닫히거나 제목이 바뀌면 바로 on_windows_found 호출)"""
+        self.window_manager.start_scanning(self.on_windows_found)
+
+    def scan_kakao_windows(self):
+        """카카오톡 창 다시 스캔 (새로고침 버튼)"""
+        self.window_manager.rescan()
+
+    def on_windows_found(self, diff):
+        """창 목록 변경 처리 (diff: 추가 / 삭제 / 제목 변경된 창)"""
+        self.window_manager.update_windows(diff)
+        self.update_window_combo(diff)
+
+        # 제목만 바뀐 경우(안 읽은 메시지 수 등)는 상태 표시를 바꾸지 않음
+        if diff.renamed and not diff.added and not diff.removed:
+            return
+
+        windows = self.window_manager.get_window_list()
+        if windows:
+            UIComponents.update_status_label(
+                self.status_label,
+                f"카카오톡 창 {len(windows)}개 발견 ({BRAND_PREFIX}{PARSER_NAME})",
+                "success"
+            )
+        else:
+            UIComponents.update_status_label(
+                self.status_label,
+                "카카오톡 창을 찾을 수 없습니다",
+                "error"
+            )
+
+    def _window_combo_row(self, hwnd):
+        """드롭다운에서 창 항목 위치 (없으면 -1)"""
+        for index in range(self.window_combo.count()):
+            data = self.window_combo.itemData(index)
+            if data and data['hwnd'] == hwnd:
+                return index
+        return -1
+
+    def update_window_combo(self, diff):
+        """드롭다운 업데이트 (바뀐 항목만 추가 / 삭제 / 이름 변경, 선택은 그대로 유지)"""
+        combo = self.window_combo
+
+        # "카카오톡을 실행해주세요" 안내 항목 제거
+        if diff.added and combo.count() == 1 and combo.itemData(0) is None:
+            combo.removeItem(0)
+
+        for window in diff.removed:
+            index = self._window_combo_row(window['hwnd'])
+            if index >= 0:
+                combo.removeItem(index)
+
+        for window in diff.renamed:
+            index = self._window_combo_row(window['hwnd'])
+            if index >= 0:
+                combo.setItemText(index, self.window_manager.format_window_title(window['title']))
+                combo.setItemData(index, window)
+
+        for window in diff.added:
+            combo.addItem(self.window_manager.format_window_title(window['title']), window)
+
+        if combo.count() == 0:
+            combo.addItem("카카오톡을 실행해주세요")
+
+    def on_window_selected(self):
+        """창 선택 처리"""
+        data = self.window_combo.currentData()
+        self.window_manager.select_window(data)
+
+        # 답변 요청 전에 API 서버 연결(TCP + TLS)을 미리 만들어 둠
+        if data and HTTP_WARMUP_ON_SELECT:
+            self._prepare_provider(connect=True)
+
+    def _prepare_provider(self, connect=False):
+        """작업 스레드에서 SDK import / API 클라이언트 생성 (connect면 API 서버 연결도 미리 만듦)"""
+        if not self.provider.configured:
+            return
+        if self.provider.ready:
+            if connect:
+                http_transport.warm_up(self.provider.base_url)
+            return
+
+        def run(task):
+            if self.provider.available and connect:
+                http_transport.warm_up(self.provider.base_url)
+
+        self.provider_worker = TaskWorker(run, self)
+        self.provider_worker.start()
+
+    def update_debug_stats(self):
+        """디버그 통계 라벨 갱신"""
+        self.debug_stats_label.setText(f"🔌 {http_transport.stats.summary()}")
+
+    def safe_fetch_chat(self):
+        """안전한 대화 가져오기 (선택된 파서 사용, 작업 스레드에서 실행)"""
+        hwnd = self.window_manager.get_selected_hwnd()
+        if not hwnd:
+            QMessageBox.warning(self, "창 선택 필요", "먼저 카카오톡 대화창을 선택해주세요.")
+            return
+
+        if not self.window_manager.is_selected_window_valid():
+            QMessageBox.warning(self, "창 오류", "선택한 창이 더 이상 유효하지 않습니다.\n새로고침 후 다시 선택해주세요.")
+            return
+
+        # 새 대화를 가져오면 이전 대화로 진행 중인 답변 생성과 가져오기는 취소
+        self._cancel_generation()
+        self._cancel_speculation()
+        if self.fetch_worker:
+            self.fetch_worker.cancel()
+
+        worker = TaskWorker(lambda task: self._fetch_chat_task(task, hwnd), self)
+        worker.progress.connect(self._on_task_progress)
+        worker.succeeded.connect(self._on_chat_fetched)
+        worker.failed.connect(self._on_fetch_failed)
+        self.fetch_worker = worker
+        worker.start()
+
+    def _fetch_chat_task(self, task, hwnd):
+        """대화 가져오기 → 파싱 (작업 스레드), 실패하면 None 반환
+
+        CHAT_SOURCES 순서대로 시도합니다. (UI Automation / 내보낸 대화 파일은 클릭과 클립보드를 쓰지 않음)
+        선택된 파서로 메시지가 하나 이상 나오는 결과만 받아들이고, 아니면 다음 방식으로 넘어갑니다.
+        """
+        if self.chat_source is None:
+            self.chat_source = create_chat_sources(CHAT_SOURCES, CHAT_EXPORT_DIR, RETRY_POSITIONS, MIN_CHAT_LENGTH,
+                                                   SafeWindowHandler.safe_get_window_text, CHAT_ARCHIVE_FILE,
+                                                   CHAT_ARCHIVE_MESSAGES, parse=self._parse_chat_content)
+
+        result = self.chat_source.fetch(hwnd, task.is_cancelled, task.report)
+        task.check_cancelled()
+        if not result:
+            return None
+        print(f"⏱️ 대화 가져오기 {result['elapsed'] * 1000:.0f}ms ({result['source']})")
+        if result['retry']:
+            print(f"📊 재시도 {PARSER_NAME} 분석 완료 - 추출된 메시지: {len(result['messages'])}개\n")
+        return result
+
+    def _parse_chat_content(self, content):
+        """선택된 파서로 대화 분석
+
+        개수 기반은 뒤에서부터 필요한 줄만 읽으므로 바로 파싱하고, 날짜 기반은 기간 안의 구간이
+        PARALLEL_PARSE_MIN_MB보다 크면 여러 프로세스로 나눠 파싱합니다. (결과는 같음)
+        """
+        if PARSER_TYPE != "date":
+            return self.chat_parser.extract_recent_messages(content, MAX_RECENT_MESSAGES)
+
+        if self.parallel_parser is None:
+            from .parallel_parser import ParallelDateParser
+
+            self.parallel_parser = ParallelDateParser(self.chat_parser, PARALLEL_PARSE_WORKERS,
+                                                      min_parallel_bytes=int(PARALLEL_PARSE_MIN_MB * 1e6))
+        return self.parallel_parser.parse(content)
+
+    def _on_task_progress(self, message, kind):
+        """작업 스레드 진행 상황 표시"""
+        UIComponents.update_status_label(self.status_label, message, kind)
+
+    def _on_fetch_failed(self, error):
+        """대화 가져오기 작업 오류 처리"""
+        if self.sender() is not self.fetch_worker:
+            return
+        self.fetch_worker = None
+
+        UIComponents.update_status_label(self.status_label, "오류 발생", "error")
+        QMessageBox.critical(self, "❌ 오류",
+                             f"대화 가져오기 중 오류 발생:\n\n{str(error)}\n\n🔧 해결 방법:\n- 카카오톡을 다시 실행\n- 프로그램을 관리자 권한으로 실행\n- 새로고침 후 다시 시도")
+
+    def _on_chat_fetched(self, result):
+        """가져온 대화 표시 (UI 스레드)"""
+        if self.sender() is not self.fetch_worker:
+            return
+        self.fetch_worker = None
+
+        if not result:
+            UIComponents.update_status_label(self.status_label, "대화 내용을 찾을 수 없음", "error")
+            QMessageBox.information(self, "❓ 수동 조작 필요",
+                                    "자동으로 대화 내용을 찾지 못했습니다.\n\n📋 수동 방법:\n1. 카카오톡 대화 영역을 클릭\n2. Ctrl+A로 전체 선택\n3. Ctrl+C로 복사\n4. 이 프로그램으로 돌아와서 Ctrl+V로 붙여넣기")
+        elif result['retry']:
+            self._show_retried_chat(result['content'], result['messages'])
+        else:
+            self._show_fetched_chat(result['content'], result['messages'])
+
+        # 원래 창으로 복귀
+        self.activateWindow()
+
+    def _show_fetched_chat(self, chat_content, messages):
+        """첫 시도에서 가져온 대화 표시"""
+        if messages:
+            # GPT 전송용 포맷으로 변환
+            formatted_chat = self.chat_parser.format_messages_for_gpt(messages)
+
+            # 대화 요약 정보 생성
+            summary = self.chat_parser.get_chat_summary(messages)
+
+            # UI에 표시
+            self.chat_text.setPlainText(formatted_chat)
+
+            # 파서별 상태 메시지
+            if PARSER_TYPE == "date":
+                status_msg = f"성공! {summary['total_messages']}개 메시지 (최근 {DATE_LIMIT_HOURS}시간), {len(summary['participants'])}명 참여"
+            else:
+                status_msg = f"성공! {summary['total_messages']}개 메시지 (최근 {MAX_RECENT_MESSAGES}개 중), {len(summary['participants'])}명 참여"
+
+            UIComponents.update_status_label(self.status_label, status_msg, "success")
+
+            # 성공 메시지에 요약 정보 포함
+            participant_names = ', '.join(summary['participants'][:3])  # 최대 3명만 표시
+            if len(summary['participants']) > 3:
+                participant_names += f" 외 {len(summary['participants']) - 3}명"
+
+            # 파서별 성공 메시지
+            if PARSER_TYPE == "date":
+                success_title = f"✅ {BRAND_PREFIX}날짜 기반 대화 추출 성공"
+                time_info = f"🕒 시간 범위: {summary.get('time_range', '정보 없음')}"
+            else:
+                success_title = f"✅ {BRAND_PREFIX}개수 기반 대화 추출 성공"
+                time_info = f"📊 최근 {MAX_RECENT_MESSAGES}개 중 {summary['total_messages']}개 추출"
+
+            QMessageBox.information(self, success_title,
+                                    f"{PARSER_DESCRIPTION} 범위에서 {summary['total_messages']}개 메시지를 분석했습니다!\n\n"
+                                    f"👥 참여자: {participant_names}\n"
+                                    f"📝 마지막 발신자: {summary['last_sender']}\n"
+                                    f"{time_info}\n"
+                                    f"🗑️ 시스템 메시지 제거됨\n\n"
+                                    f"💬 미리보기:\n{summary['preview'][:100]}{'...' if len(summary['preview']) > 100 else ''}")
+        else:
+            # 파싱된 메시지가 없으면 원본 사용
+            self.chat_text.setPlainText(chat_content)
+            UIComponents.update_status_label(
+                self.status_label,
+                f"성공! {len(chat_content)}자 가져옴 (분석 불가)",
+                "warning"
+            )
+            QMessageBox.information(self, "⚠️ 원본 텍스트 사용",
+                                    f"대화 내용을 가져왔지만 {PARSER_NAME} 분석에 실패했습니다.\n원본 텍스트를 사용합니다.\n\n📊 길이: {len(chat_content)} 문자")
+
+    def _show_retried_chat(self, content, messages):
+        """다른 위치에서 재시도해 가져온 대화 표시"""
+        if messages:
+            # GPT 전송용 포맷으로 변환
+            formatted_chat = self.chat_parser.format_messages_for_gpt(messages)
+            summary = self.chat_parser.get_chat_summary(messages)
+
+            self.chat_text.setPlainText(formatted_chat)
+            UIComponents.update_status_label(
+                self.status_label,
+                f"✅ 재시도 성공: {summary['total_messages']}개 메시지 ({PARSER_NAME})",
+                "success"
+            )
+
+            QMessageBox.information(self, "✅ 재시도 성공",
+                                    f"다른 위치에서 {PARSER_DESCRIPTION} 범위의 {summary['total_messages']}개 메시지를 추출했습니다!\n\n"
+                                    f"👥 참여자: {', '.join(summary['participants'][:3])}")
+        else:
+            # 파싱 실패시 원본 사용
+            self.chat_text.setPlainText(content)
+            UIComponents.update_status_label(
+                self.status_label,
+                f"재시도 성공: {len(content)}자 (분석 불가)",
+                "warning"
+            )
+            QMessageBox.information(self, "⚠️ 재시도 성공 (원본)",
+                                    f"다른 위치에서 대화 내용을 가져왔습니다!\n길이: {len(content)} 문자")
+
+    def toggle_auto_mode(self):
+        """자동 모드 토글"""
+        if self.auto_btn.isChecked():
+            if not self.window_manager.get_selected_hwnd():
+                self.auto_btn.setChecked(False)
+                QMessageBox.warning(self, "창 선택 필요", "자동 모드를 위해 먼저 카카오톡 창을 선택해주세요.")
+                return
+
+            self.clip_timer.start(CLIPBOARD_CHECK_INTERVAL)
+            UIComponents.update_status_label(self.status_label, f"자동 모드 활성화 ({PARSER_DESCRIPTION})", "success")
+        else:
+            self.clip_timer.stop()
+            self._cancel_speculation()
+            UIComponents.update_status_label(self.status_label, "수동 모드", "info")
+
+    def check_clipboard(self):
+        """클립보드 자동 확인 (선택된 파서 사용, 분석은 작업 스레드에서 실행)"""
+        if not self.auto_btn.isChecked():
+            return
+
+        # 이전 분석이 아직 진행 중이면 이번 확인은 건너뜀 (증분 파서 상태는 한 번에 하나의 작업만 사용)
+        if self.clipboard_worker:
+            return
+
+        try:
+            # 클립보드가 바뀌었을 때만 텍스트를 가져옴 (이전 텍스트는 지문만 보관)
+            current = self.clipboard_watcher.poll()
+            if current and len(current.strip()) > MIN_CHAT_LENGTH:
+                # 자동 모드에서도 선택된 파서 사용
+                print(f"\n🔄 자동 모드 - {PARSER_NAME} 분석 시작")
+
+                # 새 대화가 감지되면 이전 대화로 진행 중인 답변 생성은 취소
+                self._cancel_generation()
+
+                worker = TaskWorker(lambda task: (current, self.incremental_parser.parse(current)), self)
+                worker.succeeded.connect(self._on_clipboard_parsed)
+                worker.finished.connect(self._on_clipboard_worker_finished)
+                self.clipboard_worker = worker
+                worker.start()
+
+        except Exception as e:
+            print(f"클립보드 확인 오류: {e}")
+
+    def _on_clipboard_worker_finished(self):
+        """자동 모드 분석 작업 종료 (다음 클립보드 확인 허용)"""
+        self.clipboard_worker = None
+
+    def _on_clipboard_parsed(self, result):
+        """자동 모드 분석 결과 표시 (UI 스레드)"""
+        current, messages = result
+
+        print(f"📊 자동 분석 완료 - 추출된 메시지: {len(messages)}개\n")
+
+        if messages:
+            formatted_chat = self.chat_parser.format_messages_for_gpt(messages)
+            self.chat_text.setPlainText(formatted_chat)
+
+            summary = self.chat_parser.get_chat_summary(messages)
+            UIComponents.update_status_label(
+                self.status_label,
+                f"🔄 자동 감지: {summary['total_messages']}개 메시지 ({PARSER_NAME})",
+                "success"
+            )
+
+            # 상대방 메시지로 끝나면 답변을 미리 생성
+            self._schedule_speculation(messages, self.chat_text.toPlainText().strip())
+        else:
+            # 파싱 실패시 원본 사용
+            self.chat_text.setPlainText(current)
+            UIComponents.update_status_label(
+                self.status_label,
+                f"🔄 자동 감지: {len(current)}자 (분석 불가)",
+                "warning"
+            )
+
+    def generate_suggestions(self):
+        """답변 생성 (긍정/중립/부정 3가지 확실 구분)"""
+        content = self.chat_text.toPlainText().strip()
+        if not content:
+            QMessageBox.warning(self, "내용 없음", "먼저 대화 내용을 입력하거나 가져와주세요.")
+            return
+
+        # 같은 대화로 미리 생성 중이면 끝날 때까지 기다렸다가 캐시된 답변 사용
+        if self.speculation_worker and content == self.speculation_content:
+            self.speculation_waiting = True
+            UIComponents.update_status_label(self.status_label, "🔮 미리 생성 중인 답변 기다리는 중...", "info")
+            return
+        self._cancel_speculation()
+
+        if not self.provider.configured:
+            QMessageBox.critical(self, "API 오류", f"{self.provider.label} API 키가 설정되지 않았습니다.\nconfig.py에서 {self.provider.api_key_setting}를 설정해주세요.")
+            return
+
+        try:
+            # 모델과 프롬프트 설정 (고경우 모드면 고경우 프롬프트)
+            model, base_prompt = self._generation_settings()
+            UIComponents.update_status_label(self.status_label, f"🤖 {self.provider.display_name}가 답변 생성 중...", "info")
+
+            # ===== 🎯 한 번의 요청으로 3개 톤을 받거나(combined), 3개의 개별 프롬프트로 동시에 요청(separate) =====
+            for i in range(len(TONES)):
+                self.display_suggestion(i, None)
+
+            generate_all = None
+            if TONE_GENERATION_MODE == "combined":
+                generate_all = lambda: self._generate_combined_response(model, base_prompt, content)
+                UIComponents.update_status_label(self.status_label, "😊😐😔 긍정/중립/부정 답변 한 번에 생성 중...", "info")
+            else:
+                UIComponents.update_status_label(self.status_label, "😊😐😔 긍정/중립/부정 답변 동시 생성 중...", "info")
+
+            self._start_generation(
+                lambda tone_type, on_delta: self._generate_single_response(model, base_prompt, content, tone_type, on_delta),
+                generate_all
+            )
+
+        except Exception as e:
+            self._on_generation_failed(e)
+
+    def _start_generation(self, generate, generate_all=None):
+        """답변 생성을 작업 스레드에서 시작 (진행 중인 생성은 취소)
+
+        generate(tone_type, on_delta)는 스트리밍 중인 답변을 on_delta로 알리고, 버튼에 바로 표시됩니다.
+        generate_all이 있으면 먼저 한 번의 요청으로 모든 톤을 받고, 해석하지 못하면 톤별 요청으로 대체합니다.
+        """
+        self._cancel_generation()
+
+        def run(task):
+            def on_result(index, tone_type, suggestion):
+                task.emit_partial((index, tone_type, suggestion, False))
+
+            def generate_tone(tone_type):
+                index = TONES.index(tone_type)
+
+                def on_delta(text):
+                    task.check_cancelled()  # 취소되면 스트림을 닫음
+                    task.emit_partial((index, tone_type, text, True))
+
+                return generate(tone_type, on_delta)
+
+            if generate_all:
+                return self.tone_runner.run_combined(generate_all, generate_tone, on_result, should_stop=task.is_cancelled)
+            return self.tone_runner.run(generate_tone, on_result, should_stop=task.is_cancelled)
+
+        worker = TaskWorker(run, self)
+        worker.partial.connect(self._on_tone_result)
+        worker.succeeded.connect(self._on_generation_done)
+        worker.failed.connect(self._on_generation_failed)
+
+        self.generation_worker = worker
+        self.frame_probe.start()
+        worker.start()
+
+    def _cancel_generation(self):
+        """진행 중인 답변 생성 취소 (새 대화를 가져오면 이전 대화의 답변은 버림)"""
+        if self.generation_worker:
+            self.generation_worker.cancel()
+            self.generation_worker = None
+            print(f"⏹ 답변 생성 취소 - {self.frame_probe.stop()}")
+
+    def _on_generation_done(self, suggestions):
+        """모든 톤의 답변 생성 완료"""
+        if self.sender() is not self.generation_worker:
+            return
+        self.generation_worker = None
+        print(f"✅ 답변 생성 완료 - {self.frame_probe.stop()}")
+        print(f"🧮 누적 토큰: {self.token_usage.summary()}")
+
+        # 성공 메시지
+        model_info = self.provider.display_name
+        cache_info = f" ({self.suggestion_cache.stats_text()})" if self.suggestion_cache else ""
+        UIComponents.update_status_label(self.status_label, f"✅ {model_info} 긍정/중립/부정 답변 완료!{cache_info}", "success")
+
+    def _on_generation_failed(self, error):
+        """답변 생성 오류 처리"""
+        if isinstance(self.sender(), TaskWorker) and self.sender() is not self.generation_worker:
+            return
+        if self.generation_worker:
+            self.generation_worker = None
+            self.frame_probe.stop()
+
+        label = self.provider.label
+        UIComponents.update_status_label(self.status_label, f"❌ {label} API 오류", "error")
+        error_msg = str(error)
+        if "does not exist" in error_msg and self.provider.name == "openai_finetuned":
+            QMessageBox.critical(self, "모델 오류",
+                                 f"파인튜닝된 모델을 찾을 수 없습니다:\n{self.provider.model}\n\n기본 모델을 사용하려면 config.py에서 USE_FINE_TUNED_MODEL을 False로 설정하세요.")
+        elif "authentication" in error_msg.lower() or "unauthorized" in error_msg.lower():
+            QMessageBox.critical(self, "인증 오류",
+                                 f"{label} API 키가 유효하지 않습니다:\n{error_msg}\n\nconfig.py에서 {self.provider.api_key_setting}를 확인해주세요.")
+        elif "rate_limit" in error_msg.lower():
+            QMessageBox.critical(self, "사용량 한도",
+                                 f"{label} API 사용량 한도에 도달했습니다:\n{error_msg}\n\n잠시 후 다시 시도해주세요.")
+        else:
+            QMessageBox.critical(self, f"{label} API 오류", f"답변 생성 실패:\n{error_msg}")
+
+    def _generation_settings(self):
+        """답변 생성에 사용할 (모델, 프롬프트)"""
+        return self.provider.model, KOKYUNGWOO_PROMPT if self.provider.persona_mode else SYSTEM_PROMPT
+
+    def _schedule_speculation(self, messages, content):
+        """자동 모드에서 상대방 메시지로 끝나면 잠시 뒤 답변을 미리 생성 (그 사이 대화가 바뀌면 다시 기다림)"""
+        if content == self.speculation_content:
+            return  # 대화 끝부분이 그대로면 진행 중인 미리 생성 유지
+        self._cancel_speculation()
+        if not SPECULATIVE_GENERATION or not self.suggestion_cache:
+            return
+        if not should_speculate(messages, MY_CHAT_NAMES):
+            return
+
+        self.speculation_content = content
+        self.speculation_timer.start(SPECULATION_DEBOUNCE_MS)
+
+    def _cancel_speculation(self):
+        """대기 중이거나 진행 중인 미리 생성 취소"""
+        self.speculation_timer.stop()
+        self.speculation_content = None
+        self.speculation_waiting = False
+        if self.speculation_worker:
+            self.speculation_worker.cancel()
+            self.speculation_worker = None
+
+    def _start_speculation(self):
+        """작업 스레드에서 답변을 미리 생성해서 캐시에만 저장 (화면에는 표시하지 않음)"""
+        content = self.speculation_content
+        if not content or self.generation_worker:
+            return
+
+        model, base_prompt = self._generation_settings()
+        cache_keys = [self._suggestion_cache_key(model, base_prompt, content, tone_type) for tone_type in TONES]
+        if self.suggestion_cache.contains_all(cache_keys):
+            return
+
+        # 시간당 호출 한도 확인 (combined는 1번, separate는 톤 수만큼 호출)
+        calls = 1 if TONE_GENERATION_MODE == "combined" else len(TONES)
+        if not self.speculation_budget.try_spend(calls):
+            print(f"⏸ 답변 미리 생성 건너뜀 - 시간당 한도 {SPECULATION_MAX_CALLS_PER_HOUR}회 도달")
+            return
+
+        def run(task):
+            generate = lambda tone_type: self._generate_single_response(
+                model, base_prompt, content, tone_type, lambda text: task.check_cancelled())
+            on_result = lambda index, tone_type, suggestion: None
+            if TONE_GENERATION_MODE == "combined":
+                return self.tone_runner.run_combined(lambda: self._generate_combined_response(model, base_prompt, content),
+                                                     generate, on_result, should_stop=task.is_cancelled)
+            return self.tone_runner.run(generate, on_result, should_stop=task.is_cancelled)
+
+        print(f"🔮 답변 미리 생성 시작 (남은 한도 {self.speculation_budget.remaining()}회)")
+        worker = TaskWorker(run, self)
+        worker.finished.connect(self._on_speculation_finished)
+        self.speculation_worker = worker
+        worker.start()
+
+    def _on_speculation_finished(self):
+        """미리 생성 완료 (그 사이 답변 받기를 눌렀으면 캐시된 답변으로 바로 표시)"""
+        if self.sender() is not self.speculation_worker:
+            return
+        self.speculation_worker = None
+        print("🔮 답변 미리 생성 완료")
+
+        if self.speculation_waiting:
+            self.speculation_waiting = False
+            self.generate_suggestions()
+
+    def _suggestion_cache_key(self, model, base_prompt, content, tone_type):
+        """답변 캐시 키 (모델 / 프롬프트 / 톤 / temperature / 마지막 N개 메시지)"""
+        return make_cache_key(model, base_prompt, tone_type, self.provider.temperature, content,
+                              SUGGESTION_CACHE_LAST_MESSAGES)
+
+    def _cached_suggestion(self, cache_key):
+        return self.suggestion_cache.get(cache_key) if self.suggestion_cache else None
+
+    def _store_suggestion(self, cache_key, suggestion):
+        """생성된 답변 저장 (기본 답변 / 오류 답변은 저장하지 않음)"""
+        if self.suggestion_cache and suggestion != FALLBACK_SUGGESTION:
+            self.suggestion_cache.put(cache_key, suggestion)
+
+    def _tone_instruction(self, tone_type):
+        """톤별 지시 (고경우 모드는 말투 예시 포함)"""
+        if self.provider.persona_mode:
+            return KOKYUNGWOO_TONE_INSTRUCTIONS[tone_type]
+        return BASIC_TONE_INSTRUCTIONS[tone_type]
+
+    def _conversation_message(self, content):
+        """요청마다 달라지는 대화 부분 (고정 프롬프트 뒤에 붙음)"""
+        if self.provider.persona_mode:
+            return f"대화 내용:\n{content}"
+        return f"다음은 {PARSER_DESCRIPTION} 범위의 카카오톡 대화입니다:\n\n{content}"
+
+    def _generate_combined_response(self, model, base_prompt, content):
+        """API 한 번 호출로 긍정/중립/부정 답변 생성 (JSON 응답을 해석하지 못하면 None)"""
+        cache_keys = [self._suggestion_cache_key(model, base_prompt, content, tone_type) for tone_type in TONES]
+        if self.suggestion_cache:
+            cached = self.suggestion_cache.get_all(cache_keys)
+            if cached:
+                return cached
+
+        if not self.provider.available:
+            raise Exception(f"{self.provider.label} API 클라이언트가 초기화되지 않았습니다")
+
+        text = self.provider.complete([base_prompt, build_combined_instruction()], self._conversation_message(content),
+                                      COMBINED_MAX_TOKENS, "긍정/중립/부정")
+        suggestions = parse_multi_tone_response(text)
+        if suggestions is None:
+            print(f"한 번에 받은 답변 형식 오류: {text[:100]!r}")
+            return None
+
+        for cache_key, suggestion in zip(cache_keys, suggestions):
+            self._store_suggestion(cache_key, suggestion)
+        return suggestions
+
+    def _stream_first_line(self, system_parts, user_message, label, on_delta):
+        """스트리밍으로 받는 대로 on_delta로 알리고 첫 줄이 완성되면 바로 중단"""
+        stream = FirstLineStream()
+        chunks = self.provider.stream(system_parts, user_message, label=label)
+        try:
+            for text in chunks:
+                on_delta(stream.feed(text))
+                if stream.done:
+                    break  # 첫 줄만 쓰므로 나머지 토큰은 받지 않음
+        finally:
+            chunks.close()  # 연결 종료 (취소되어 on_delta에서 예외가 나도 닫음)
+        return stream.result()
+
+    def _generate_single_response(self, model, base_prompt, content, tone_type, on_delta=None):
+        """개별 톤의 답변 하나 생성 (같은 대화면 캐시된 답변 사용)"""
+        cache_key = self._suggestion_cache_key(model, base_prompt, content, tone_type)
+        cached = self._cached_suggestion(cache_key)
+        if cached:
+            return cached
+
+        try:
+            if not self.provider.available:
+                raise Exception(f"{self.provider.label} API 클라이언트가 초기화되지 않았습니다")
+
+            # 페르소나 + 톤 지시는 요청마다 같은 고정 부분(프롬프트 캐시 대상), 대화만 매번 달라짐
+            system_parts = [base_prompt, self._tone_instruction(tone_type)]
+            user_message = self._conversation_message(content)
+
+            if STREAM_SUGGESTIONS and on_delta:
+                suggestion = self._stream_first_line(system_parts, user_message, tone_type, on_delta)
+            else:
+                # 후처리 (번호/톤 설명 제거 후 첫 번째 줄만 사용)
+                suggestion = clean_suggestion(self.provider.complete(system_parts, user_message, label=tone_type))
+
+            self._store_suggestion(cache_key, suggestion)
+            return suggestion
+
+        except TaskCancelled:
+            return FALLBACK_SUGGESTION  # 취소된 생성 (결과는 버려짐)
+
+        except Exception as e:
+            print(f"{tone_type} {self.provider.label} 답변 생성 오류: {e}")
+            return self.provider.error_suggestion(e)
+
+    def _on_tone_result(self, result):
+        """톤별 답변이 도착하면 해당 버튼만 채움"""
+        if self.sender() is not self.generation_worker:
+            return  # 취소된 생성의 늦게 도착한 답변
+
+        index, tone_type, suggestion, streaming = result
+        self.display_suggestion(index, suggestion, streaming)
+        if not streaming:
+            UIComponents.update_status_label(self.status_label, f"✔ {tone_type} 답변 도착", "info")
+
+    def display_suggestions(self, suggestions):
+        """답변 표시 - 긍정/중립/부정 순서 보장"""
+        for i, suggestion in enumerate(suggestions):
+            self.display_suggestion(i, suggestion)
+
+    def display_suggestion(self, index, suggestion, streaming=False):
+        """답변 하나 표시 (suggestion이 None이면 생성 중 표시, streaming이면 받는 중인 답변 표시)"""
+        self.suggestions_frame.setVisible(True)
+
+        labels = ["😊 긍정", "😐 중립", "😔 부정"]
+
+        if index >= len(self.suggestion_buttons):
+            return
+
+        if suggestion is None:
+            self.suggestion_buttons[index].setText(f"{labels[index]}: ⏳ 생성 중...")
+            self.suggestion_buttons[index].setToolTip("")
+            self.suggestion_buttons[index].setProperty("full_text", None)
+            return
+
+        if streaming:
+            # 받는 중인 답변 (아직 전송에 사용하지 않음)
+            self.suggestion_buttons[index].setText(f"{labels[index]}: {suggestion[:50]}▌")
+            return
+
+        # 라벨 + 실제 답변 내용
+        display_text = f"{labels[index]}: {suggestion}"
+        if len(display_text) > 60:
+            display_text = display_text[:57] + "..."
+
+        self.suggestion_buttons[index].setText(display_text)
+        self.suggestion_buttons[index].setToolTip(f"{labels[index]} 답변: {suggestion}")
+        self.suggestion_buttons[index].setProperty("full_text", suggestion)  # 전송용은 순수 답변만
+
+    def safe_use_suggestion(self, index):
+        """안전한 답변 사용 (입력창 자동 탐지 + 전송)"""
+        if index >= len(self.suggestion_buttons):
+            return
+
+        full_text = self.suggestion_buttons[index].property("full_text")
+        if not full_text:
+            return
+
+        # 클립보드에 복사
+        try:
+            import pyperclip
+            pyperclip.copy(full_text)
+        except Exception as e:
+            QMessageBox.warning(self, "복사 실패", f"클립보드 복사 실패: {str(e)}")
+            return
+
+        hwnd = self.window_manager.get_selected_hwnd()
+        if not hwnd:
+            QMessageBox.information(self, "복사 완료", "답변이 클립보드에 복사되었습니다.")
+            return
+
+        if not self.window_manager.is_selected_window_valid():
+            QMessageBox.warning(self, "창 오류", "선택한 창이 더 이상 유효하지 않습니다.")
+            return
+
+        try:
+            # 입력창 찾기 및 메시지 입력
+            success = self._input_message_to_kakao(hwnd, full_text)
+
+            if success:
+                # 전송 확인
+                self._handle_message_sending(hwnd, full_text)
+            else:
+                UIComponents.update_status_label(self.status_label, "❌ 입력 실패", "error")
+                QMessageBox.warning(self, "입력 실패", "메시지 입력에 실패했습니다.\n수동으로 붙여넣어주세요.")
+
+        except Exception as e:
+            UIComponents.update_status_label(self.status_label, "❌ 오류 발생", "error")
+            QMessageBox.warning(self, "전송 실패",
+                                f"답변 전송 실패:\n\n{str(e)}\n\n🔧 해결책:\n- 카카오톡 창을 활성화\n- 입력창을 직접 클릭\n- Ctrl+V로 수동 붙여넣기")
+
+    def _input_message_to_kakao(self, hwnd, full_text):
+        """카카오톡에 메시지 입력"""
+        UIComponents.update_status_label(self.status_label, "📝 입력창을 찾는 중...", "info")
+        QApplication.processEvents()
+
+        # 카카오톡 창이 앞으로 오지 않으면 다른 창에 입력될 수 있으므로 중단 (수동 붙여넣기 안내)
+        if not SafeWindowHandler.focus_window(hwnd):
+            print("카카오톡 창이 앞으로 오지 않아 입력 중단")
+            return False
+
+        # 입력창 찾아서 클릭
+        input_found = SafeWindowHandler.find_input_area_and_click(hwnd)
+
+        if input_found:
+            UIComponents.update_status_label(self.status_label, "✅ 입력창 발견! 메시지 입력 중...", "info")
+        else:
+            UIComponents.update_status_label(self.status_label, "⚠️ 기본 입력창 위치 시도 중...", "info")
+            if not SafeWindowHandler.click_window_area(hwnd, 0.5, 0.85):
+                return False
+
+        QApplication.processEvents()
+
+        # 메시지 입력 시도 (클립보드는 이미 복사해 두었고, 창이 앞으로 온 것을 확인한 뒤 붙여넣음)
+        if SafeWindowHandler.safe_send_keys("^v", hwnd):
+            # 붙여넣기가 끝났는지는 확인할 수 없으므로 기본 시간만큼 대기
+            SafeWindowHandler.wait_engine().settle('paste_wait')
+            UIComponents.update_status_label(self.status_label, "✅ 메시지 입력 완료!", "success")
+            return True
+        else:
+            # 직접 타이핑 시도
+            UIComponents.update_status_label(self.status_label, "🔄 직접 입력 방식으로 재시도...", "info")
+            QApplication.processEvents()
+
+            # 전체 선택 / 입력 모두 카카오톡 창이 앞에 있을 때만 (아니면 다른 프로그램의 글을 덮어쓸 수 있음)
+            if not SafeWindowHandler.safe_send_keys("^a", hwnd):
+                return False
+
+            # 유니코드 키 이벤트를 묶어서 한 번에 입력 (이모지 같은 서로게이트 쌍 포함)
+            if not SafeWindowHandler.type_text(full_text, hwnd):
+                return False
+
+            UIComponents.update_status_label(self.status_label, "✅ 직접 입력 완료!", "success")
+            return True
+
+    def _handle_message_sending(self, hwnd, full_text):
+        """메시지 전송 처리"""
+        reply = QMessageBox.question(
+            self,
+            "🚀 전송 확인",
+            f"다음 메시지를 전송하시겠습니까?\n\n💬 \"{full_text[:100]}{'...' if len(full_text) > 100 else ''}\"\n\n✅ 확인을 누르면 자동으로 전송됩니다.\n❌ 취소를 누르면 입력만 하고 전송하지 않습니다.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+
+        if reply == QMessageBox.Yes:
+            UIComponents.update_status_label(self.status_label, "🎯 카카오톡으로 포커스 이동 중...", "info")
+            QApplication.processEvents()
+
+            try:
+                # 카카오톡 창으로 다시 포커스 이동 (창이 앞으로 온 것을 확인한 뒤 클릭)
+                clicked = SafeWindowHandler.click_window_area(hwnd, 0.5, 0.85)
+
+                UIComponents.update_status_label(self.status_label, "🚀 전송 중...", "info")
+                QApplication.processEvents()
+
+                # 엔터 키로 전송 (클릭하지 못했으면 다른 창에 엔터가 들어가지 않도록 보내지 않음)
+                if clicked and SafeWindowHandler.send_enter():
+                    SafeWindowHandler.wait_engine().settle('send_wait')
+
+                    UIComponents.update_status_label(self.status_label, f"🎉 {BRAND_PREFIX}메시지 전송 완료!", "success")
+
+                    # 전송 성공 알림 (지연)
+                    QTimer.singleShot(100, lambda: QMessageBox.information(
+                        self,
+                        f"🎉 {BRAND_PREFIX}전송 성공!",
+                        f"메시지가 성공적으로 전송되었습니다!\n\n📤 전송된 내용:\n\"{full_text[:150]}{'...' if len(full_text) > 150 else ''}\""
+                    ))
+
+                    # 추천 답변 숨기기
+                    self.suggestions_frame.setVisible(False)
+
+                else:
+                    UIComponents.update_status_label(self.status_label, "⚠️ 전송 실패 - 수동으로 엔터 눌러주세요", "warning")
+
+            except Exception as e:
+                UIComponents.update_status_label(self.status_label, "⚠️ 포커스 이동 실패", "error")
+                QMessageBox.warning(self, "전송 실패", f"카카오톡 포커스 이동 실패:\n{str(e)}\n\n💡 해결책: 카카오톡 창을 클릭하고 수동으로 엔터를 눌러주세요.")
+        else:
+            UIComponents.update_status_label(self.status_label, "✏️ 입력 완료 (전송 안함)", "info")
+            QMessageBox.information(self, "입력 완료", "메시지가 입력되었습니다.\n원하실 때 엔터를 눌러 전송하세요.")
+
+    # 마우스 이벤트 (드래그 기능)
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.dragging = True
+            self.old_pos = event.globalPos()
+
+    def mouseMoveEvent(self, event):
+        if self.dragging and self.old_pos:
+            delta = QPoint(event.globalPos() - self.old_pos)
+            self.move(self.pos() + delta)
+            self.old_pos = event.globalPos()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.dragging = False
+
+    def closeEvent(self, event):
+        """프로그램 종료 시 정리"""
+        try:
+            if hasattr(self, 'clip_timer'):
+                self.clip_timer.stop()
+            if hasattr(self, 'debug_timer'):
+                self.debug_timer.stop()
+            self.window_manager.stop_scanning()
+            # 진행 중인 작업 스레드 (취소 후 아직 끝나지 않은 이전 작업과 provider_worker 포함) 취소 후 잠시 기다림
+            still_running = shutdown_workers(self.findChildren(TaskWorker))
+            if still_running:
+                print(f"⚠️ 작업 스레드 {still_running}개가 아직 실행 중입니다 (부모 창에서 떼어내고 종료)")
+            if self.suggestion_cache:
+                self.suggestion_cache.close()
+            if SafeWindowHandler.waits:
+                # 관측한 대기 시간 저장 (다음 실행에서 최대 대기 시간 조정에 사용)
+                print(f"⏱️ 대기 통계\n{SafeWindowHandler.waits.stats_text()}")
+                if WAIT_STATS_FILE:
+                    SafeWindowHandler.waits.save(WAIT_STATS_FILE)
+            if self.chat_source:
+                print(f"📥 대화 가져오기 통계\n{self.chat_source.stats_text()}")
+            if self.parallel_parser:
+                self.parallel_parser.close()
+        except:
+            pass
+        event.accept()
+
+
+def create_suggestion_provider(requested=None):
+    """config.py(또는 실행 인자 --provider)로 고른 답변 생성 백엔드 생성 (SDK는 처음 쓸 때 import)"""
+    settings = vars(config)
+    return create_provider(resolve_provider_name(settings, requested), settings, http_transport, TokenUsage())
+
+
+def main():
+    """메인 실행 함수"""
+    try:
+        arg_parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+        arg_parser.add_argument('--provider', choices=list(PROVIDER_LABELS),
+                                help="답변 생성 백엔드 (기본값: config.py의 SUGGESTION_PROVIDER)")
+        args, qt_args = arg_parser.parse_known_args()
+
+        app = QApplication(sys.argv[:1] + qt_args)
+        app.setFont(QFont("맑은 고딕", 9))
+
+        # 답변 생성 백엔드 / API 키 확인
+        provider = create_suggestion_provider(args.provider)
+        if not provider.configured:
+            QMessageBox.critical(None, "설정 오류",
+                                 f"{provider.label} API 키가 설정되지 않았습니다!\n\nconfig.py 파일에서 {provider.api_key_setting}를 설정해주세요.")
+            sys.exit(1)
+
+        window = KakaoTalkAssistant(provider)
+        window.show()
+        print(f"🚀 창 표시까지 {(time.perf_counter() - STARTED_AT) * 1000:.0f}ms (모듈 import 포함)")
+
+        sys.exit(app.exec_())
+
+    except Exception as e:
+        print(f"프로그램 시작 오류: {e}")
+        traceback.print_exc()
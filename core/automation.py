@@ -0,0 +1,587 @@
+# automation.py - 창 / 마우스 / 키보드 / 클립보드 조작 (Win32 백엔드와 리눅스 테스트용 가상 백엔드)
+
+import os
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .clipboard_watcher import FakeClipboardBackend, create_default_backend
+from .wait_engine import SimulatedClock
+
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+INPUT_KEYBOARD = 1
+
+
+def utf16_units(text: str) -> List[int]:
+    """텍스트 → UTF-16 코드 단위 목록 (BMP 밖 문자(이모지 등)는 서로게이트 쌍 2개)"""
+    data = text.encode('utf-16-le', 'surrogatepass')
+    return [int.from_bytes(data[i:i + 2], 'little') for i in range(0, len(data), 2)]
+
+
+def chunk_utf16_units(units: List[int], max_units: int) -> List[List[int]]:
+    """max_units개씩 나누되 서로게이트 쌍은 나누지 않음"""
+    chunks = []
+    start = 0
+    while start < len(units):
+        end = min(start + max(max_units, 2), len(units))
+        if end < len(units) and 0xD800 <= units[end - 1] <= 0xDBFF:
+            end -= 1  # 앞쪽 서로게이트로 끝나면 쌍을 다음 묶음으로
+        chunks.append(units[start:end])
+        start = end
+    return chunks
+
+
+def unicode_key_events(units: List[int]) -> List[Tuple[int, int]]:
+    """코드 단위마다 (단위, 플래그) 키 누름 / 뗌 이벤트 2개"""
+    events = []
+    for unit in units:
+        events.append((unit, KEYEVENTF_UNICODE))
+        events.append((unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+    return events
+
+
+def decode_key_events(events: List[Tuple[int, int]]) -> str:
+    """키 누름 이벤트의 코드 단위 → 텍스트 (테스트 / 가상 백엔드용)"""
+    units = [unit for unit, flags in events if not flags & KEYEVENTF_KEYUP]
+    data = b''.join(unit.to_bytes(2, 'little') for unit in units)
+    return data.decode('utf-16-le', 'surrogatepass')
+
+
+class AutomationBackend:
+    """운영체제 자동화 기본 클래스
+
+    has_selection / clipboard_sequence처럼 상태를 확인할 수 없는 백엔드는 None을 반환합니다.
+    """
+
+    def is_window(self, hwnd) -> bool:
+        raise NotImplementedError
+
+    def get_window_text(self, hwnd) -> str:
+        raise NotImplementedError
+
+    def get_window_rect(self, hwnd) -> Optional[Dict[str, int]]:
+        raise NotImplementedError
+
+    def enum_windows(self) -> List[int]:
+        """최상위 창 목록 (Z 순서)"""
+        raise NotImplementedError
+
+    def is_window_visible(self, hwnd) -> bool:
+        raise NotImplementedError
+
+    def is_top_level(self, hwnd) -> bool:
+        raise NotImplementedError
+
+    def get_class_name(self, hwnd) -> str:
+        raise NotImplementedError
+
+    def get_window_pid(self, hwnd) -> int:
+        raise NotImplementedError
+
+    def get_process_image_name(self, pid: int) -> str:
+        """프로세스 실행 파일 이름 (소문자, 예: kakaotalk.exe)"""
+        raise NotImplementedError
+
+    def get_process_name(self, hwnd) -> str:
+        return self.get_process_image_name(self.get_window_pid(hwnd))
+
+    def set_foreground(self, hwnd):
+        raise NotImplementedError
+
+    def foreground_window(self):
+        raise NotImplementedError
+
+    def click(self, x: int, y: int):
+        raise NotImplementedError
+
+    def send_keys(self, keys: str):
+        """단축키 입력 ("^a" / "^c" / "^v")"""
+        raise NotImplementedError
+
+    def send_char(self, char: str):
+        raise NotImplementedError
+
+    def type_text(self, text: str, chunk_units: int = 200) -> int:
+        """텍스트 입력, 보낸 UTF-16 코드 단위 수 반환 (기본 구현은 글자마다 send_char)"""
+        for char in text:
+            self.send_char(char)
+        return len(utf16_units(text))
+
+    def send_enter(self):
+        raise NotImplementedError
+
+    def send_delete(self):
+        raise NotImplementedError
+
+    def has_selection(self, hwnd) -> Optional[bool]:
+        """창에 선택된 내용이 있는지 (확인할 수 없으면 None)"""
+        return None
+
+    def clipboard_sequence(self) -> Optional[int]:
+        """클립보드 변경 번호 (지원하지 않으면 None)"""
+        raise NotImplementedError
+
+    def clipboard_text(self) -> str:
+        raise NotImplementedError
+
+
+def _win32_input_type(ctypes, wintypes):
+    """SendInput용 INPUT 구조체 (union에 가장 큰 MOUSEINPUT이 있어야 크기가 맞음)"""
+    ULONG_PTR = ctypes.c_size_t
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ULONG_PTR)]
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ULONG_PTR)]
+
+    class HARDWAREINPUT(ctypes.Structure):
+        _fields_ = [("uMsg", wintypes.DWORD), ("wParamL", wintypes.WORD), ("wParamH", wintypes.WORD)]
+
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
+
+    return INPUT
+
+
+def make_rect(left: int, top: int, right: int, bottom: int) -> Dict[str, int]:
+    return {
+        'left': left,
+        'top': top,
+        'right': right,
+        'bottom': bottom,
+        'width': right - left,
+        'height': bottom - top
+    }
+
+
+class Win32Automation(AutomationBackend):
+    """Windows 자동화 (win32gui / user32 사용, 클립보드 변경 번호로 복사 완료 확인)"""
+
+    # 단축키 → 가상 키 코드
+    SHORTCUT_KEYS = {"^a": 0x41, "^c": 0x43, "^v": 0x56}
+
+    def __init__(self):
+        import ctypes
+        import win32gui
+        import win32process
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._win32gui = win32gui
+        self._win32process = win32process
+        self._user32 = ctypes.windll.user32
+        self._INPUT = _win32_input_type(ctypes, wintypes)
+        self.clipboard = create_default_backend()
+
+    def is_window(self, hwnd) -> bool:
+        return bool(self._win32gui.IsWindow(hwnd))
+
+    def get_window_text(self, hwnd) -> str:
+        length = self._win32gui.GetWindowTextLength(hwnd)
+        if length == 0:
+            return ""
+
+        buffer = self._ctypes.create_unicode_buffer(length + 1)
+        self._user32.GetWindowTextW(hwnd, buffer, length + 1)
+        return buffer.value
+
+    def get_window_rect(self, hwnd) -> Optional[Dict[str, int]]:
+        rect = self._wintypes.RECT()
+        self._user32.GetWindowRect(hwnd, self._ctypes.byref(rect))
+        return make_rect(rect.left, rect.top, rect.right, rect.bottom)
+
+    def enum_windows(self) -> List[int]:
+        hwnds = []
+        self._win32gui.EnumWindows(lambda hwnd, param: hwnds.append(hwnd) or True, None)
+        return hwnds
+
+    def is_window_visible(self, hwnd) -> bool:
+        return bool(self._win32gui.IsWindowVisible(hwnd))
+
+    def is_top_level(self, hwnd) -> bool:
+        return self._user32.GetAncestor(hwnd, 2) == hwnd  # GA_ROOT
+
+    def get_class_name(self, hwnd) -> str:
+        return self._win32gui.GetClassName(hwnd)
+
+    def get_window_pid(self, hwnd) -> int:
+        _, pid = self._win32process.GetWindowThreadProcessId(hwnd)
+        return pid
+
+    def get_process_image_name(self, pid: int) -> str:
+        kernel32 = self._ctypes.windll.kernel32
+        process_handle = kernel32.OpenProcess(
+            0x0400 | 0x0010,  # PROCESS_QUERY_INFORMATION | PROCESS_VM_READ
+            False,
+            pid
+        )
+
+        if process_handle:
+            buffer = self._ctypes.create_unicode_buffer(260)
+            size = self._ctypes.sizeof(buffer)
+            self._ctypes.windll.psapi.GetProcessImageFileNameW(process_handle, buffer, size)
+            kernel32.CloseHandle(process_handle)
+
+            if buffer.value:
+                return os.path.basename(buffer.value).lower()
+        return ""
+
+    def set_foreground(self, hwnd):
+        self._win32gui.SetForegroundWindow(hwnd)
+
+    def foreground_window(self):
+        return self._win32gui.GetForegroundWindow()
+
+    def click(self, x: int, y: int):
+        self._user32.SetCursorPos(x, y)
+        self._user32.mouse_event(0x0002, 0, 0, 0, 0)  # MOUSEEVENTF_LEFTDOWN
+        self._user32.mouse_event(0x0004, 0, 0, 0, 0)  # MOUSEEVENTF_LEFTUP
+
+    def _press(self, vk: int):
+        self._user32.keybd_event(vk, 0, 0, 0)  # down
+        self._user32.keybd_event(vk, 0, 2, 0)  # up
+
+    def send_keys(self, keys: str):
+        vk = self.SHORTCUT_KEYS.get(keys)
+        if vk is None:
+            return
+        self._user32.keybd_event(0x11, 0, 0, 0)  # Ctrl down
+        self._press(vk)
+        self._user32.keybd_event(0x11, 0, 2, 0)  # Ctrl up
+
+    def send_char(self, char: str):
+        self.type_text(char)
+
+    def type_text(self, text: str, chunk_units: int = 200) -> int:
+        """INPUT 배열을 만들어 SendInput 한 번에 입력 (긴 텍스트는 chunk_units개씩 나눠서)
+
+        한 번의 SendInput으로 넣은 이벤트는 다른 입력과 섞이지 않고, 글자마다 호출하지 않아도 됩니다.
+        """
+        sent = 0
+        for chunk in chunk_utf16_units(utf16_units(text), chunk_units):
+            events = unicode_key_events(chunk)
+            inputs = (self._INPUT * len(events))()
+            for item, (unit, flags) in zip(inputs, events):
+                item.type = INPUT_KEYBOARD
+                item.union.ki.wScan = unit
+                item.union.ki.dwFlags = flags
+
+            count = self._user32.SendInput(len(events), inputs, self._ctypes.sizeof(self._INPUT))
+            if count != len(events):
+                # 다른 프로그램이 입력을 막았거나(UIPI) 권한이 다른 창
+                raise OSError(f"SendInput이 {len(events)}개 중 {count}개만 입력했습니다")
+            sent += len(chunk)
+        return sent
+
+    def send_enter(self):
+        self._press(0x0D)
+
+    def send_delete(self):
+        self._press(0x2E)
+
+    def clipboard_sequence(self) -> Optional[int]:
+        return self.clipboard.get_sequence_number()
+
+    def clipboard_text(self) -> str:
+        return self.clipboard.get_text()
+
+
+def create_default_automation() -> AutomationBackend:
+    """Windows 자동화 백엔드 생성 (pywin32가 없으면 ImportError)"""
+    return Win32Automation()
+
+
+class SimulatedWindow:
+    """가상 카카오톡 창 (위쪽 75%는 대화 영역, 아래쪽은 입력창)"""
+
+    def __init__(self, hwnd: int, title: str, rect: Tuple[int, int, int, int], chat_text: str = "",
+                 process_name: str = "kakaotalk.exe", pid: int = 0, visible: bool = True, top_level: bool = True,
+                 class_name: str = "EVA_Window_Dblclk"):
+        self.hwnd = hwnd
+        self.title = title
+        self.rect = make_rect(*rect)
+        self.chat_text = chat_text
+        self.process_name = process_name
+        self.pid = pid
+        self.visible = visible
+        self.top_level = top_level
+        self.class_name = class_name
+        self.area = None  # 마지막으로 클릭한 영역 ("chat" / "input")
+        self.chat_selected = False
+        self.input_text = ""
+        self.input_selected = False
+        self.sent: List[str] = []
+
+    def area_at(self, x: int, y: int) -> Optional[str]:
+        rect = self.rect
+        if not (rect['left'] <= x < rect['right'] and rect['top'] <= y < rect['bottom']):
+            return None
+        return "chat" if (y - rect['top']) < rect['height'] * 0.75 else "input"
+
+
+class SimulatedAutomation(AutomationBackend):
+    """리눅스 테스트용 가상 자동화 백엔드
+
+    포커스 이동 / 전체 선택 / 클립보드 복사가 각각 지연 시간 뒤에 반영됩니다.
+    (지연 시간은 기준값의 0.5~1.5배에서 무작위, SimulatedClock으로 실제로 기다리지 않음)
+    """
+
+    def __init__(self, clock: Optional[SimulatedClock] = None, focus_latency: float = 0.04,
+                 select_latency: float = 0.02, copy_latency: float = 0.08, input_call_latency: float = 0.0005,
+                 process_lookup_cost: float = 0.0, seed: int = 0):
+        self.clock = clock or SimulatedClock()
+        self.focus_latency = focus_latency
+        self.select_latency = select_latency
+        self.copy_latency = copy_latency
+        self.input_call_latency = input_call_latency  # 입력 호출 한 번(keybd_event / SendInput)에 걸리는 시간
+        self.process_lookup_cost = process_lookup_cost  # 프로세스 이름 조회 한 번에 걸리는 시간
+        self.input_batches: List[List[Tuple[int, int]]] = []  # type_text가 보낸 이벤트 묶음 기록
+        self.input_calls = 0
+        self.processes: Dict[int, str] = {}  # pid → 실행 파일 이름
+        self.process_lookups = 0  # get_process_image_name 호출 횟수 (OpenProcess에 해당)
+        self.random = random.Random(seed)
+        self.windows: Dict[int, SimulatedWindow] = {}
+        self.foreground = None
+        self.clipboard = FakeClipboardBackend()
+        self._pending: List[Tuple[float, Callable[[], None]]] = []
+
+    def add_window(self, window: SimulatedWindow) -> SimulatedWindow:
+        self.windows[window.hwnd] = window
+        self.processes.setdefault(window.pid, window.process_name)
+        return window
+
+    def remove_window(self, hwnd):
+        self.windows.pop(hwnd, None)
+        if self.foreground == hwnd:
+            self.foreground = None
+
+    def _schedule(self, latency: float, action: Callable[[], None]):
+        self._pending.append((self.clock.now() + latency * self.random.uniform(0.5, 1.5), action))
+
+    def _run_due(self):
+        """지연 시간이 지난 동작 반영"""
+        now = self.clock.now()
+        due = [item for item in self._pending if item[0] <= now]
+        self._pending = [item for item in self._pending if item[0] > now]
+        for _, action in sorted(due, key=lambda item: item[0]):
+            action()
+
+    def _focused(self) -> Optional[SimulatedWindow]:
+        self._run_due()
+        return self.windows.get(self.foreground)
+
+    def is_window(self, hwnd) -> bool:
+        return hwnd in self.windows
+
+    def get_window_text(self, hwnd) -> str:
+        window = self.windows.get(hwnd)
+        return window.title if window else ""
+
+    def get_window_rect(self, hwnd) -> Optional[Dict[str, int]]:
+        window = self.windows.get(hwnd)
+        return dict(window.rect) if window else None
+
+    def enum_windows(self) -> List[int]:
+        return [hwnd for hwnd, window in self.windows.items() if window.top_level]
+
+    def is_window_visible(self, hwnd) -> bool:
+        window = self.windows.get(hwnd)
+        return bool(window and window.visible)
+
+    def is_top_level(self, hwnd) -> bool:
+        window = self.windows.get(hwnd)
+        return bool(window and window.top_level)
+
+    def get_class_name(self, hwnd) -> str:
+        window = self.windows.get(hwnd)
+        return window.class_name if window else ""
+
+    def get_window_pid(self, hwnd) -> int:
+        window = self.windows.get(hwnd)
+        return window.pid if window else 0
+
+    def get_process_image_name(self, pid: int) -> str:
+        self.process_lookups += 1
+        if self.process_lookup_cost:
+            self.clock.sleep(self.process_lookup_cost)
+        return self.processes.get(pid, "")
+
+    def set_foreground(self, hwnd):
+        def activate():
+            self.foreground = hwnd
+        self._schedule(self.focus_latency, activate)
+
+    def foreground_window(self):
+        self._run_due()
+        return self.foreground
+
+    def click(self, x: int, y: int):
+        window = self._focused()
+        if not window:
+            return
+        window.area = window.area_at(x, y)
+        window.chat_selected = False
+        window.input_selected = False
+
+    def send_keys(self, keys: str):
+        window = self._focused()
+        if not window:
+            return
+        if keys == "^a":
+            if window.area == "chat" and window.chat_text:
+                def select():
+                    window.chat_selected = True
+                self._schedule(self.select_latency, select)
+            elif window.area == "input":
+                window.input_selected = True
+        elif keys == "^c":
+            # 앞서 보낸 Ctrl+A가 처리된 뒤에 복사 (실제 입력 큐처럼 순서 유지)
+            def copy():
+                if window.chat_selected:
+                    self.clipboard.set_text(window.chat_text)
+            self._schedule(self.select_latency * 1.5 + self.copy_latency, copy)
+        elif keys == "^v" and window.area == "input":
+            self._type(window, self.clipboard.text)
+
+    def _type(self, window: SimulatedWindow, text: str):
+        if window.input_selected:
+            window.input_text = ""
+            window.input_selected = False
+        window.input_text += text
+
+    def send_char(self, char: str):
+        self.input_calls += 1
+        self.clock.sleep(self.input_call_latency)
+        window = self._focused()
+        if window and window.area == "input":
+            self._type(window, char)
+
+    def type_text(self, text: str, chunk_units: int = 200) -> int:
+        """Win32Automation과 같은 방식으로 이벤트 묶음을 만들어 기록하고 입력창에 반영"""
+        sent = 0
+        for chunk in chunk_utf16_units(utf16_units(text), chunk_units):
+            events = unicode_key_events(chunk)
+            self.input_batches.append(events)
+            self.input_calls += 1
+            self.clock.sleep(self.input_call_latency)
+            window = self._focused()
+            if window and window.area == "input":
+                self._type(window, decode_key_events(events))
+            sent += len(chunk)
+        return sent
+
+    def send_enter(self):
+        window = self._focused()
+        if window and window.area == "input" and window.input_text:
+            window.sent.append(window.input_text)
+            window.input_text = ""
+
+    def send_delete(self):
+        window = self._focused()
+        if window and window.area == "input" and window.input_selected:
+            window.input_text = ""
+            window.input_selected = False
+
+    def has_selection(self, hwnd) -> Optional[bool]:
+        self._run_due()
+        window = self.windows.get(hwnd)
+        return bool(window and window.chat_selected)
+
+    def clipboard_sequence(self) -> Optional[int]:
+        self._run_due()
+        return self.clipboard.get_sequence_number()
+
+    def clipboard_text(self) -> str:
+        self._run_due()
+        return self.clipboard.get_text()
+
+
+# 사용 예시 및 테스트 함수
+def test_simulated_automation():
+    """가상 백엔드의 지연 반영 테스트"""
+    clock = SimulatedClock()
+    backend = SimulatedAutomation(clock)
+    window = backend.add_window(SimulatedWindow(1, "친구들", (0, 0, 400, 600), "김철수 [오후 2:30] 안녕"))
+
+    backend.set_foreground(1)
+    assert backend.foreground_window() is None  # 아직 반영 안 됨
+    clock.sleep(0.1)
+    assert backend.foreground_window() == 1
+
+    backend.click(200, 100)
+    backend.send_keys("^a")
+    clock.sleep(0.05)
+    assert backend.has_selection(1)
+    sequence = backend.clipboard_sequence()
+    backend.send_keys("^c")
+    assert backend.clipboard_sequence() == sequence
+    clock.sleep(0.2)
+    assert backend.clipboard_sequence() != sequence
+    assert backend.clipboard_text() == window.chat_text
+
+    backend.click(200, 550)
+    backend.send_keys("^v")
+    backend.send_enter()
+    assert window.sent == [window.chat_text]
+    print("가상 자동화 백엔드 테스트 통과")
+
+
+def test_type_text():
+    """UTF-16 변환 / 서로게이트 쌍 / 묶음 나누기 테스트"""
+    text = "ㅋㅋ 좋아😀!"
+    units = utf16_units(text)
+    assert len(units) == len(text) + 1  # 이모지는 코드 단위 2개
+    assert units[-3:-1] == [0xD83D, 0xDE00]
+    assert decode_key_events(unicode_key_events(units)) == text
+
+    # 쌍이 나뉘는 위치에서는 한 단위 앞에서 끊음
+    chunks = chunk_utf16_units(utf16_units("a😀b😀"), 2)
+    assert chunks == [[0x61], [0xD83D, 0xDE00], [0x62], [0xD83D, 0xDE00]]
+
+    backend = SimulatedAutomation()
+    window = backend.add_window(SimulatedWindow(1, "친구들", (0, 0, 400, 600)))
+    backend.foreground = 1
+    backend.click(200, 550)
+    long_text = "가나다😀" * 100
+    assert backend.type_text(long_text, chunk_units=128) == len(utf16_units(long_text))
+    assert window.input_text == long_text
+    assert all(len(batch) <= 256 for batch in backend.input_batches)
+    assert not any(0xD800 <= batch[-1][0] <= 0xDBFF for batch in backend.input_batches)  # 쌍이 나뉘지 않음
+    print(f"직접 입력 테스트 통과 ({len(backend.input_batches)}번 호출)")
+
+
+def benchmark_type_text(length: int = 500, legacy_sleep: float = 0.03):
+    """가상 백엔드로 직접 입력 시간 비교: 글자마다 입력 + sleep(예전 방식) vs 묶어서 한 번에"""
+    text = ("오늘 저녁 치킨 어때 ㅋㅋ 😀 " * length)[:length]
+    results = {}
+    for batched in (False, True):
+        clock = SimulatedClock()
+        backend = SimulatedAutomation(clock)
+        window = backend.add_window(SimulatedWindow(1, "친구들", (0, 0, 400, 600)))
+        backend.foreground = 1
+        backend.click(200, 550)
+
+        if batched:
+            backend.type_text(text)
+        else:
+            for char in text:
+                backend.send_char(char)
+                clock.sleep(legacy_sleep)
+        assert window.input_text == text
+
+        label = "한 번에 입력" if batched else "글자마다 입력"
+        results[label] = clock.now()
+        print(f"{label}: {len(text)}글자 {clock.now() * 1000:.1f}ms, 입력 호출 {backend.input_calls}번")
+    return results
+
+
+if __name__ == "__main__":
+    test_simulated_automation()
+    test_type_text()
+    benchmark_type_text()
@@ -0,0 +1,419 @@
+# chat_archive.py - 카카오톡 "대화 내보내기" 파일을 여러 프로세스로 파싱해서 SQLite 저장소에 색인
+
+import mmap
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .chat_date_parser import KakaoTalkDateParser
+from .chat_source import normalize_export_text
+from .line_classifier import LineKind
+from .message_batch import MessageBatch, NO_TIME, NO_TIMESTAMP
+
+# 내보낸 파일의 날짜 구분선 (--------------- 2024년 1월 15일 월요일 ---------------), 줄 시작에서만 찾음
+_EXPORT_DATE_HEADER = re.compile(r'^-{3,}[ \t]*\d{4}년'.encode('utf-8'), re.MULTILINE)
+
+# 첫 줄 "친구들 님과 카카오톡 대화"에서 대화방 이름 추출
+_EXPORT_TITLE_LINE = re.compile(r'^(.+?) 님과 카카오톡 대화')
+
+_EPOCH = datetime(1970, 1, 1)
+_MINUTE = timedelta(minutes=1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    path TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    messages INTEGER
+);
+CREATE TABLE IF NOT EXISTS senders (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    chat_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    minute INTEGER,
+    sender_id INTEGER NOT NULL,
+    timestamp TEXT,
+    content TEXT NOT NULL,
+    PRIMARY KEY (chat_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS messages_by_time ON messages (chat_id, minute);
+"""
+
+
+def find_chunk_bounds(buffer, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """파일 내용을 약 chunk_bytes 크기의 (시작, 끝) 구간으로 나눔
+
+    두 번째 구간부터는 항상 날짜 구분선 줄에서 시작하므로 앞 구간 없이도 날짜를 알 수 있고,
+    줄 중간(UTF-8 글자 중간)에서 잘리지 않습니다. buffer는 bytes 또는 mmap입니다.
+    """
+    size = len(buffer)
+    bounds = []
+    start = 0
+    while start < size:
+        match = _EXPORT_DATE_HEADER.search(buffer, start + max(chunk_bytes, 1))
+        end = match.start() if match else size
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def parse_chat_lines(parser: KakaoTalkDateParser, lines: Iterable[str],
+                     current_date: Optional[datetime] = None) -> Tuple[MessageBatch, Dict[str, int]]:
+    """복사한 대화 형식의 줄들을 모두 파싱 (기간 제한 / 중복 제거 없이 원본 그대로 저장하기 위함)
+
+    메시지 판별은 KakaoTalkDateParser와 같은 분류기를 쓰고, 날짜 구분선이 나오기 전에는 current_date를 씁니다.
+    """
+    classify = parser.classifier.classify
+    current_date = current_date or parser.now
+    batch = MessageBatch()
+    stats = {'lines': 0, 'dates': 0, 'filtered': 0}
+
+    for line in lines:
+        stats['lines'] += 1
+        classified = classify(line)
+        kind = classified.kind
+
+        if kind == LineKind.DATE:
+            current_date = classified.date
+            stats['dates'] += 1
+        elif kind in LineKind.FILTERED:
+            stats['filtered'] += 1
+        elif kind == LineKind.TIMESTAMPED:
+            batch.append(classified.sender, classified.content, f"{classified.am_pm} {classified.time_str}",
+                         parser.parse_time(classified.am_pm, classified.time_str, current_date))
+        elif kind in LineKind.MESSAGES:
+            batch.append(classified.sender, classified.content, None, current_date)
+
+    return batch, stats
+
+
+def parse_export_chunk(parser: KakaoTalkDateParser, data: bytes, first: bool = False):
+    """내보낸 파일의 한 구간(bytes)을 파싱 (첫 구간은 BOM / 머리말 포함)"""
+    text = data.decode('utf-8-sig' if first else 'utf-8', errors='replace')
+    return parse_chat_lines(parser, normalize_export_text(text).split('\n'))
+
+
+# 작업 프로세스마다 한 번만 만드는 파서 (패턴 컴파일 비용을 구간마다 내지 않도록)
+_worker_parser: Optional[KakaoTalkDateParser] = None
+
+
+def _init_worker(now: datetime):
+    global _worker_parser
+    _worker_parser = KakaoTalkDateParser()
+    _worker_parser.now = _worker_parser.classifier.now = now
+    _worker_parser.today = _worker_parser.classifier.today = now.date()
+
+
+def _parse_file_chunk(task):
+    """작업 프로세스: 파일을 직접 메모리 매핑해서 맡은 구간만 파싱 (구간 내용을 프로세스 사이로 복사하지 않음)"""
+    path, start, end = task
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return parse_export_chunk(_worker_parser, mapped[start:end], first=start == 0)
+
+
+def export_chat_name(path: str) -> str:
+    """내보낸 파일의 대화방 이름 (첫 줄 "OO 님과 카카오톡 대화", 없으면 파일 이름)"""
+    with open(path, encoding='utf-8-sig', errors='replace') as f:
+        match = _EXPORT_TITLE_LINE.match(f.readline().strip())
+    if match:
+        return match.group(1)
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class IngestReport:
+    """파일 하나를 저장소에 넣은 결과"""
+
+    def __init__(self, chat: str, path: str, size: int, messages: int = 0, chunks: int = 0, workers: int = 0,
+                 seconds: float = 0.0, skipped: bool = False, stats: Optional[Dict[str, int]] = None):
+        self.chat = chat
+        self.path = path
+        self.size = size
+        self.messages = messages
+        self.chunks = chunks
+        self.workers = workers
+        self.seconds = seconds
+        self.skipped = skipped
+        self.stats = stats or {}
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.size / 1e6 / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        if self.skipped:
+            return f"{self.chat}: 바뀌지 않은 파일이라 건너뜀 ({self.size / 1e6:.1f}MB)"
+        return (f"{self.chat}: {self.size / 1e6:.1f}MB, 메시지 {self.messages:,}개, 구간 {self.chunks}개, "
+                f"프로세스 {self.workers}개, {self.seconds:.2f}초 ({self.megabytes_per_second:.1f}MB/s)")
+
+
+class ChatArchive:
+    """내보낸 대화를 대화방별로 저장하는 SQLite 저장소
+
+    발신자는 번호로 한 번만 저장하고, 시간은 1970-01-01 기준 분 단위 정수(MessageBatch와 같음)로 저장합니다.
+    기간 제한 / 중복 제거는 하지 않고 파일의 메시지를 순서대로 모두 저장하므로,
+    꺼낸 뒤에는 평소처럼 파서가 걸러냅니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+        self._sender_ids: Dict[str, int] = dict(self.db.execute("SELECT name, id FROM senders").fetchall())
+
+    def close(self):
+        self.db.close()
+
+    def chats(self) -> List[Tuple[str, int]]:
+        """저장된 (대화방 이름, 메시지 수) 목록"""
+        return self.db.execute("SELECT name, messages FROM chats ORDER BY name").fetchall()
+
+    def find_chat(self, title: str) -> Optional[str]:
+        """창 제목에 맞는 대화방 이름 (같은 이름 → 제목에 이름이 들어 있는 가장 긴 이름 순)
+
+        빈 이름은 모든 제목에 들어 있는 것으로 판정되므로 제목이나 대화방 이름이 비어 있으면 맞추지 않습니다.
+        """
+        if not title:
+            return None
+        names = [name for name, _ in self.chats() if name]
+        if title in names:
+            return title
+        matches = [name for name in names if name in title]
+        return max(matches, key=len) if matches else None
+
+    def _sender_id(self, name: str) -> int:
+        number = self._sender_ids.get(name)
+        if number is None:
+            number = self.db.execute("INSERT INTO senders (name) VALUES (?)", (name,)).lastrowid
+            self._sender_ids[name] = number
+        return number
+
+    def _insert_batch(self, chat_id: int, seq: int, batch: MessageBatch) -> int:
+        sender_ids = [self._sender_id(name) for name in batch.sender_table]
+        timestamps = batch.timestamp_table
+        content = batch.content_text
+        offsets = batch.content_offsets
+        rows = ((chat_id, seq + index,
+                 minute if minute != NO_TIME else None,
+                 sender_ids[batch.sender_ids[index]],
+                 timestamps[stamp] if stamp != NO_TIMESTAMP else None,
+                 content[offsets[index]:offsets[index + 1]])
+                for index, (minute, stamp) in enumerate(zip(batch.minutes, batch.timestamp_ids)))
+        self.db.executemany("INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return seq + len(batch)
+
+    def ingest(self, path: str, chat: Optional[str] = None, workers: int = 0, chunk_bytes: int = 8 << 20,
+               force: bool = False, now: Optional[datetime] = None) -> IngestReport:
+        """내보낸 파일을 저장소에 넣기 (같은 대화방의 기존 내용은 교체)
+
+        파일을 메모리 매핑해서 날짜 구분선 기준으로 나누고, workers개(0이면 CPU 수) 프로세스에서 구간별로 파싱합니다.
+        결과는 파일 순서대로 받아서 저장하므로 앞 구간을 저장하는 동안 뒤 구간 파싱이 계속됩니다.
+        크기 / 수정 시각이 그대로인 파일은 force가 아니면 건너뜁니다.
+        """
+        chat = chat or export_chat_name(path)
+        stat = os.stat(path)
+        row = self.db.execute("SELECT size, mtime_ns FROM chats WHERE name = ?", (chat,)).fetchone()
+        if row == (stat.st_size, stat.st_mtime_ns) and not force:
+            return IngestReport(chat, path, stat.st_size, skipped=True)
+
+        start_time = time.perf_counter()
+        now = now or datetime.now()
+        with open(path, 'rb') as f:
+            if stat.st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    bounds = find_chunk_bounds(mapped, chunk_bytes)
+            else:
+                bounds = []
+        workers = min(workers or os.cpu_count() or 1, max(len(bounds), 1))
+
+        totals = {'lines': 0, 'dates': 0, 'filtered': 0}
+        with self.db:
+            self.db.execute("INSERT OR IGNORE INTO chats (name) VALUES (?)", (chat,))
+            chat_id = self.db.execute("SELECT id FROM chats WHERE name = ?", (chat,)).fetchone()[0]
+            self.db.execute("DELETE FROM messages WHERE chat_id = ?", (chat_id,))
+
+            tasks = [(path, start, end) for start, end in bounds]
+            if workers > 1:
+                executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(now,))
+                results = executor.map(_parse_file_chunk, tasks)
+            else:
+                executor = None
+                _init_worker(now)
+                results = map(_parse_file_chunk, tasks)
+
+            try:
+                seq = 0
+                for batch, stats in results:
+                    seq = self._insert_batch(chat_id, seq, batch)
+                    for key in totals:
+                        totals[key] += stats[key]
+            finally:
+                if executor:
+                    executor.shutdown()
+
+            self.db.execute("UPDATE chats SET path = ?, size = ?, mtime_ns = ?, messages = ? WHERE id = ?",
+                            (path, stat.st_size, stat.st_mtime_ns, seq, chat_id))
+
+        return IngestReport(chat, path, stat.st_size, seq, len(bounds), workers,
+                            time.perf_counter() - start_time, stats=totals)
+
+    def recent_messages(self, chat: str, max_messages: int) -> MessageBatch:
+        """대화방의 마지막 max_messages개 메시지 (오래된 것부터)"""
+        rows = self.db.execute(
+            "SELECT m.minute, s.name, m.timestamp, m.content FROM messages m JOIN senders s ON s.id = m.sender_id "
+            "WHERE m.chat_id = (SELECT id FROM chats WHERE name = ?) ORDER BY m.seq DESC LIMIT ?",
+            (chat, max_messages)).fetchall()
+
+        batch = MessageBatch()
+        for minute, sender, timestamp, content in reversed(rows):
+            batch.append(sender, content, timestamp, _EPOCH + minute * _MINUTE if minute is not None else None)
+        return batch
+
+    def recent_text(self, chat: str, max_messages: int) -> str:
+        """마지막 메시지들을 대화 영역을 복사했을 때와 같은 형식으로 (기존 파서에 그대로 넘길 수 있음)"""
+        lines = []
+        last_day = None
+        for message in self.recent_messages(chat, max_messages):
+            if message.raw_time and message.raw_time.date() != last_day:
+                last_day = message.raw_time.date()
+                lines.append(f"{last_day.year}년 {last_day.month}월 {last_day.day}일")
+
+            if message.timestamp:
+                lines.append(f"{message.sender} {message.timestamp} {message.content}")
+            elif message.sender == "(연속)":
+                lines.append(message.content)
+            else:
+                lines.append(f"{message.sender} {message.content}")
+        return '\n'.join(lines)
+
+
+# 사용 예시 및 테스트 함수
+def write_sample_export(path: str, days: int, messages_per_day: int, title: str = "친구들",
+                        start: datetime = datetime(2021, 1, 1)):
+    """테스트용 내보내기 파일 생성 (메시지 / 여러 줄 메시지 / 시스템 메시지 / URL 섞음)"""
+    senders = ["김철수", "이영희", "박민수"]
+    texts = ["저녁 뭐 먹지", "치킨 어때요", "좋아요 ㅋㅋ", "내일 회의 몇 시죠?", "이 링크 봐보세요 https://example.com"]
+    with open(path, 'w', encoding='utf-8-sig', newline='\n') as f:
+        f.write(f"{title} 님과 카카오톡 대화\n저장한 날짜 : 2024-06-02 10:00:00\n\n")
+        for day in range(days):
+            date = start + timedelta(days=day)
+            f.write(f"--------------- {date.year}년 {date.month}월 {date.day}일 ---------------\n")
+            for index in range(messages_per_day):
+                minutes = index * (24 * 60 - 1) // max(messages_per_day, 1)
+                hour, minute = divmod(minutes, 60)
+                am_pm = "오전" if hour < 12 else "오후"
+                sender = senders[(day + index) % len(senders)]
+                f.write(f"[{sender}] [{am_pm} {(hour % 12) or 12}:{minute:02d}] {texts[index % len(texts)]} {day}-{index}\n")
+                if index % 7 == 3:
+                    f.write("두번째줄메시지입니다\n")
+                if index % 11 == 5:
+                    f.write(f"{sender}님이 들어왔습니다\n")
+
+
+def _batch_rows(batch) -> List[tuple]:
+    return [tuple(message) for message in batch]
+
+
+def test_chat_archive():
+    """구간 경계 / 병렬 파싱 결과가 파일 전체를 한 번에 파싱한 결과와 같은지, 다시 넣기 / 꺼내기 테스트"""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "KakaoTalk_친구들.txt")
+        write_sample_export(path, days=40, messages_per_day=30)
+        now = datetime(2024, 6, 2, 10, 0)
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        bounds = find_chunk_bounds(data, 4096)
+        assert bounds[0][0] == 0 and bounds[-1][1] == len(data) and len(bounds) > 5
+        assert all(data[start:start + 3] == b'---' for start, _ in bounds[1:])
+        assert all(end == next_start for (_, end), (next_start, _) in zip(bounds, bounds[1:]))
+
+        _init_worker(now)
+        expected, expected_stats = parse_export_chunk(_worker_parser, data, first=True)
+        assert expected_stats['dates'] == 40 and len(expected) > 40 * 20
+
+        archive = ChatArchive(os.path.join(directory, "archive.db"))
+        for workers in (1, 2):
+            report = archive.ingest(path, workers=workers, chunk_bytes=4096, force=True, now=now)
+            assert report.chat == "친구들" and report.chunks == len(bounds)
+            assert report.messages == len(expected) and report.stats == expected_stats
+            assert _batch_rows(archive.recent_messages("친구들", len(expected) + 10)) == _batch_rows(expected)
+
+        assert archive.ingest(path, now=now).skipped  # 바뀌지 않은 파일은 다시 파싱하지 않음
+        assert archive.chats() == [("친구들", len(expected))]
+        assert archive.find_chat("친구들 (3)") == "친구들" and archive.find_chat("회사") is None
+        assert archive.find_chat("") is None
+
+        # 꺼낸 텍스트를 기존 파서로 다시 파싱해도 같은 메시지 (연속 메시지 포함)
+        recent = archive.recent_messages("친구들", 50)
+        reparsed, _ = parse_chat_lines(_worker_parser, archive.recent_text("친구들", 50).split('\n'))
+        assert _batch_rows(reparsed) == _batch_rows(recent)
+        assert any(message.sender == "(연속)" for message in recent)
+
+        from .chat_source import ArchiveChatSource
+        source = ArchiveChatSource(archive.path, {1: "친구들", 2: "회사"}.get, max_messages=50)
+        assert source.fetch(1)['content'] == archive.recent_text("친구들", 50)
+        assert source.fetch(2) is None
+        archive.close()
+
+    print(f"대화 저장소 테스트 통과 (구간 {len(bounds)}개, 메시지 {len(expected)}개)")
+
+
+def benchmark_chat_archive(megabytes: float = 8, worker_counts=(1, 2, 4, 8)):
+    """내보낸 파일 저장 처리량 비교 (MB/s): 프로세스 수별"""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "KakaoTalk_벤치마크.txt")
+        days = max(int(megabytes * 1e6 / (200 * 55)), 1)
+        write_sample_export(path, days=days, messages_per_day=200, title="벤치마크")
+        print(f"파일 크기: {os.path.getsize(path) / 1e6:.1f}MB, CPU {os.cpu_count()}개")
+
+        for workers in worker_counts:
+            archive = ChatArchive(os.path.join(directory, f"archive_{workers}.db"))
+            print(f"  {archive.ingest(path, workers=workers, chunk_bytes=1 << 20)}")
+            archive.close()
+
+        archive = ChatArchive(os.path.join(directory, f"archive_{worker_counts[0]}.db"))
+        start = time.perf_counter()
+        text = archive.recent_text("벤치마크", 300)
+        print(f"최근 300개 꺼내기: {(time.perf_counter() - start) * 1000:.1f}ms ({len(text):,}자)")
+        archive.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="카카오톡 대화 내보내기 파일을 대화 저장소에 넣기")
+    arg_parser.add_argument("files", nargs="*", help="내보낸 대화 .txt 파일 (없으면 테스트 / 벤치마크 실행)")
+    arg_parser.add_argument("--db", help="저장소 파일 (기본: config의 CHAT_ARCHIVE_FILE)")
+    arg_parser.add_argument("--workers", type=int, help="파싱 프로세스 수 (0이면 CPU 수)")
+    arg_parser.add_argument("--chunk-mb", type=float, help="구간 크기 (MB)")
+    arg_parser.add_argument("--force", action="store_true", help="바뀌지 않은 파일도 다시 넣기")
+    args = arg_parser.parse_args()
+
+    if not args.files:
+        test_chat_archive()
+        benchmark_chat_archive()
+    else:
+        from config import CHAT_ARCHIVE_FILE, CHAT_ARCHIVE_WORKERS, CHAT_ARCHIVE_CHUNK_MB
+
+        db_path = args.db or CHAT_ARCHIVE_FILE
+        if not db_path:
+            arg_parser.error("저장소 파일을 --db나 config의 CHAT_ARCHIVE_FILE로 지정해주세요")
+        archive = ChatArchive(db_path)
+        workers = CHAT_ARCHIVE_WORKERS if args.workers is None else args.workers
+        chunk_mb = args.chunk_mb or CHAT_ARCHIVE_CHUNK_MB
+        for file in args.files:
+            print(archive.ingest(file, workers=workers, chunk_bytes=int(chunk_mb * 1e6), force=args.force))
+        archive.close()
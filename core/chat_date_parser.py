@@ -1,12 +1,18 @@
 # chat_date_parser.py - 날짜 기반 카카오톡 대화 파싱 (최근 하루)
 
-import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
+
+from .line_classifier import LineClassifier, LineKind, ClassifiedLine
+from .line_reader import line_bounds, count_lines
+from .dedup import DedupPolicy, TimeWindowDedup, LayeredDedup
+from .message_batch import MessageBatch, NO_TIME
 
 
 class ChatMessage:
-    """개별 채팅 메시지 클래스"""
+    """개별 채팅 메시지 클래스 (__slots__ 사용)"""
+
+    __slots__ = ('sender', 'content', 'timestamp', 'raw_time')
 
     def __init__(self, sender: str, content: str, timestamp: str = None, parsed_time: datetime = None):
         self.sender = sender
@@ -21,10 +27,38 @@ class ChatMessage:
             return f"{self.sender}: {self.content}"
 
 
+class DateParseState:
+    """날짜 기반 파싱 중간 상태 (줄을 이어서 파싱할 수 있도록 보관)"""
+
+    __slots__ = ('current_date', 'dedup', 'line_number', 'messages', 'filtered_count', 'date_sections_found')
+
+    def __init__(self, current_date: datetime, dedup: DedupPolicy, line_number: int = 0, as_batch: bool = False):
+        self.current_date = current_date  # 마지막으로 나온 날짜 구분선 (없으면 기준 시간)
+        self.dedup = dedup
+        self.line_number = line_number  # 마지막으로 파싱한 라인 번호
+        # as_batch면 ChatMessage를 모아두지 않고 바로 MessageBatch에 추가
+        self.messages = MessageBatch() if as_batch else []
+        self.filtered_count = 0
+        self.date_sections_found = 0
+
+    def keep(self, message: ChatMessage):
+        """중복 검사를 통과한 메시지 보관"""
+        if isinstance(self.messages, MessageBatch):
+            self.messages.append_message(message)
+        else:
+            self.messages.append(message)
+
+
 class KakaoTalkDateParser:
     """날짜 기반 카카오톡 대화 파서 클래스 (최근 하루)"""
 
-    def __init__(self):
+    def __init__(self, limit_hours: int = 24, dedup_policy: Callable[[], DedupPolicy] = TimeWindowDedup):
+        # 최근 몇 시간까지 가져올지 (config의 DATE_LIMIT_HOURS)
+        self.limit_hours = limit_hours
+
+        # 중복 메시지 판별 정책 (추출할 때마다 새로 생성, 기본: 1분 이내 같은 내용)
+        self.dedup_policy = dedup_policy
+
         # 카카오톡 메시지 패턴들
         self.message_patterns = [
             # 기본 패턴: [발신자] [시간] 메시지
@@ -165,40 +199,13 @@ class KakaoTalkDateParser:
         self.today = self.now.date()
         self.yesterday = self.today - timedelta(days=1)
 
+        # 한 줄을 한 번만 검사하는 분류기 (패턴은 프로세스당 한 번만 컴파일)
+        self.classifier = LineClassifier(self.message_patterns, self.system_patterns, self.url_patterns,
+                                         date_patterns=self.date_patterns, now=self.now)
+
     def parse_date_line(self, line: str) -> Optional[datetime]:
         """날짜 라인을 파싱하여 datetime 객체 반환"""
-        line = line.strip()
-        
-        for pattern in self.date_patterns:
-            match = re.match(pattern, line)
-            if match:
-                groups = match.groups()
-                
-                if '년' in line and '월' in line and '일' in line:
-                    # 2024년 1월 15일 형태
-                    year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
-                    try:
-                        return datetime(year, month, day)
-                    except ValueError:
-                        continue
-                        
-                elif '월' in line and '일' in line:
-                    # 1월 15일 형태 (현재 년도로 가정)
-                    month, day = int(groups[0]), int(groups[1])
-                    try:
-                        return datetime(self.now.year, month, day)
-                    except ValueError:
-                        continue
-                        
-                elif groups[0] == '오늘':
-                    return datetime.combine(self.today, datetime.min.time())
-                elif groups[0] == '어제':
-                    return datetime.combine(self.yesterday, datetime.min.time())
-                elif groups[0] == '그저께':
-                    day_before_yesterday = self.today - timedelta(days=2)
-                    return datetime.combine(day_before_yesterday, datetime.min.time())
-        
-        return None
+        return self.classifier.parse_date(line.strip())
 
     def parse_time(self, am_pm: str, time_str: str, base_date: datetime) -> datetime:
         """시간 문자열을 파싱하여 완전한 datetime 객체 생성"""
@@ -217,33 +224,11 @@ class KakaoTalkDateParser:
 
     def contains_url(self, text: str) -> bool:
         """텍스트에 URL이 포함되어 있는지 확인"""
-        for pattern in self.url_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        return False
+        return self.classifier.url_matcher.search(text)
 
     def is_system_message(self, line: str) -> bool:
-        """시스템 메시지인지 확인 (URL 포함 메시지도 시스템 메시지로 간주)"""
-        line = line.strip()
-
-        # 빈 줄이거나 너무 짧은 메시지
-        if len(line) < 2:
-            return True
-
-        # URL이 포함된 메시지는 시스템 메시지로 간주
-        if self.contains_url(line):
-            return True
-
-        # 날짜 라인은 시스템 메시지로 간주
-        if self.parse_date_line(line):
-            return True
-
-        # 기존 시스템 메시지 패턴 확인
-        for pattern in self.system_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                return True
-
-        return False
+        """시스템 메시지인지 확인 (URL 포함 메시지와 날짜 라인도 시스템 메시지로 간주)"""
+        return self.classifier.classify(line).kind in (LineKind.DATE,) + LineKind.FILTERED
 
     def is_within_last_day(self, message_time: datetime) -> bool:
         """메시지가 최근 하루 이내인지 확인"""
@@ -251,130 +236,158 @@ class KakaoTalkDateParser:
             return True  # 시간 정보가 없으면 포함
         
         time_diff = self.now - message_time
-        return time_diff.total_seconds() <= 24 * 3600  # 24시간 이내
+        return time_diff.total_seconds() <= self.limit_hours * 3600  # limit_hours 이내
 
     def parse_message_line(self, line: str, current_date: datetime) -> Optional[ChatMessage]:
         """한 줄을 파싱해서 ChatMessage 객체 생성"""
-        line = line.strip()
-
-        # 시스템 메시지 필터링 (URL 포함 메시지도 여기서 걸러짐)
-        if self.is_system_message(line):
-            return None
-
-        # 다양한 패턴으로 메시지 파싱 시도
-        for pattern in self.message_patterns:
-            match = re.match(pattern, line)
-            if match:
-                groups = match.groups()
-
-                if len(groups) == 4:  # 발신자, 오전/오후, 시간, 메시지
-                    sender, am_pm, time_str, content = groups
-                    if content and content.strip():
-                        # 메시지 내용에 URL이 있는지 확인
-                        if self.contains_url(content):
-                            return None
-                        
-                        # 완전한 시간 파싱
-                        message_time = self.parse_time(am_pm, time_str, current_date)
-                        
-                        # 최근 하루 이내 메시지인지 확인
-                        if not self.is_within_last_day(message_time):
-                            return None
-                        
-                        return ChatMessage(
-                            sender=sender.strip(),
-                            content=content.strip(),
-                            timestamp=f"{am_pm} {time_str}",
-                            parsed_time=message_time
-                        )
-                        
-                elif len(groups) == 2:  # 발신자, 메시지 (또는 연속 메시지)
-                    sender, content = groups
-                    # 발신자 이름이 너무 길면 메시지의 일부일 가능성
-                    if len(sender) < 20 and content and content.strip():
-                        # 메시지 내용에 URL이 있는지 확인
-                        if self.contains_url(content):
-                            return None
-                        return ChatMessage(
-                            sender=sender.strip(),
-                            content=content.strip(),
-                            parsed_time=current_date
-                        )
-
-        # 패턴에 맞지 않는 경우, 이전 메시지의 연속으로 처리
-        if len(line) > 5:  # 최소 길이 확인
-            # URL이 포함된 연속 메시지도 제거
-            if self.contains_url(line):
+        return self._message_from_line(self.classifier.classify(line), current_date)
+
+    def _message_from_line(self, classified: ClassifiedLine, current_date: datetime) -> Optional[ChatMessage]:
+        """분류 결과로 ChatMessage 객체 생성 (시스템 메시지/URL/날짜/짧은 라인은 None)"""
+        if classified.kind == LineKind.TIMESTAMPED:
+            # 완전한 시간 파싱
+            message_time = self.parse_time(classified.am_pm, classified.time_str, current_date)
+
+            # 최근 하루 이내 메시지인지 확인
+            if not self.is_within_last_day(message_time):
                 return None
+
+            return ChatMessage(
+                sender=classified.sender,
+                content=classified.content,
+                timestamp=f"{classified.am_pm} {classified.time_str}",
+                parsed_time=message_time
+            )
+
+        if classified.kind in LineKind.MESSAGES:
             return ChatMessage(
-                sender="(연속)",
-                content=line,
+                sender=classified.sender,
+                content=classified.content,
                 parsed_time=current_date
             )
 
         return None
 
-    def extract_last_day_messages(self, chat_text: str) -> List[ChatMessage]:
-        """채팅 텍스트에서 최근 하루 메시지들을 추출"""
-        lines = chat_text.split('\n')
-        messages = []
-        current_date = self.now  # 기본값은 현재 시간
-        filtered_count = 0
-        date_sections_found = 0
+    def find_recent_start(self, chat_text: str, lower: int = 0) -> int:
+        """기간 안에 들 수 없는 마지막 'YYYY년 M월 D일' 구분선의 시작 위치 반환 (없으면 0)
+
+        뒤에서부터 '년' 글자를 rfind로 건너뛰며 구분선을 찾으므로,
+        비용은 전체 기록이 아니라 최근 구간의 길이에 비례합니다.
+        구분선은 시간순으로 나온다고 가정하며, 그 앞의 내용은 모두 기간 밖으로 봅니다.
+        lower(줄 시작 위치)를 주면 그 뒤에 있는 구분선만 찾습니다.
+        """
+        cutoff = self.now - timedelta(hours=self.limit_hours)
+        index = len(chat_text)
+
+        while True:
+            index = chat_text.rfind('년', lower, index)
+            if index < 0:
+                return 0
+
+            start, end = line_bounds(chat_text, index)
+            line = chat_text[start:end].strip()
+            header_date = self.classifier.parse_date(line) if '년' in line else None
+
+            # 해당 날짜의 마지막 시각(23:59)까지 기간 밖이면 이 구분선부터 파싱
+            if header_date and header_date + timedelta(days=1) <= cutoff:
+                return start
+
+            index = start
+
+    def new_parse_state(self, skipped_lines: int = 0, as_batch: bool = False) -> DateParseState:
+        """새 파싱 상태 생성 (skipped_lines는 건너뛴 앞부분 줄 수, 라인 번호 출력용)"""
+        return DateParseState(self.now, self.dedup_policy(), skipped_lines, as_batch)
+
+    def fork_parse_state(self, state: DateParseState) -> DateParseState:
+        """상태 사본 생성 (원본 상태는 바꾸지 않고 몇 줄 더 파싱해볼 때 사용)"""
+        fork = DateParseState(state.current_date, LayeredDedup(state.dedup, self.dedup_policy()), state.line_number)
+        fork.messages = list(state.messages)
+        fork.filtered_count = state.filtered_count
+        fork.date_sections_found = state.date_sections_found
+        return fork
+
+    def feed_line(self, state: DateParseState, line: str):
+        """한 줄을 파싱해서 상태에 반영"""
+        state.line_number += 1
+
+        # 한 번의 분류로 날짜/시스템 메시지/메시지 여부를 함께 확인
+        classified = self.classifier.classify(line)
+
+        # 날짜 라인 확인
+        if classified.kind == LineKind.DATE:
+            state.current_date = classified.date
+            state.date_sections_found += 1
+            print(f"📆 날짜 섹션 발견: {state.current_date.strftime('%Y-%m-%d')} (라인 {state.line_number})")
+            return
+
+        # 시스템 메시지인지 확인
+        if classified.kind in LineKind.FILTERED:
+            state.filtered_count += 1
+            return
+
+        # 메시지 파싱
+        message = self._message_from_line(classified, state.current_date)
+        if message and message.content:
+            # 최근 하루 이내 메시지인지 확인
+            if self.is_within_last_day(message.raw_time):
+                # 중복 메시지 확인
+                if not state.dedup.check_and_add(message):
+                    state.keep(message)
+            else:
+                # 하루를 넘긴 메시지는 카운트만
+                state.filtered_count += 1
+
+    def sorted_messages(self, state: DateParseState):
+        """상태의 메시지를 시간순으로 정렬해서 반환 (상태는 바꾸지 않음)"""
+        messages = state.messages
+        if not isinstance(messages, MessageBatch):
+            return sorted(messages, key=lambda x: x.raw_time if x.raw_time else self.now)
+
+        # 분 단위 배열로 순서만 정렬하고, 이미 시간순이면 그대로 반환
+        now = messages.minute_of(self.now)
+        minutes = messages.minutes
+        order = sorted(range(len(messages)), key=lambda i: minutes[i] if minutes[i] != NO_TIME else now)
+        if all(i == index for i, index in enumerate(order)):
+            return messages
+        return messages.take(order)
+
+    def print_parse_stats(self, chat_text: str, state: DateParseState, skipped_lines: int, extracted: int):
+        """필터링 통계 출력"""
+        print(f"📊 날짜 기반 분석 완료:")
+        print(f"   - 총 라인 수: {count_lines(chat_text)}")
+        if skipped_lines:
+            print(f"   - 건너뜀: {skipped_lines}줄 (최근 {self.limit_hours}시간 이전 기록)")
+        print(f"   - 날짜 섹션: {state.date_sections_found}개")
+        print(f"   - 필터링됨: {state.filtered_count}개 (시스템 메시지/URL/하루 초과)")
+        print(f"   - 추출됨: {extracted}개 (최근 {self.limit_hours}시간 이내)")
+
+    def extract_last_day_messages(self, chat_text: str, seek_tail: bool = True, as_batch: bool = False,
+                                  start: Optional[int] = None):
+        """채팅 텍스트에서 최근 하루 메시지들을 추출
+
+        seek_tail이 True면 기간 밖의 오래된 기록은 건너뛰고 마지막 구간만 파싱합니다.
+        start를 주면 find_recent_start로 이미 찾은 위치로 보고 다시 찾지 않습니다.
+        as_batch가 True면 ChatMessage 리스트 대신 MessageBatch로 반환합니다.
+        """
+        if start is None:
+            start = self.find_recent_start(chat_text) if seek_tail else 0
+        skipped_lines = chat_text.count('\n', 0, start)
+        state = self.new_parse_state(skipped_lines, as_batch)
 
         print(f"📅 날짜 기반 파싱 시작 - 기준 시간: {self.now.strftime('%Y-%m-%d %H:%M')}")
         
         # 정순으로 처리 (날짜 정보를 순차적으로 파악하기 위해)
-        for i, line in enumerate(lines):
-            # 날짜 라인 확인
-            parsed_date = self.parse_date_line(line)
-            if parsed_date:
-                current_date = parsed_date
-                date_sections_found += 1
-                print(f"📆 날짜 섹션 발견: {parsed_date.strftime('%Y-%m-%d')} (라인 {i+1})")
-                continue
-
-            # 시스템 메시지인지 확인
-            if self.is_system_message(line):
-                filtered_count += 1
-                continue
-
-            # 메시지 파싱
-            message = self.parse_message_line(line, current_date)
-            if message and message.content:
-                # 최근 하루 이내 메시지인지 확인
-                if self.is_within_last_day(message.raw_time):
-                    # 중복 메시지 확인
-                    if not self._is_duplicate_message(message, messages):
-                        messages.append(message)
-                else:
-                    # 하루를 넘긴 메시지는 카운트만
-                    filtered_count += 1
+        for line in chat_text[start:].split('\n'):
+            self.feed_line(state, line)
 
         # 시간순으로 정렬 (최신 메시지가 마지막에)
-        messages.sort(key=lambda x: x.raw_time if x.raw_time else self.now)
-        
-        # 필터링 통계 출력
-        print(f"📊 날짜 기반 분석 완료:")
-        print(f"   - 총 라인 수: {len(lines)}")
-        print(f"   - 날짜 섹션: {date_sections_found}개")
-        print(f"   - 필터링됨: {filtered_count}개 (시스템 메시지/URL/하루 초과)")
-        print(f"   - 추출됨: {len(messages)}개 (최근 24시간 이내)")
-        
-        return messages
+        messages = self.sorted_messages(state)
+        self.print_parse_stats(chat_text, state, skipped_lines, len(messages))
 
-    def _is_duplicate_message(self, new_message: ChatMessage, existing_messages: List[ChatMessage]) -> bool:
-        """중복 메시지 확인"""
-        for existing in existing_messages:
-            if (existing.sender == new_message.sender and
-                    existing.content == new_message.content and
-                    existing.raw_time and new_message.raw_time and
-                    abs((existing.raw_time - new_message.raw_time).total_seconds()) < 60):  # 1분 이내 같은 내용
-                return True
-        return False
+        return messages
 
     def format_messages_for_gpt(self, messages: List[ChatMessage]) -> str:
-        """GPT에 전송할 형식으로 메시지들을 포맷팅"""
+        """API에 전송할 형식으로 메시지들을 포맷팅"""
         if not messages:
             return ""
 
@@ -425,10 +438,8 @@ class KakaoTalkDateParser:
         }
 
 
-# 사용 예시 및 테스트 함수
-def test_date_parser():
-    """날짜 파서 테스트 함수"""
-    sample_chat = """
+# 테스트용 샘플 대화 (dedup.py의 test_dedup에서도 사용)
+SAMPLE_DATE_CHAT = """
     2024년 6월 1일
     김철수 오전 9:30 좋은 아침이에요!
     이영희 오전 9:31 네 안녕하세요
@@ -444,6 +455,12 @@ def test_date_parser():
     이영희 오전 10:01 좋았습니다
     """
 
+
+# 사용 예시 및 테스트 함수
+def test_date_parser():
+    """날짜 파서 테스트 함수"""
+    sample_chat = SAMPLE_DATE_CHAT
+
     parser = KakaoTalkDateParser()
     messages = parser.extract_last_day_messages(sample_chat)
 
@@ -457,7 +474,7 @@ def test_date_parser():
     for key, value in summary.items():
         print(f"{key}: {value}")
 
-    print("\n=== GPT 전송용 포맷 ===")
+    print("\n=== API 전송용 포맷 ===")
     formatted = parser.format_messages_for_gpt(messages)
     print(formatted)
 
@@ -2,36 +2,50 @@
 
 import re
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
+
+from .line_classifier import LineClassifier, LineKind, ClassifiedLine
+from .line_reader import iter_lines_reversed, count_lines
+from .dedup import DedupPolicy, SenderContentDedup
+from .message_batch import MessageBatch
+
+
+# 시간 문자열 형식 (오후 3:45 / 3시 45분 / 2024. 1. 15.)
+_TIME_REGEX = re.compile(r'(\d{1,2}):(\d{2})|(\d{1,2})시 (\d{1,2})분|(\d{4})\. (\d{1,2})\. (\d{1,2})\.')
+
+# 아직 시간 파싱을 하지 않았다는 표시
+_UNPARSED = object()
 
 
 class ChatMessage:
-    """개별 채팅 메시지 클래스"""
+    """개별 채팅 메시지 클래스 (__slots__ 사용, 시간은 처음 접근할 때 파싱)"""
+
+    __slots__ = ('sender', 'content', 'timestamp', '_raw_time')
 
     def __init__(self, sender: str, content: str, timestamp: str = None):
         self.sender = sender
         self.content = content
         self.timestamp = timestamp
-        self.raw_time = None
+        self._raw_time = _UNPARSED
+
+    @property
+    def raw_time(self) -> Optional[datetime]:
+        if self._raw_time is _UNPARSED:
+            # 시간 정보가 있으면 파싱
+            self._raw_time = self._parse_time(self.timestamp) if self.timestamp else None
+        return self._raw_time
 
-        # 시간 정보가 있으면 파싱
-        if timestamp:
-            self.raw_time = self._parse_time(timestamp)
+    @raw_time.setter
+    def raw_time(self, value: Optional[datetime]):
+        self._raw_time = value
 
     def _parse_time(self, time_str: str) -> Optional[datetime]:
         """시간 문자열을 datetime 객체로 변환"""
         try:
             # 다양한 시간 형식 처리
-            time_patterns = [
-                r'(\d{1,2}):(\d{2})',  # 오후 3:45, 오전 11:30
-                r'(\d{1,2})시 (\d{1,2})분',  # 3시 45분
-                r'(\d{4})\. (\d{1,2})\. (\d{1,2})\.',  # 2024. 1. 15.
-            ]
-
-            for pattern in time_patterns:
-                if re.search(pattern, time_str):
-                    # 간단한 시간 파싱 (실제로는 더 정교한 파싱 필요)
-                    return datetime.now()  # 임시로 현재 시간 반환
+            if _TIME_REGEX.search(time_str):
+                # 간단한 시간 파싱 (실제로는 더 정교한 파싱 필요)
+                return datetime.now()  # 임시로 현재 시간 반환
 
             return None
         except:
@@ -47,7 +61,10 @@ class ChatMessage:
 class KakaoTalkChatParser:
     """카카오톡 대화 파서 클래스 (개선된 버전)"""
 
-    def __init__(self):
+    def __init__(self, dedup_policy: Callable[[], DedupPolicy] = SenderContentDedup):
+        # 중복 메시지 판별 정책 (추출할 때마다 새로 생성)
+        self.dedup_policy = dedup_policy
+
         # 카카오톡 메시지 패턴들
         self.message_patterns = [
             # 기본 패턴: [발신자] [시간] 메시지
@@ -174,123 +191,73 @@ class KakaoTalkChatParser:
             r'pf\.kakao\.com/[^\s]+',  # 카카오 플러스친구 링크
         ]
 
+        # 한 줄을 한 번만 검사하는 분류기 (패턴은 프로세스당 한 번만 컴파일)
+        self.classifier = LineClassifier(self.message_patterns, self.system_patterns, self.url_patterns)
+
     def contains_url(self, text: str) -> bool:
         """텍스트에 URL이 포함되어 있는지 확인"""
-        for pattern in self.url_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        return False
+        return self.classifier.url_matcher.search(text)
 
     def is_system_message(self, line: str) -> bool:
         """시스템 메시지인지 확인 (URL 포함 메시지도 시스템 메시지로 간주)"""
-        line = line.strip()
-
-        # 빈 줄이거나 너무 짧은 메시지
-        if len(line) < 2:
-            return True
-
-        # URL이 포함된 메시지는 시스템 메시지로 간주
-        if self.contains_url(line):
-            return True
-
-        # 기존 시스템 메시지 패턴 확인
-        for pattern in self.system_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                return True
-
-        return False
+        return self.classifier.classify(line).kind in LineKind.FILTERED
 
     def parse_message_line(self, line: str) -> Optional[ChatMessage]:
         """한 줄을 파싱해서 ChatMessage 객체 생성"""
-        line = line.strip()
+        return self._message_from_line(self.classifier.classify(line))
 
-        # 시스템 메시지 필터링 (URL 포함 메시지도 여기서 걸러짐)
-        if self.is_system_message(line):
+    def _message_from_line(self, classified: ClassifiedLine) -> Optional[ChatMessage]:
+        """분류 결과로 ChatMessage 객체 생성 (시스템 메시지/URL/짧은 라인은 None)"""
+        if classified.kind not in LineKind.MESSAGES:
             return None
 
-        # 다양한 패턴으로 메시지 파싱 시도
-        for pattern in self.message_patterns:
-            match = re.match(pattern, line)
-            if match:
-                groups = match.groups()
-
-                if len(groups) == 3:  # 발신자, 시간, 메시지
-                    sender, timestamp, content = groups
-                    # 메시지 내용이 실제로 있는지 확인
-                    if content and content.strip():
-                        # 메시지 내용에도 URL이 있는지 다시 한번 확인
-                        if self.contains_url(content):
-                            return None
-                        return ChatMessage(
-                            sender=sender.strip(),
-                            content=content.strip(),
-                            timestamp=timestamp.strip()
-                        )
-                elif len(groups) == 2:  # 발신자, 메시지 (또는 연속 메시지)
-                    sender, content = groups
-                    # 발신자 이름이 너무 길면 메시지의 일부일 가능성
-                    if len(sender) < 20 and content and content.strip():
-                        # 메시지 내용에 URL이 있는지 확인
-                        if self.contains_url(content):
-                            return None
-                        return ChatMessage(
-                            sender=sender.strip(),
-                            content=content.strip()
-                        )
-
-        # 패턴에 맞지 않는 경우, 이전 메시지의 연속으로 처리
-        # (실제 구현에서는 이전 메시지와 합칠 수 있음)
-        if len(line) > 5:  # 최소 길이 확인
-            # URL이 포함된 연속 메시지도 제거
-            if self.contains_url(line):
-                return None
-            return ChatMessage(
-                sender="(연속)",
-                content=line
-            )
-
-        return None
-
-    def extract_recent_messages(self, chat_text: str, max_messages: int = 20) -> List[ChatMessage]:
-        """채팅 텍스트에서 최근 메시지들을 추출 (개선된 필터링)"""
-        lines = chat_text.split('\n')
-        messages = []
+        return ChatMessage(
+            sender=classified.sender,
+            content=classified.content,
+            timestamp=classified.time_str
+        )
+
+    def extract_recent_messages(self, chat_text: str, max_messages: int = 20, as_batch: bool = False):
+        """채팅 텍스트에서 최근 메시지들을 추출 (개선된 필터링)
+
+        as_batch가 True면 ChatMessage 리스트 대신 MessageBatch로 반환합니다.
+        """
+        # as_batch면 ChatMessage를 모아두지 않고 바로 MessageBatch에 추가
+        messages = MessageBatch() if as_batch else []
+        keep = messages.append_message if as_batch else messages.append
+        dedup = self.dedup_policy()
         filtered_count = 0  # 필터링된 메시지 수 추적
 
-        # 역순으로 처리 (최근 메시지부터)
-        for line in reversed(lines):
+        # 역순으로 처리 (최근 메시지부터, 필요한 만큼만 뒤에서부터 읽음)
+        for line in iter_lines_reversed(chat_text):
             if len(messages) >= max_messages:
                 break
 
-            # 원본 라인이 시스템 메시지인지 먼저 확인
-            if self.is_system_message(line):
+            # 한 번의 분류로 시스템 메시지 여부와 메시지 내용을 함께 확인
+            classified = self.classifier.classify(line)
+            if classified.kind in LineKind.FILTERED:
                 filtered_count += 1
                 continue
 
-            message = self.parse_message_line(line)
+            message = self._message_from_line(classified)
             if message and message.content:
                 # 중복 메시지 확인
-                if not self._is_duplicate_message(message, messages):
-                    messages.append(message)
+                if not dedup.check_and_add(message):
+                    keep(message)
 
         # 시간순으로 정렬 (오래된 것부터)
-        messages.reverse()
+        if as_batch:
+            messages = messages.take(range(len(messages) - 1, -1, -1))
+        else:
+            messages.reverse()
 
         # 필터링 통계 출력
-        print(f"📊 대화 분석 완료: 총 {len(lines)}줄 중 {filtered_count}개 시스템 메시지/URL 제거, {len(messages)}개 메시지 추출")
+        print(f"📊 대화 분석 완료: 총 {count_lines(chat_text)}줄 중 {filtered_count}개 시스템 메시지/URL 제거, {len(messages)}개 메시지 추출")
 
         return messages
 
-    def _is_duplicate_message(self, new_message: ChatMessage, existing_messages: List[ChatMessage]) -> bool:
-        """중복 메시지 확인"""
-        for existing in existing_messages:
-            if (existing.sender == new_message.sender and
-                    existing.content == new_message.content):
-                return True
-        return False
-
     def format_messages_for_gpt(self, messages: List[ChatMessage]) -> str:
-        """GPT에 전송할 형식으로 메시지들을 포맷팅"""
+        """API에 전송할 형식으로 메시지들을 포맷팅"""
         if not messages:
             return ""
 
@@ -331,10 +298,8 @@ class KakaoTalkChatParser:
         }
 
 
-# 사용 예시 및 테스트 함수
-def test_chat_parser():
-    """파서 테스트 함수 (개선된 버전)"""
-    sample_chat = """
+# 테스트용 샘플 대화 (dedup.py의 test_dedup에서도 사용)
+SAMPLE_CHAT = """
     김철수 오후 2:30 안녕하세요!
     이영희 오후 2:31 네 안녕하세요
     김철수 오후 2:32 오늘 날씨가 정말 좋네요
@@ -351,6 +316,12 @@ def test_chat_parser():
     김철수 오후 2:40 그럼 이따 뵙겠습니다
     """
 
+
+# 사용 예시 및 테스트 함수
+def test_chat_parser():
+    """파서 테스트 함수 (개선된 버전)"""
+    sample_chat = SAMPLE_CHAT
+
     parser = KakaoTalkChatParser()
     messages = parser.extract_recent_messages(sample_chat, 20)
 
@@ -363,7 +334,7 @@ def test_chat_parser():
     for key, value in summary.items():
         print(f"{key}: {value}")
 
-    print("\n=== GPT 전송용 포맷 ===")
+    print("\n=== API 전송용 포맷 ===")
     formatted = parser.format_messages_for_gpt(messages)
     print(formatted)
 
@@ -0,0 +1,428 @@
+# chat_source.py - 대화 내용 가져오기 백엔드 (UI Automation으로 직접 읽기 / 내보낸 대화 파일 / 클릭 + 복사 / 테스트용)
+
+import glob
+import os
+import re
+import statistics
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+# 내보낸 대화 파일 형식
+_EXPORT_DATE_LINE = re.compile(r'^-{3,}\s*(.+?)\s*-{3,}$')  # --------------- 2024년 1월 15일 월요일 ---------------
+_EXPORT_MESSAGE_LINE = re.compile(r'^\[(.+?)\] \[(오전|오후) (\d{1,2}:\d{2})\] ?(.*)$')  # [김철수] [오후 2:30] 안녕
+
+
+def normalize_export_text(text: str) -> str:
+    """카카오톡 "대화 내보내기" 파일 → 대화 영역을 복사했을 때와 같은 형식
+
+    머리말(대화방 이름 / 저장한 날짜)은 버리고, 날짜 구분선은 날짜만, 메시지의 대괄호는 뺍니다.
+    """
+    lines = []
+    started = False
+    for line in text.splitlines():
+        date_match = _EXPORT_DATE_LINE.match(line.strip())
+        if date_match:
+            started = True
+            lines.append(date_match.group(1))
+            continue
+        if not started:
+            continue
+        message_match = _EXPORT_MESSAGE_LINE.match(line)
+        if message_match:
+            sender, ampm, clock, message = message_match.groups()
+            lines.append(f"{sender} {ampm} {clock} {message}")
+        else:
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+class ChatSource:
+    """대화 내용 가져오기 기본 클래스
+
+    fetch는 {'content': 대화 텍스트, 'retry': 다른 위치에서 다시 시도했는지} 또는 None을 반환합니다.
+    작업 스레드에서 호출되므로 should_stop()이 True가 되면 바로 None을 반환해야 합니다.
+    """
+
+    name = ""
+    label = ""
+
+    def fetch(self, hwnd, should_stop: Optional[Callable[[], bool]] = None,
+              report: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
+        raise NotImplementedError
+
+
+class UIAutomationChatSource(ChatSource):
+    """UI Automation으로 대화방의 메시지 목록 컨트롤을 직접 읽음 (클릭 / 클립보드 사용 안 함)
+
+    uiautomation 패키지가 필요하고, 카카오톡이 메시지 목록을 접근성 트리에 노출할 때만 동작합니다.
+    항목 이름이 "보낸 사람 시간 내용" 형식이 아닐 수 있어 CHAT_SOURCES에 직접 넣어야 사용하고,
+    읽은 내용이 메시지로 파싱되지 않으면 ChatSourceChain이 다음 백엔드로 넘어갑니다.
+    """
+
+    name = "uia"
+    label = "UI Automation"
+
+    def __init__(self, search_depth: int = 6):
+        import uiautomation
+        self._uia = uiautomation
+        self.search_depth = search_depth
+
+    def fetch(self, hwnd, should_stop=None, report=None):
+        if report:
+            report("메시지 목록을 읽는 중...")
+        # COM은 스레드마다 초기화해야 함 (작업 스레드에서 호출)
+        with self._uia.UIAutomationInitializerInThread():
+            window = self._uia.ControlFromHandle(hwnd)
+            if not window:
+                return None
+            message_list = window.ListControl(searchDepth=self.search_depth)
+            if not message_list.Exists(0, 0):
+                return None
+
+            lines = []
+            for item in message_list.GetChildren():
+                if should_stop and should_stop():
+                    return None
+                if item.Name:
+                    lines.append(item.Name)
+        if not lines:
+            return None
+        return {'content': '\n'.join(lines), 'retry': False}
+
+
+class ExportFileChatSource(ChatSource):
+    """카카오톡 "대화 내보내기"로 저장한 텍스트 파일을 읽음
+
+    폴더에서 대화방 이름(창 제목)이 파일 이름이나 첫 줄에 들어 있는 가장 최근 파일을 사용합니다.
+    파일은 수정 시각 / 크기가 바뀌었을 때만 다시 읽습니다.
+    """
+
+    name = "export"
+    label = "내보낸 대화 파일"
+
+    def __init__(self, directory: str, title_of: Optional[Callable[[int], str]] = None, pattern: str = "*.txt"):
+        if not directory or not os.path.isdir(directory):
+            raise OSError(f"대화 내보내기 폴더가 없습니다: {directory!r}")
+        self.directory = directory
+        self.title_of = title_of
+        self.pattern = pattern
+        self._cache: Dict[str, tuple] = {}  # 경로 → (수정 시각, 크기, 정리한 텍스트)
+        self.reads = 0
+
+    @staticmethod
+    def _first_line(path: str) -> str:
+        try:
+            with open(path, encoding='utf-8-sig', errors='replace') as f:
+                return f.readline().strip()
+        except OSError:
+            return ""
+
+    def find_file(self, title: str = "") -> Optional[str]:
+        """대화방 이름과 맞는 가장 최근 파일 (이름이 없으면 다른 대화방 파일을 쓰지 않도록 None)"""
+        if not title:
+            return None
+        paths = glob.glob(os.path.join(self.directory, self.pattern))
+        paths.sort(key=lambda path: os.stat(path).st_mtime_ns, reverse=True)
+        for path in paths:
+            if title in os.path.basename(path) or self._first_line(path).startswith(title):
+                return path
+        return None
+
+    def read(self, path: str) -> str:
+        stat = os.stat(path)
+        cached = self._cache.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        with open(path, encoding='utf-8-sig', errors='replace') as f:
+            text = normalize_export_text(f.read())
+        self.reads += 1
+        self._cache[path] = (stat.st_mtime_ns, stat.st_size, text)
+        return text
+
+    def fetch(self, hwnd, should_stop=None, report=None):
+        title = self.title_of(hwnd) if self.title_of else ""
+        path = self.find_file(title)
+        if not path:
+            return None
+        if report:
+            report(f"내보낸 대화 파일 읽는 중... ({os.path.basename(path)})")
+        content = self.read(path)
+        return {'content': content, 'retry': False} if content else None
+
+
+class ArchiveChatSource(ChatSource):
+    """대화 저장소(chat_archive.py로 내보낸 파일을 미리 넣어둔 SQLite)에서 대화방의 마지막 메시지들을 읽음
+
+    파일 전체를 읽고 정리하지 않고 색인으로 마지막 max_messages개만 꺼내므로 큰 내보내기 파일도 바로 가져옵니다.
+    """
+
+    name = "archive"
+    label = "대화 저장소"
+
+    def __init__(self, path: str, title_of: Optional[Callable[[int], str]] = None, max_messages: int = 300):
+        if not path or not os.path.isfile(path):
+            raise OSError(f"대화 저장소 파일이 없습니다: {path!r}")
+        from .chat_archive import ChatArchive
+        self._archive_class = ChatArchive
+        self.path = path
+        self.title_of = title_of
+        self.max_messages = max_messages
+
+    def fetch(self, hwnd, should_stop=None, report=None):
+        title = self.title_of(hwnd) if self.title_of else ""
+        # SQLite 연결은 만든 스레드에서만 쓸 수 있으므로 작업 스레드에서 가져올 때마다 엶
+        archive = self._archive_class(self.path)
+        try:
+            chat = archive.find_chat(title)
+            if not chat:
+                return None
+            if report:
+                report(f"대화 저장소에서 읽는 중... ({chat})")
+            content = archive.recent_text(chat, self.max_messages)
+        finally:
+            archive.close()
+        return {'content': content, 'retry': False} if content else None
+
+
+class ClipboardChatSource(ChatSource):
+    """대화 영역 클릭 → Ctrl+A → Ctrl+C로 복사 (실패하면 다른 위치에서 재시도, 클립보드 내용이 바뀜)"""
+
+    name = "clipboard"
+    label = "클릭 + 복사"
+
+    def __init__(self, retry_positions, min_length: int = 0):
+        from .window_handler import SafeWindowHandler
+        self.handler = SafeWindowHandler
+        self.retry_positions = list(retry_positions)
+        self.min_length = min_length
+
+    def _copy(self, hwnd, should_stop):
+        content = self.handler.copy_selection(hwnd, should_stop)
+        if content and len(content.strip()) > self.min_length:
+            return content
+        return None
+
+    def fetch(self, hwnd, should_stop=None, report=None):
+        report = report or (lambda message: None)
+        report("대화 영역을 찾는 중...")
+
+        # 1단계: 대화 영역 자동 클릭
+        if self.handler.find_chat_area_and_click(hwnd, should_stop):
+            report("대화 영역 발견! 내용 복사 중...")
+        else:
+            report("기본 위치 클릭 시도 중...")
+            self.handler.click_window_area(hwnd, 0.5, 0.4, should_stop)
+
+        # 2단계: 전체 선택 및 복사
+        content = self._copy(hwnd, should_stop)
+        if content:
+            return {'content': content, 'retry': False}
+
+        report("다른 위치에서 재시도 중...")
+        for x, y in self.retry_positions:
+            if should_stop and should_stop():
+                return None
+            if not self.handler.click_window_area(hwnd, x, y, should_stop):
+                continue
+            content = self._copy(hwnd, should_stop)
+            if content:
+                return {'content': content, 'retry': True}
+        return None
+
+
+class FakeChatSource(ChatSource):
+    """테스트용 대화 백엔드 (창 핸들별 고정 텍스트, latency만큼 걸린 것처럼 sleep)"""
+
+    def __init__(self, transcripts: Dict[int, str], name: str = "fake", latency: float = 0.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.transcripts = transcripts
+        self.name = name
+        self.label = name
+        self.latency = latency
+        self.sleep = sleep
+        self.calls = 0
+
+    def fetch(self, hwnd, should_stop=None, report=None):
+        self.calls += 1
+        if self.latency:
+            self.sleep(self.latency)
+        content = self.transcripts.get(hwnd)
+        return {'content': content, 'retry': False} if content else None
+
+
+class ChatSourceChain:
+    """백엔드를 순서대로 시도해서 처음 성공한 결과 사용, 백엔드별 가져오기 시간 기록
+
+    parse를 주면 가져온 내용이 메시지 하나 이상으로 파싱될 때만 성공으로 보고
+    (결과의 'messages'에 파싱 결과 저장), 아니면 다음 백엔드로 넘어갑니다.
+    """
+
+    def __init__(self, sources: List[ChatSource], min_length: int = 0,
+                 clock: Callable[[], float] = time.perf_counter, history: int = 50,
+                 parse: Optional[Callable[[str], list]] = None):
+        self.sources = sources
+        self.min_length = min_length
+        self.clock = clock
+        self.parse = parse
+        self.latencies: Dict[str, deque] = {source.name: deque(maxlen=history) for source in sources}
+        self.successes: Dict[str, int] = {source.name: 0 for source in sources}
+        self.failures: Dict[str, int] = {source.name: 0 for source in sources}
+
+    def _parse(self, source: ChatSource, content: str) -> Optional[list]:
+        """가져온 내용 파싱 (메시지가 없거나 파싱에 실패하면 None)"""
+        try:
+            messages = self.parse(content)
+        except Exception as e:
+            print(f"{source.label} 대화 파싱 실패: {e}")
+            return None
+        if not messages:
+            print(f"{source.label}: 가져온 내용에서 메시지를 찾지 못해 다음 방식 시도")
+            return None
+        return messages
+
+    def fetch(self, hwnd, should_stop=None, report=None) -> Optional[Dict]:
+        """{'content', 'retry', 'source'(백엔드 이름), 'elapsed'(초), 'messages'(parse를 준 경우)} 또는 None"""
+        for source in self.sources:
+            if should_stop and should_stop():
+                return None
+
+            start = self.clock()
+            try:
+                result = source.fetch(hwnd, should_stop, report)
+            except Exception as e:
+                print(f"{source.label} 가져오기 실패: {e}")
+                result = None
+            elapsed = self.clock() - start
+            self.latencies[source.name].append(elapsed)
+
+            if result and len(result['content'].strip()) <= self.min_length:
+                result = None
+            if result and self.parse:
+                result['messages'] = self._parse(source, result['content'])
+                if not result['messages']:
+                    result = None
+
+            if result:
+                self.successes[source.name] += 1
+                result['source'] = source.name
+                result['elapsed'] = elapsed
+                return result
+            self.failures[source.name] += 1
+        return None
+
+    def stats_text(self) -> str:
+        """백엔드별 성공 / 실패 횟수와 가져오기 시간 중앙값"""
+        lines = []
+        for source in self.sources:
+            samples = self.latencies[source.name]
+            median = f"{statistics.median(samples) * 1000:.0f}ms" if samples else "-"
+            lines.append(f"{source.label}: 성공 {self.successes[source.name]} / 실패 {self.failures[source.name]}, "
+                         f"중앙값 {median}")
+        return "\n".join(lines)
+
+
+def create_chat_sources(names: List[str], export_dir: str = "", retry_positions=(), min_length: int = 0,
+                        title_of: Optional[Callable[[int], str]] = None, archive_file: str = "",
+                        archive_messages: int = 300, parse: Optional[Callable[[str], list]] = None) -> ChatSourceChain:
+    """설정한 순서대로 대화 백엔드 생성 (패키지가 없거나 설정이 비어 있는 백엔드는 건너뜀)
+
+    parse를 주면 메시지로 파싱되는 결과만 받아들입니다. (ChatSourceChain 참고)
+    """
+    sources = []
+    for name in names:
+        try:
+            if name == "uia":
+                sources.append(UIAutomationChatSource())
+            elif name == "archive":
+                sources.append(ArchiveChatSource(archive_file, title_of, archive_messages))
+            elif name == "export":
+                sources.append(ExportFileChatSource(export_dir, title_of))
+            elif name == "clipboard":
+                sources.append(ClipboardChatSource(retry_positions, min_length))
+            else:
+                raise ValueError(f"알 수 없는 대화 백엔드: {name}")
+        except (ImportError, OSError) as e:
+            print(f"대화 백엔드 {name} 사용 안 함: {e}")
+    return ChatSourceChain(sources, min_length, parse=parse)
+
+
+# 사용 예시 및 테스트 함수
+def test_chat_sources():
+    """가짜 백엔드 순서 / 내보낸 파일 정리 / 파일 캐시 테스트"""
+    import tempfile
+
+    transcript = "김철수 오후 2:30 저녁 뭐 먹지\n이영희 오후 2:31 치킨"
+    empty = FakeChatSource({}, name="uia")
+    fake = FakeChatSource({1: transcript}, name="fake")
+    chain = ChatSourceChain([empty, fake], min_length=10)
+    result = chain.fetch(1)
+    assert result['source'] == "fake" and result['content'] == transcript
+    assert chain.fetch(2) is None
+    assert chain.failures == {"uia": 2, "fake": 1}
+
+    # 메시지로 파싱되지 않는 내용(예: 형식이 다른 UI Automation 항목)은 건너뛰고 다음 백엔드 사용
+    from .chat_parser import KakaoTalkChatParser
+    parser = KakaoTalkChatParser()
+    unparsable = FakeChatSource({1: "사진\n이모티콘\n읽음\n공감하기"}, name="uia")
+    chain = ChatSourceChain([unparsable, fake], min_length=10,
+                            parse=lambda content: parser.extract_recent_messages(content, 20))
+    result = chain.fetch(1)
+    assert result['source'] == "fake" and len(result['messages']) == 2
+    assert chain.failures == {"uia": 1, "fake": 0}
+
+    exported = ("친구들 님과 카카오톡 대화\n저장한 날짜 : 2024-01-15 15:00:00\n\n"
+                "--------------- 2024년 1월 15일 월요일 ---------------\n"
+                "[김철수] [오후 2:30] 저녁 뭐 먹지\n[이영희] [오후 2:31] 치킨\n여러 줄 메시지\n")
+    assert normalize_export_text(exported) == ("2024년 1월 15일 월요일\n김철수 오후 2:30 저녁 뭐 먹지\n"
+                                               "이영희 오후 2:31 치킨\n여러 줄 메시지")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "KakaoTalk_20240115_1500_00_000_친구들.txt"), 'w', encoding='utf-8') as f:
+            f.write(exported)
+        with open(os.path.join(directory, "KakaoTalk_20240115_1400_00_000_회사.txt"), 'w', encoding='utf-8') as f:
+            f.write("회사 님과 카카오톡 대화\n")
+
+        source = ExportFileChatSource(directory, title_of={1: "친구들", 2: "동아리"}.get)
+        assert source.fetch(1)['content'].startswith("2024년 1월 15일")
+        source.fetch(1)
+        assert source.reads == 1  # 바뀌지 않은 파일은 다시 읽지 않음
+        assert source.fetch(2) is None  # 다른 대화방 파일은 사용하지 않음
+        assert source.find_file("") is None  # 창 제목을 못 읽으면 가장 최근 파일을 쓰지 않음
+    print(f"대화 백엔드 테스트 통과\n{chain.stats_text()}")
+
+
+def benchmark_chat_sources(runs: int = 10):
+    """가상 시계로 백엔드별 가져오기 시간 비교 (UI Automation / 파일은 가짜, 클릭 + 복사는 가상 자동화 백엔드)"""
+    from .automation import SimulatedAutomation, SimulatedWindow
+    from config import DELAYS
+    from .wait_engine import SimulatedClock, WaitEngine
+    from .window_handler import SafeWindowHandler
+
+    transcript = "김철수 오후 2:30 저녁 뭐 먹지\n이영희 오후 2:31 치킨"
+    for adaptive in (False, True):
+        clock = SimulatedClock()
+        backend = SimulatedAutomation(clock)
+        backend.add_window(SimulatedWindow(1, "친구들", (0, 0, 400, 600), transcript))
+        backend.add_window(SimulatedWindow(2, "메모장", (500, 0, 900, 600), process_name="notepad.exe"))
+        waits = WaitEngine(DELAYS, adaptive, fixed_limits=SafeWindowHandler.FIXED_WAIT_LIMITS,
+                           clock=clock.now, sleep=clock.sleep)
+        SafeWindowHandler.set_automation(backend, waits)
+
+        sources = [FakeChatSource({1: transcript}, "uia", 0.015, clock.sleep),
+                   FakeChatSource({1: transcript}, "export", 0.002, clock.sleep),
+                   ClipboardChatSource([])]
+        print(f"--- {'상태 확인 대기' if adaptive else '고정 sleep'} ---")
+        for source in sources:
+            chain = ChatSourceChain([source], clock=clock.now)
+            for _ in range(runs):
+                backend.foreground = 2
+                assert chain.fetch(1)['content'] == transcript
+            print(chain.stats_text())
+    SafeWindowHandler.set_automation(None)
+
+
+if __name__ == "__main__":
+    test_chat_sources()
+    benchmark_chat_sources()
@@ -0,0 +1,139 @@
+# clipboard_watcher.py - 클립보드 변경 감지 (전체 텍스트 비교 대신 변경 번호 / 지문 사용)
+
+import hashlib
+from typing import Optional, Tuple
+
+
+class ClipboardBackend:
+    """클립보드 접근 기본 클래스"""
+
+    def get_text(self) -> str:
+        raise NotImplementedError
+
+    def get_sequence_number(self) -> Optional[int]:
+        """클립보드가 바뀔 때마다 증가하는 번호 (지원하지 않으면 None)"""
+        return None
+
+
+class PyperclipBackend(ClipboardBackend):
+    """pyperclip 기반 클립보드 (변경 번호 없음, 모든 플랫폼)"""
+
+    def __init__(self):
+        import pyperclip
+        self._pyperclip = pyperclip
+
+    def get_text(self) -> str:
+        return self._pyperclip.paste()
+
+
+class Win32ClipboardBackend(PyperclipBackend):
+    """Windows 클립보드 (GetClipboardSequenceNumber로 변경 여부를 텍스트 없이 확인)"""
+
+    def __init__(self):
+        super().__init__()
+        import win32clipboard
+        self._win32clipboard = win32clipboard
+
+    def get_sequence_number(self) -> Optional[int]:
+        return self._win32clipboard.GetClipboardSequenceNumber()
+
+
+class FakeClipboardBackend(ClipboardBackend):
+    """테스트용 메모리 클립보드 (use_sequence=False면 변경 번호 없는 플랫폼 흉내)"""
+
+    def __init__(self, text: str = "", use_sequence: bool = True):
+        self.text = text
+        self.sequence = 0
+        self.use_sequence = use_sequence
+        self.read_count = 0  # get_text 호출 횟수
+
+    def set_text(self, text: str):
+        self.text = text
+        self.sequence += 1
+
+    def get_text(self) -> str:
+        self.read_count += 1
+        return self.text
+
+    def get_sequence_number(self) -> Optional[int]:
+        return self.sequence if self.use_sequence else None
+
+
+def create_default_backend() -> ClipboardBackend:
+    """사용 가능한 가장 좋은 백엔드 생성 (Windows면 변경 번호 사용)"""
+    try:
+        return Win32ClipboardBackend()
+    except ImportError:
+        return PyperclipBackend()
+
+
+def text_fingerprint(text: str, sample_size: int = 4096) -> Tuple[int, bytes]:
+    """텍스트 지문: (길이, 앞/뒤 sample_size 글자의 해시)
+
+    전체를 비교하지 않으므로 길이가 같은 채로 가운데만 바뀐 경우는 같은 텍스트로 봅니다.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(text[:sample_size].encode('utf-8', 'surrogatepass'))
+    hasher.update(text[-sample_size:].encode('utf-8', 'surrogatepass'))
+    return len(text), hasher.digest()
+
+
+class ClipboardWatcher:
+    """클립보드 변경 감지기
+
+    백엔드가 변경 번호를 제공하면 번호가 바뀌었을 때만 텍스트를 가져오고,
+    가져온 텍스트는 지문만 보관합니다 (이전 텍스트 전체를 들고 있지 않음).
+    """
+
+    def __init__(self, backend: Optional[ClipboardBackend] = None, sample_size: int = 4096):
+        self.backend = backend or create_default_backend()
+        self.sample_size = sample_size
+        self.last_sequence: Optional[int] = None
+        self.last_fingerprint: Optional[Tuple[int, bytes]] = None
+
+    def reset(self):
+        """기록 초기화 (다음 poll에서 현재 내용을 새 내용으로 취급)"""
+        self.last_sequence = None
+        self.last_fingerprint = None
+
+    def poll(self) -> Optional[str]:
+        """클립보드가 바뀌었으면 새 텍스트, 아니면 None 반환"""
+        sequence = self.backend.get_sequence_number()
+        if sequence is not None and sequence == self.last_sequence:
+            return None
+        self.last_sequence = sequence
+
+        text = self.backend.get_text()
+        if not text:
+            return None
+
+        fingerprint = text_fingerprint(text, self.sample_size)
+        if fingerprint == self.last_fingerprint:
+            return None
+        self.last_fingerprint = fingerprint
+
+        return text
+
+
+# 사용 예시 및 테스트 함수
+def test_clipboard_watcher():
+    """가짜 백엔드로 변경 감지 테스트"""
+    for use_sequence in (True, False):
+        backend = FakeClipboardBackend(use_sequence=use_sequence)
+        watcher = ClipboardWatcher(backend)
+
+        backend.set_text("김철수 오후 2:30 안녕하세요")
+        assert watcher.poll() == "김철수 오후 2:30 안녕하세요"
+        assert watcher.poll() is None
+
+        backend.set_text("김철수 오후 2:30 안녕하세요")  # 같은 내용을 다시 복사
+        assert watcher.poll() is None
+
+        backend.set_text("김철수 오후 2:30 안녕하세요\n이영희 오후 2:31 네")
+        assert watcher.poll() == "김철수 오후 2:30 안녕하세요\n이영희 오후 2:31 네"
+
+        print(f"변경 번호 {'사용' if use_sequence else '없음'}: 텍스트 읽기 {backend.read_count}회")
+
+
+if __name__ == "__main__":
+    test_clipboard_watcher()
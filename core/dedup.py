@@ -0,0 +1,177 @@
+# dedup.py - 해시 기반 중복 메시지 판별 정책
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+# 분 단위 버킷 계산 기준 (naive datetime끼리의 차이와 같은 값이 나오도록 timestamp() 대신 사용)
+_EPOCH = datetime(1970, 1, 1)
+
+
+class DedupPolicy:
+    """중복 메시지 판별 정책 기본 클래스 (추출 한 번마다 새로 생성해서 사용)"""
+
+    def is_duplicate(self, message) -> bool:
+        raise NotImplementedError
+
+    def add(self, message):
+        raise NotImplementedError
+
+    def check_and_add(self, message) -> bool:
+        """중복이면 True, 아니면 기록 후 False 반환"""
+        if self.is_duplicate(message):
+            return True
+        self.add(message)
+        return False
+
+
+class NoDedup(DedupPolicy):
+    """중복 확인 안 함 (병렬 파싱에서 구간별 후보를 모을 때, 중복 확인은 합칠 때 순서대로 함)"""
+
+    def is_duplicate(self, message) -> bool:
+        return False
+
+    def add(self, message):
+        pass
+
+
+class SenderContentDedup(DedupPolicy):
+    """발신자와 내용이 같으면 중복 (개수 기반 파서)"""
+
+    def __init__(self):
+        self._seen = set()
+
+    def is_duplicate(self, message) -> bool:
+        return (message.sender, message.content) in self._seen
+
+    def add(self, message):
+        self._seen.add((message.sender, message.content))
+
+
+class TimeWindowDedup(DedupPolicy):
+    """발신자와 내용이 같고 시간 차이가 window_seconds 미만이면 중복 (날짜 기반 파서)
+
+    (발신자, 내용, 분 버킷)으로 색인하고 앞뒤 버킷까지만 비교하므로
+    이미 저장된 메시지 수와 관계없이 일정한 시간에 판별합니다.
+    시간 정보가 없는 메시지는 중복으로 보지 않습니다.
+    """
+
+    def __init__(self, window_seconds: int = 60):
+        self.window = timedelta(seconds=window_seconds)
+        self._buckets: Dict[Tuple[str, str, int], List[datetime]] = {}
+
+    def _bucket(self, time: datetime) -> int:
+        return (time - _EPOCH) // self.window
+
+    def is_duplicate(self, message) -> bool:
+        if not message.raw_time:
+            return False
+
+        bucket = self._bucket(message.raw_time)
+        for neighbour in (bucket - 1, bucket, bucket + 1):
+            for existing_time in self._buckets.get((message.sender, message.content, neighbour), ()):
+                if abs(existing_time - message.raw_time) < self.window:
+                    return True
+        return False
+
+    def add(self, message):
+        if not message.raw_time:
+            return
+
+        key = (message.sender, message.content, self._bucket(message.raw_time))
+        self._buckets.setdefault(key, []).append(message.raw_time)
+
+
+class LayeredDedup(DedupPolicy):
+    """기존 판별 기록(base)은 읽기만 하고 새 기록은 따로 쌓는 정책
+
+    base를 복사하지 않고 그 위에서 몇 줄을 더 파싱해볼 때 사용합니다.
+    """
+
+    def __init__(self, base: DedupPolicy, layer: DedupPolicy):
+        self.base = base
+        self.layer = layer
+
+    def is_duplicate(self, message) -> bool:
+        return self.base.is_duplicate(message) or self.layer.is_duplicate(message)
+
+    def add(self, message):
+        self.layer.add(message)
+
+
+class _LinearDedup(DedupPolicy):
+    """예전 _is_duplicate_message처럼 저장된 메시지를 모두 비교 (test_dedup에서 결과 비교용)"""
+
+    def __init__(self, same):
+        self.same = same
+        self._messages = []
+
+    def is_duplicate(self, message) -> bool:
+        return any(self.same(existing, message) for existing in self._messages)
+
+    def add(self, message):
+        self._messages.append(message)
+
+
+def _legacy_count_duplicate(existing, new_message) -> bool:
+    """예전 개수 기반 파서의 중복 조건"""
+    return existing.sender == new_message.sender and existing.content == new_message.content
+
+
+def _legacy_date_duplicate(existing, new_message) -> bool:
+    """예전 날짜 기반 파서의 중복 조건 (1분 이내 같은 내용)"""
+    return (existing.sender == new_message.sender and
+            existing.content == new_message.content and
+            existing.raw_time and new_message.raw_time and
+            abs((existing.raw_time - new_message.raw_time).total_seconds()) < 60)
+
+
+# 사용 예시 및 테스트 함수
+def test_dedup():
+    """해시 기반 정책과 예전 선형 비교가 같은 결과를 내는지 확인 (두 파서의 샘플 대화 + 분 버킷 경계)"""
+    import contextlib
+    import io
+
+    from .chat_date_parser import ChatMessage, KakaoTalkDateParser, SAMPLE_DATE_CHAT
+    from .chat_parser import KakaoTalkChatParser, SAMPLE_CHAT
+
+    def rows(messages):
+        return [(m.sender, m.content, m.timestamp) for m in messages]
+
+    now = datetime(2024, 6, 2, 9, 0)
+    # 샘플 그대로 / 두 번 이어 붙여 중복이 생기게 한 대화
+    for sample in (SAMPLE_CHAT, SAMPLE_CHAT + SAMPLE_CHAT):
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = KakaoTalkChatParser(lambda: _LinearDedup(_legacy_count_duplicate)).extract_recent_messages(sample)
+            hashed = KakaoTalkChatParser().extract_recent_messages(sample)
+        assert legacy and rows(hashed) == rows(legacy)
+
+    for sample in (SAMPLE_DATE_CHAT, SAMPLE_DATE_CHAT + SAMPLE_DATE_CHAT):
+        results = []
+        for policy in (lambda: _LinearDedup(_legacy_date_duplicate), TimeWindowDedup):
+            parser = KakaoTalkDateParser(limit_hours=48, dedup_policy=policy)
+            parser.now = parser.classifier.now = now
+            parser.today = parser.classifier.today = now.date()
+            with contextlib.redirect_stdout(io.StringIO()):
+                results.append([(m.sender, m.content, m.raw_time)
+                                for m in parser.extract_last_day_messages(sample, seek_tail=False)])
+        assert results[0] and results[0] == results[1]
+
+    # 분 버킷 경계: 12:00:59와 12:01:30은 다른 버킷이지만 31초 차이라 중복, 정확히 60초 차이는 중복 아님
+    base = datetime(2024, 6, 1, 12, 0, 59)
+    cases = [
+        (base, base + timedelta(seconds=31), True),
+        (base + timedelta(seconds=31), base, True),
+        (base, base + timedelta(seconds=60), False),
+        (datetime(2024, 6, 1, 12, 0, 0), datetime(2024, 6, 1, 12, 1, 59), False),
+        (base, None, False),
+    ]
+    for first, second, duplicate in cases:
+        for policy in (_LinearDedup(_legacy_date_duplicate), TimeWindowDedup()):
+            policy.check_and_add(ChatMessage("김철수", "ㅇㅇ", "오후 12:00", first))
+            assert bool(policy.is_duplicate(ChatMessage("김철수", "ㅇㅇ", "오후 12:01", second))) == duplicate, \
+                (type(policy).__name__, first, second)
+    print("중복 판별 테스트 통과 (예전 선형 비교와 같은 결과)")
+
+
+if __name__ == "__main__":
+    test_dedup()
@@ -0,0 +1,101 @@
+# fake_llm_server.py - 벤치마크용 가짜 LLM 서버 (지정한 지연 후 고정 답변 반환)
+
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+
+class FakeLLMServer:
+    """로컬 HTTP 서버로 LLM API 응답을 흉내
+
+    POST /v1/messages (Anthropic 형식)와 /v1/chat/completions (OpenAI 형식)에
+    latency초 뒤 고정 답변을 돌려줍니다. 요청 본문의 "tone" 값으로 톤별 지연(slow_tones)과
+    톤별 답변(tone_replies)을 줄 수 있고, 받은 요청 본문 크기를 received_bytes에 누적합니다.
+    """
+
+    def __init__(self, latency: float = 0.5, reply: str = "ㅇㅇ 좋지 ㅋㅋ"):
+        self.latency = latency
+        self.reply = reply
+        self.slow_tones: Dict[str, float] = {}
+        self.tone_replies: Dict[str, str] = {}
+        self.request_count = 0
+        self.received_bytes = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive 지원 (연결 재사용 테스트용)
+            disable_nagle_algorithm = True  # 헤더와 본문을 따로 보내도 지연 없게
+
+            def do_HEAD(self):
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                body = json.loads(raw or b'{}')
+                with server._lock:
+                    server.request_count += 1
+                    server.received_bytes += len(raw)
+                time.sleep(server.slow_tones.get(body.get('tone'), server.latency))
+                reply = server.tone_replies.get(body.get('tone'), server.reply)
+
+                if self.path.endswith('/chat/completions'):
+                    payload = {"choices": [{"index": 0, "message": {"role": "assistant", "content": reply}}]}
+                else:
+                    payload = {"content": [{"type": "text", "text": reply}]}
+
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def request(self, tone: str, path: str = '/v1/messages', prompt: str = "") -> str:
+        """서버에 요청 한 번 보내고 답변 텍스트 반환 (SDK 없이 urllib 사용)"""
+        data = json.dumps({"tone": tone, "prompt": prompt}, ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(self.base_url + path, data=data, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=60) as response:
+            payload = json.loads(response.read())
+
+        if 'choices' in payload:
+            return payload['choices'][0]['message']['content']
+        return payload['content'][0]['text']
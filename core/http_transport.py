@@ -0,0 +1,175 @@
+# http_transport.py - API 클라이언트가 함께 쓰는 HTTP 연결 풀 (keep-alive / HTTP/2 / 미리 연결 / 재사용 통계)
+
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import httpx  # httpx는 import 비용이 커서 실제 client를 만들 때 불러옴
+
+
+def http2_available() -> bool:
+    """HTTP/2 사용 가능 여부 (h2 패키지가 설치되어 있어야 함)"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ConnectionStats:
+    """요청 수 / 새로 연결한 수 (TCP, TLS) / 재사용한 수 집계
+
+    httpx의 trace 확장으로 연결이 새로 만들어질 때만 오는 이벤트를 세므로,
+    요청 수에서 새 연결 수를 빼면 keep-alive로 재사용한 요청 수가 됩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.connect_seconds = 0.0
+        self.http_versions = {}
+
+    def trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.new_connections += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def record_response(self, response: "httpx.Response", connect_seconds: float):
+        with self._lock:
+            self.requests += 1
+            self.connect_seconds += connect_seconds
+            self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    def summary(self) -> str:
+        with self._lock:
+            versions = ", ".join(f"{version} {count}" for version, count in sorted(self.http_versions.items()))
+            return (f"HTTP 요청 {self.requests} / 새 연결 {self.new_connections} (TLS {self.tls_handshakes}) / "
+                    f"재사용 {self.reused} / 연결 시간 {self.connect_seconds * 1000:.0f}ms"
+                    + (f" / {versions}" if versions else ""))
+
+
+class PooledTransport:
+    """keep-alive 연결 풀을 가진 httpx.Client 하나를 여러 API 클라이언트가 함께 사용
+
+    Anthropic / OpenAI SDK 모두 http_client 인자로 이 client를 받습니다.
+    client는 처음 접근할 때 만들어지므로 프로그램 시작 시에는 httpx를 import하지 않습니다.
+    """
+
+    def __init__(self, pool_size: int = 10, keepalive_seconds: float = 60, connect_timeout: float = 5,
+                 read_timeout: float = 30, use_http2: bool = True):
+        self.stats = ConnectionStats()
+        self.pool_size = pool_size
+        self.keepalive_seconds = keepalive_seconds
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.use_http2 = use_http2
+        self.http2 = False
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._warmed = {}  # URL → 마지막 미리 연결 시각
+        self._warm_lock = threading.Lock()
+
+    @property
+    def client(self) -> "httpx.Client":
+        with self._client_lock:
+            if self._client is None:
+                import httpx
+                self.http2 = self.use_http2 and http2_available()
+                self._client = httpx.Client(
+                    http2=self.http2,
+                    limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size,
+                                        keepalive_expiry=self.keepalive_seconds),
+                    timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                    event_hooks={'request': [self._on_request], 'response': [self._on_response]},
+                )
+            return self._client
+
+    def _on_request(self, request: "httpx.Request"):
+        started = {}
+
+        def trace(event_name, info):
+            if event_name == "connection.connect_tcp.started":
+                started['at'] = time.perf_counter()
+            elif event_name == "connection.start_tls.complete" and 'at' in started:
+                started['seconds'] = time.perf_counter() - started['at']
+            elif event_name == "connection.connect_tcp.complete" and 'at' in started:
+                started['seconds'] = time.perf_counter() - started['at']
+            self.stats.trace(event_name, info)
+
+        request.extensions['trace'] = trace
+        request.extensions['connect_timing'] = started
+
+    def _on_response(self, response: "httpx.Response"):
+        timing = response.request.extensions.get('connect_timing', {})
+        self.stats.record_response(response, timing.get('seconds', 0.0))
+
+    def warm_up(self, url: str, force: bool = False) -> Optional[threading.Thread]:
+        """백그라운드에서 url로 가벼운 요청을 보내 연결(TCP + TLS)을 미리 만들어 둠
+
+        keep-alive 시간 안에 이미 미리 연결했으면 건너뜁니다. 응답 코드(404 등)는 상관없습니다.
+        """
+        with self._warm_lock:
+            last = self._warmed.get(url)
+            if not force and last and time.monotonic() - last < self.keepalive_seconds / 2:
+                return None
+            self._warmed[url] = time.monotonic()
+
+        def run():
+            import httpx
+            try:
+                self.client.head(url)
+            except httpx.HTTPError as e:
+                print(f"연결 미리 만들기 실패 ({url}): {e}")
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+# 사용 예시 및 테스트 함수
+def test_pooled_transport(request_count: int = 5):
+    """가짜 LLM 서버에 연결 풀 / 매번 새 연결로 요청을 보내 재사용 여부와 소요 시간 비교"""
+    from .fake_llm_server import FakeLLMServer
+
+    with FakeLLMServer(latency=0.0) as server:
+        url = server.base_url + '/v1/messages'
+
+        pooled = PooledTransport(pool_size=2)
+        assert pooled._client is None  # 처음 쓸 때까지 httpx.Client를 만들지 않음
+        pooled.warm_up(server.base_url).join()
+        start = time.perf_counter()
+        for _ in range(request_count):
+            pooled.client.post(url, json={"tone": "긍정적"}).raise_for_status()
+        pooled_time = time.perf_counter() - start
+        print(f"연결 풀: {pooled_time * 1000:.1f}ms - {pooled.stats.summary()}")
+        assert pooled.stats.new_connections == 1  # 미리 만든 연결을 계속 재사용
+        pooled.close()
+
+        fresh = PooledTransport(pool_size=2, keepalive_seconds=0)
+        start = time.perf_counter()
+        for _ in range(request_count):
+            fresh.client.post(url, json={"tone": "긍정적"}, headers={'Connection': 'close'}).raise_for_status()
+        fresh_time = time.perf_counter() - start
+        print(f"매번 새 연결: {fresh_time * 1000:.1f}ms - {fresh.stats.summary()}")
+        assert fresh.stats.new_connections == request_count
+        fresh.close()
+
+
+if __name__ == "__main__":
+    test_pooled_transport()
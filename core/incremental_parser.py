@@ -0,0 +1,260 @@
+# incremental_parser.py - 클립보드 대화가 뒤로만 늘어났을 때 새로 붙은 부분만 파싱하는 캐시
+
+import hashlib
+from typing import Iterator, List, Optional, Tuple
+
+
+def _prefix_hash(text: str):
+    """접두사 비교용 해시 객체 (이후 update로 이어서 계산 가능)"""
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16)
+
+
+class _PrefixCache:
+    """마지막으로 파싱한 텍스트의 '완성된 줄' 부분(마지막 줄바꿈까지)의 길이와 다이제스트
+
+    원문을 보관하지 않고, 새 텍스트가 같은 접두사로 시작하는지만 확인합니다.
+    마지막 줄은 다음 복사에서 뒤에 글자가 더 붙을 수 있으므로 캐시하지 않습니다.
+    """
+
+    def __init__(self):
+        self.end = 0  # 캐시된 접두사 길이 (0이면 캐시 없음)
+        self.digest: Optional[bytes] = None
+
+    def reset(self):
+        self.end = 0
+        self.digest = None
+
+    def extend(self, chat_text: str) -> Tuple[int, int]:
+        """chat_text가 캐시된 접두사로 시작하면 (이전 접두사 길이, 새 접두사 길이) 반환
+
+        접두사가 다르면 캐시를 비우고 (0, 새 접두사 길이)를 반환합니다.
+        """
+        new_end = chat_text.rfind('\n') + 1
+
+        hasher = None
+        if self.digest is not None and len(chat_text) >= self.end:
+            hasher = _prefix_hash(chat_text[:self.end])
+            if hasher.digest() != self.digest:
+                hasher = None
+
+        if hasher is None:
+            self.reset()
+            hasher = _prefix_hash('')
+
+        old_end = self.end
+        hasher.update(chat_text[old_end:new_end].encode('utf-8', 'surrogatepass'))
+        self.end = new_end
+        self.digest = hasher.digest()
+        return old_end, new_end
+
+
+class IncrementalCountParser:
+    """개수 기반 파서(KakaoTalkChatParser)의 증분 파싱 래퍼
+
+    뒤에서부터 읽은 메시지 후보(시스템 메시지/URL 제외, 중복 확인 전)를 줄 시작 위치와 함께 보관하고,
+    새 텍스트가 같은 접두사로 시작하면 새로 붙은 줄만 파싱해서 보관된 후보 앞에 이어 붙입니다.
+    중복 확인과 개수 제한은 매번 후보 목록에 다시 적용하므로 결과는 extract_recent_messages와 같습니다.
+    """
+
+    def __init__(self, parser, max_messages: int = 20):
+        self.parser = parser
+        self.max_messages = max_messages
+        self.prefix = _PrefixCache()
+        self.candidates: List[Tuple[int, object]] = []  # (줄 시작 위치, 메시지), 최근 것부터
+        self.unscanned_end = -1  # 아직 읽지 않은 앞부분 chat_text[:unscanned_end] (-1이면 없음)
+
+    def reset(self):
+        self.prefix.reset()
+        self.candidates = []
+        self.unscanned_end = -1
+
+    def _scan(self, chat_text: str, start: int, end: int) -> Iterator[Tuple[int, object]]:
+        """chat_text[start:end] 구간의 줄을 마지막 줄부터 파싱해서 (줄 시작 위치, 메시지) 반환"""
+        while True:
+            newline = chat_text.rfind('\n', start, end)
+            line_start = newline + 1 if newline >= 0 else start
+
+            message = self.parser.parse_message_line(chat_text[line_start:end])
+            if message and message.content:
+                yield line_start, message
+
+            if newline < 0:
+                return
+            end = newline
+
+    def _candidates(self, chat_text: str, old_end: int, new_end: int) -> Iterator[Tuple[int, object]]:
+        """최근 것부터 메시지 후보 반환 (마지막 줄 → 새로 완성된 줄 → 보관된 후보 → 아직 읽지 않은 앞부분)"""
+        yield from self._scan(chat_text, new_end, len(chat_text))
+        if new_end > old_end:
+            yield from self._scan(chat_text, old_end, new_end - 1)
+        yield from self.candidates
+        if self.unscanned_end >= 0:
+            yield from self._scan(chat_text, 0, self.unscanned_end)
+
+    def parse(self, chat_text: str) -> List:
+        """chat_text에서 최근 메시지 추출 (이전 호출과 접두사가 같으면 새로 붙은 부분만 파싱)"""
+        old_end, new_end = self.prefix.extend(chat_text)
+        if old_end == 0:
+            # 접두사가 바뀜 (다른 채팅방 / 앞부분 변경) → 처음부터
+            self.candidates = []
+            self.unscanned_end = -1
+
+        messages = []
+        consumed = []  # 이번에 사용한 후보 중 완성된 줄에 속한 것
+        dedup = self.parser.dedup_policy()
+        exhausted = True
+
+        for line_start, message in self._candidates(chat_text, old_end, new_end):
+            if len(messages) >= self.max_messages:
+                exhausted = False
+                break
+
+            if line_start < new_end:
+                consumed.append((line_start, message))
+
+            # 중복 메시지 확인
+            if not dedup.check_and_add(message):
+                messages.append(message)
+
+        # 사용한 후보만 보관하고, 그 앞은 필요할 때 다시 읽음
+        self.candidates = consumed
+        if exhausted:
+            self.unscanned_end = -1
+        elif consumed:
+            self.unscanned_end = consumed[-1][0] - 1
+        else:
+            self.unscanned_end = new_end - 1
+
+        # 시간순으로 정렬 (오래된 것부터)
+        messages.reverse()
+
+        print(f"📊 증분 분석 완료: 새로 파싱 {len(chat_text) - old_end}자 / 전체 {len(chat_text)}자, {len(messages)}개 메시지 추출")
+        return messages
+
+
+class IncrementalDateParser:
+    """날짜 기반 파서(KakaoTalkDateParser)의 증분 파싱 래퍼
+
+    완성된 줄까지 파싱한 DateParseState를 보관하고, 새 텍스트가 같은 접두사로 시작하면
+    새로 완성된 줄만 이어서 파싱합니다. 마지막 줄은 상태 사본에서만 파싱합니다.
+    처음 파싱할 때는 find_recent_start로 기간 밖의 기록을 건너뛰고,
+    새로 붙은 부분에 기간 밖 구분선이 나오면 처음부터 다시 파싱합니다.
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.prefix = _PrefixCache()
+        self.state = None
+
+    def reset(self):
+        self.prefix.reset()
+        self.state = None
+
+    def parse(self, chat_text: str) -> List:
+        """chat_text에서 최근 기간 메시지 추출 (이전 호출과 접두사가 같으면 새로 붙은 부분만 파싱)"""
+        old_end, new_end = self.prefix.extend(chat_text)
+
+        # 새로 붙은 부분에 기간 밖 구분선이 있으면 extract_last_day_messages도 거기서부터 파싱하므로 처음부터
+        if old_end and self.parser.find_recent_start(chat_text, old_end) >= old_end:
+            old_end = 0
+
+        if old_end == 0 or self.state is None:
+            # 처음부터 (기간 밖의 오래된 기록은 건너뜀)
+            start = min(self.parser.find_recent_start(chat_text), new_end)
+            self.state = self.parser.new_parse_state(chat_text.count('\n', 0, start))
+        else:
+            start = old_end
+
+        # 새로 완성된 줄은 보관 상태에 반영
+        if new_end > start:
+            for line in chat_text[start:new_end - 1].split('\n'):
+                self.parser.feed_line(self.state, line)
+
+        # 마지막 줄은 다음 복사에서 달라질 수 있으므로 사본에서만 파싱
+        state = self.parser.fork_parse_state(self.state)
+        self.parser.feed_line(state, chat_text[new_end:])
+        messages = self.parser.sorted_messages(state)
+
+        print(f"📊 증분 분석 완료: 새로 파싱 {len(chat_text) - start}자 / 전체 {len(chat_text)}자, {len(messages)}개 메시지 추출")
+        return messages
+
+
+# 사용 예시 및 테스트 함수
+def test_incremental_parsers():
+    """증분 파싱 결과가 매번 전체를 다시 파싱한 결과와 같은지 확인
+
+    뒤에 줄이 붙는 경우 / 마지막 줄이 계속 늘어나는 경우 / 앞부분이 바뀐 경우 /
+    개수 제한 때문에 읽지 않았던 앞부분(unscanned_end)을 다시 읽어야 하는 경우를 확인합니다.
+    """
+    import contextlib
+    import io
+    from datetime import datetime
+
+    from .chat_date_parser import KakaoTalkDateParser, SAMPLE_DATE_CHAT
+    from .chat_parser import KakaoTalkChatParser, SAMPLE_CHAT
+
+    def count_rows(messages):
+        return [(m.sender, m.content, m.timestamp) for m in messages]
+
+    def date_rows(messages):
+        return [(m.sender, m.content, m.timestamp, m.raw_time) for m in messages]
+
+    def steps(sample):
+        """한 채팅방에서 복사를 반복한 텍스트들 (마지막 줄은 한 글자씩 늘어나다 완성됨)"""
+        lines = [line.strip() for line in sample.strip().split('\n')]
+        half = len(lines) // 2
+        texts = ['\n'.join(lines[:half]), '\n'.join(lines[:half + 2]) + '\n']
+        last = lines[half + 2]
+        texts += ['\n'.join(lines[:half + 2] + [last[:end]]) for end in (3, len(last) // 2, len(last))]
+        texts += ['\n'.join(lines) + '\n', '\n'.join(lines + lines[:3])]
+        # 앞부분이 바뀜 (다른 채팅방)
+        texts += ['\n'.join(lines[1:]), '\n'.join(lines[1:]) + '\n' + lines[1]]
+        return texts
+
+    # 개수 기반: 전체 파싱과 같은 결과
+    for max_messages in (3, 5, 20):
+        parser = KakaoTalkChatParser()
+        incremental = IncrementalCountParser(parser, max_messages)
+        for text in steps(SAMPLE_CHAT):
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected = parser.extract_recent_messages(text, max_messages)
+                actual = incremental.parse(text)
+            assert expected and count_rows(actual) == count_rows(expected), (max_messages, text)
+
+    # 개수 제한 때문에 읽지 않은 앞부분: 마지막 줄이 지워지면 그 앞을 다시 읽어야 함
+    lines = [line.strip() for line in SAMPLE_CHAT.strip().split('\n') if line.strip().startswith(('김철수', '이영희'))]
+    parser = KakaoTalkChatParser()
+    incremental = IncrementalCountParser(parser, 3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        incremental.parse('\n'.join(lines))
+        unscanned_end = incremental.unscanned_end
+        text = '\n'.join(lines[:-1]) + '\n'
+        expected = parser.extract_recent_messages(text, 3)
+        actual = incremental.parse(text)
+    assert text.find(lines[-4]) < unscanned_end < text.find(lines[-3])
+    assert count_rows(actual) == count_rows(expected) and actual[0].content == expected[0].content
+    assert lines[-4].endswith(actual[0].content)
+
+    # 날짜 기반: 기준 시간을 고정하고 전체 파싱과 같은 결과
+    now = datetime(2024, 6, 2, 9, 0)
+    parser = KakaoTalkDateParser(limit_hours=48)
+    parser.now = parser.classifier.now = now
+    parser.today = parser.classifier.today = now.date()
+    incremental = IncrementalDateParser(parser)
+    texts = steps(SAMPLE_DATE_CHAT)
+    # 새로 붙은 부분에 기간 밖 구분선이 나오는 경우
+    texts.append(texts[-1] + '\n2024년 5월 1일\n김철수 오전 9:00 한 달 전 메시지')
+    texts.append(texts[-1] + '\n2024년 6월 2일\n이영희 오전 8:59 ')
+    texts.append(texts[-1] + '답장')
+    for text in texts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = parser.extract_last_day_messages(text)
+            actual = incremental.parse(text)
+        assert date_rows(actual) == date_rows(expected), text
+    assert [m.content for m in actual] == ['답장']
+
+    print("증분 파서 테스트 통과 (전체 파싱과 같은 결과)")
+
+
+if __name__ == "__main__":
+    test_incremental_parsers()
@@ -0,0 +1,124 @@
+# line_classifier.py - 카카오톡 대화 한 줄을 한 번에 분류하는 모듈
+
+import re
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+from .pattern_matcher import get_pattern_matcher
+
+
+class LineKind:
+    """라인 종류 상수"""
+    DATE = 'date'                  # 날짜 구분선 (2024년 1월 15일, 오늘, 어제 ...)
+    SYSTEM = 'system'              # 시스템 메시지 / 빈 줄
+    URL = 'url'                    # URL 포함 라인
+    TIMESTAMPED = 'timestamped'    # 발신자 + 시간 + 메시지
+    SENDER = 'sender'              # 발신자 + 메시지 (시간 없음)
+    CONTINUATION = 'continuation'  # 패턴에 맞지 않는 이전 메시지의 연속
+    IGNORED = 'ignored'            # 너무 짧아서 버리는 라인
+
+    FILTERED = (SYSTEM, URL)
+    MESSAGES = (TIMESTAMPED, SENDER, CONTINUATION)
+
+
+class ClassifiedLine(NamedTuple):
+    """라인 분류 결과"""
+    kind: str
+    text: str  # 앞뒤 공백을 제거한 라인
+    sender: Optional[str] = None
+    content: Optional[str] = None
+    am_pm: Optional[str] = None
+    time_str: Optional[str] = None
+    date: Optional[datetime] = None
+
+
+class LineClassifier:
+    """파서의 패턴 목록을 받아 한 줄을 한 번만 검사해서 종류와 값을 돌려주는 분류기
+
+    date_patterns를 주면 날짜 구분선도 판별하며, 월/일만 있는 날짜와
+    오늘/어제/그저께는 now 기준으로 계산합니다.
+    """
+
+    def __init__(self, message_patterns: List[str], system_patterns: List[str], url_patterns: List[str],
+                 date_patterns: Optional[List[str]] = None, now: Optional[datetime] = None):
+        self.message_regexes = [re.compile(pattern) for pattern in message_patterns]
+        self.date_regexes = [re.compile(pattern) for pattern in (date_patterns or [])]
+        self.system_matcher = get_pattern_matcher(system_patterns)
+        self.url_matcher = get_pattern_matcher(url_patterns)
+
+        self.now = now or datetime.now()
+        self.today = self.now.date()
+
+    def parse_date(self, text: str) -> Optional[datetime]:
+        """날짜 구분선이면 해당 날짜의 datetime 반환 (text는 strip된 라인)"""
+        for regex in self.date_regexes:
+            match = regex.match(text)
+            if not match:
+                continue
+
+            groups = match.groups()
+            try:
+                if '년' in text and '월' in text and '일' in text:
+                    # 2024년 1월 15일 형태
+                    return datetime(int(groups[0]), int(groups[1]), int(groups[2]))
+                elif '월' in text and '일' in text:
+                    # 1월 15일 형태 (현재 년도로 가정)
+                    return datetime(self.now.year, int(groups[0]), int(groups[1]))
+            except ValueError:
+                continue
+
+            days_ago = {'오늘': 0, '어제': 1, '그저께': 2}.get(groups[0])
+            if days_ago is not None:
+                return datetime.combine(self.today - timedelta(days=days_ago), datetime.min.time())
+
+        return None
+
+    def classify(self, line: str) -> ClassifiedLine:
+        """한 줄을 분류 (날짜 → 시스템/URL → 메시지 패턴 → 연속 메시지 순)"""
+        text = line.strip()
+
+        if self.date_regexes:
+            date = self.parse_date(text)
+            if date:
+                return ClassifiedLine(LineKind.DATE, text, date=date)
+
+        # 빈 줄이거나 너무 짧은 메시지
+        if len(text) < 2:
+            return ClassifiedLine(LineKind.SYSTEM, text)
+
+        # URL이 포함된 라인은 이후 어떤 패턴으로 잘라도 URL이 남으므로 여기서 한 번만 확인
+        if self.url_matcher.search(text):
+            return ClassifiedLine(LineKind.URL, text)
+
+        if self.system_matcher.search(text):
+            return ClassifiedLine(LineKind.SYSTEM, text)
+
+        for regex in self.message_regexes:
+            match = regex.match(text)
+            if not match:
+                continue
+
+            groups = match.groups()
+            if len(groups) == 4:  # 발신자, 오전/오후, 시간, 메시지
+                sender, am_pm, time_str, content = groups
+            elif len(groups) == 3:  # 발신자, 시간, 메시지
+                sender, time_str, content = groups
+                am_pm = None
+            elif len(groups) == 2:  # 발신자, 메시지
+                sender, content = groups
+                # 발신자 이름이 너무 길면 메시지의 일부일 가능성
+                if len(sender) < 20 and content.strip():
+                    return ClassifiedLine(LineKind.SENDER, text, sender=sender.strip(), content=content.strip())
+                continue
+            else:
+                continue
+
+            if content.strip():
+                return ClassifiedLine(LineKind.TIMESTAMPED, text, sender=sender.strip(), content=content.strip(),
+                                      am_pm=am_pm, time_str=time_str.strip())
+
+        # 패턴에 맞지 않는 경우, 이전 메시지의 연속으로 처리
+        if len(text) > 5:  # 최소 길이 확인
+            return ClassifiedLine(LineKind.CONTINUATION, text, sender="(연속)", content=text)
+
+        return ClassifiedLine(LineKind.IGNORED, text)
@@ -0,0 +1,32 @@
+# line_reader.py - 대화 텍스트를 줄 단위로 지연 읽기
+
+from typing import Iterator, Tuple
+
+
+def iter_lines_reversed(text: str) -> Iterator[str]:
+    """텍스트의 줄을 마지막 줄부터 하나씩 반환 (text.split('\\n')을 뒤집은 것과 동일)
+
+    전체를 split하지 않고 rfind로 줄 경계를 찾으므로,
+    앞부분에서 멈추면 읽지 않은 줄은 문자열로 만들어지지 않습니다.
+    """
+    end = len(text)
+    while True:
+        start = text.rfind('\n', 0, end)
+        yield text[start + 1:end]
+        if start < 0:
+            return
+        end = start
+
+
+def count_lines(text: str) -> int:
+    """줄 수 계산 (len(text.split('\\n'))과 동일, 줄 문자열을 만들지 않음)"""
+    return text.count('\n') + 1
+
+
+def line_bounds(text: str, index: int) -> Tuple[int, int]:
+    """index 위치가 속한 줄의 (시작, 끝) 위치 반환 (끝은 줄바꿈 문자 위치)"""
+    start = text.rfind('\n', 0, index) + 1
+    end = text.find('\n', index)
+    if end < 0:
+        end = len(text)
+    return start, end
@@ -0,0 +1,233 @@
+# message_batch.py - 메시지를 객체 대신 열 단위 배열로 저장하는 컨테이너
+
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+# 분 단위 시간 계산 기준
+_EPOCH = datetime(1970, 1, 1)
+_MINUTE = timedelta(minutes=1)
+
+# 시간 정보 없음 표시
+NO_TIME = -(2 ** 63)
+NO_TIMESTAMP = -1
+
+
+class MessageRecord(NamedTuple):
+    """MessageBatch에서 꺼낸 메시지 한 개 (ChatMessage와 같은 속성 이름 사용)"""
+    sender: str
+    content: str
+    timestamp: Optional[str]
+    raw_time: Optional[datetime]
+
+    def __str__(self):
+        if self.timestamp:
+            return f"[{self.timestamp}] {self.sender}: {self.content}"
+        else:
+            return f"{self.sender}: {self.content}"
+
+
+class MessageBatch:
+    """메시지 목록을 열 단위로 저장하는 컨테이너
+
+    - 발신자 / 시간 문자열: 중복 없는 표에 한 번만 저장하고 번호로 참조
+    - 내용: 하나의 문자열에 이어 붙이고 시작/끝 위치만 저장
+    - 시간: 1970-01-01 기준 분 단위 정수 (초 이하는 버림)
+
+    len, 인덱싱(음수, 슬라이스 포함), 반복을 지원하므로
+    format_messages_for_gpt / get_chat_summary에 리스트 대신 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self):
+        self.sender_table: List[str] = []
+        self.timestamp_table: List[str] = []
+        self._sender_index: Dict[str, int] = {}
+        self._timestamp_index: Dict[str, int] = {}
+
+        self.sender_ids = array('I')
+        self.timestamp_ids = array('i')
+        self.minutes = array('q')
+        self.content_offsets = array('Q', [0])
+
+        self._content_parts: List[str] = []
+        self._content_text = ''
+
+    @classmethod
+    def from_messages(cls, messages: Iterable) -> 'MessageBatch':
+        """ChatMessage 목록으로 MessageBatch 생성"""
+        batch = cls()
+        for message in messages:
+            batch.append_message(message)
+        return batch
+
+    @staticmethod
+    def minute_of(raw_time: datetime) -> int:
+        """datetime을 minutes 배열에 저장하는 분 단위 정수로 변환 (초 이하는 버림)"""
+        return (raw_time - _EPOCH) // _MINUTE
+
+    @staticmethod
+    def _intern(value: str, table: List[str], index: Dict[str, int]) -> int:
+        number = index.get(value)
+        if number is None:
+            number = len(table)
+            table.append(value)
+            index[value] = number
+        return number
+
+    def append(self, sender: str, content: str, timestamp: Optional[str] = None, raw_time: Optional[datetime] = None):
+        """메시지 한 개 추가"""
+        self.sender_ids.append(self._intern(sender, self.sender_table, self._sender_index))
+
+        if timestamp:
+            self.timestamp_ids.append(self._intern(timestamp, self.timestamp_table, self._timestamp_index))
+        else:
+            self.timestamp_ids.append(NO_TIMESTAMP)
+
+        self.minutes.append(self.minute_of(raw_time) if raw_time else NO_TIME)
+
+        self._content_parts.append(content)
+        self.content_offsets.append(self.content_offsets[-1] + len(content))
+
+    def append_message(self, message):
+        """ChatMessage(또는 같은 속성을 가진 객체) 한 개 추가"""
+        self.append(message.sender, message.content, message.timestamp, message.raw_time)
+
+    def take(self, indices: Iterable[int]) -> 'MessageBatch':
+        """주어진 순서대로 메시지를 골라 새 MessageBatch 생성 (순서 뒤집기 / 정렬용)
+
+        발신자 / 시간 문자열 표는 그대로 공유하고 번호 배열만 다시 만듭니다.
+        """
+        text = self.content_text
+        offsets = self.content_offsets
+
+        batch = MessageBatch()
+        batch.sender_table, batch._sender_index = self.sender_table, self._sender_index
+        batch.timestamp_table, batch._timestamp_index = self.timestamp_table, self._timestamp_index
+        for index in indices:
+            batch.sender_ids.append(self.sender_ids[index])
+            batch.timestamp_ids.append(self.timestamp_ids[index])
+            batch.minutes.append(self.minutes[index])
+            content = text[offsets[index]:offsets[index + 1]]
+            batch._content_parts.append(content)
+            batch.content_offsets.append(batch.content_offsets[-1] + len(content))
+        return batch
+
+    @property
+    def content_text(self) -> str:
+        """모든 내용을 이어 붙인 문자열 (추가된 부분만 필요할 때 합침)"""
+        if self._content_parts:
+            self._content_text = ''.join([self._content_text] + self._content_parts)
+            self._content_parts = []
+        return self._content_text
+
+    def sender(self, index: int) -> str:
+        return self.sender_table[self.sender_ids[index]]
+
+    def content(self, index: int) -> str:
+        return self.content_text[self.content_offsets[index]:self.content_offsets[index + 1]]
+
+    def timestamp(self, index: int) -> Optional[str]:
+        number = self.timestamp_ids[index]
+        return self.timestamp_table[number] if number != NO_TIMESTAMP else None
+
+    def raw_time(self, index: int) -> Optional[datetime]:
+        minutes = self.minutes[index]
+        return _EPOCH + minutes * _MINUTE if minutes != NO_TIME else None
+
+    def __len__(self) -> int:
+        return len(self.sender_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('MessageBatch index out of range')
+
+        return MessageRecord(self.sender(index), self.content(index), self.timestamp(index), self.raw_time(index))
+
+    def __iter__(self) -> Iterator[MessageRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+# 사용 예시 및 테스트 함수
+def test_message_batch():
+    """ChatMessage 목록과 MessageBatch가 같은 내용을 돌려주는지 확인 (인덱싱 / 시간 없음 / 분 단위 버림 + 두 파서의 as_batch)"""
+    import contextlib
+    import io
+
+    from .chat_date_parser import ChatMessage, KakaoTalkDateParser, SAMPLE_DATE_CHAT
+    from .chat_parser import KakaoTalkChatParser, SAMPLE_CHAT
+
+    def rows(messages):
+        return [(m.sender, m.content, m.timestamp, m.raw_time) for m in messages]
+
+    messages = [
+        ChatMessage("김철수", "안녕하세요", "오후 12:30", datetime(2024, 6, 1, 12, 30)),
+        ChatMessage("이영희", "", None, None),
+        ChatMessage("김철수", "점심 뭐 먹을까요?", "오후 12:31", datetime(2024, 6, 1, 12, 31)),
+        ChatMessage("(연속)", "김치찌개 어때요", None, datetime(2024, 6, 1)),
+    ]
+    batch = MessageBatch.from_messages(messages)
+
+    # 왕복: 같은 발신자 / 시간 문자열은 표에 한 번만 저장
+    assert len(batch) == len(messages) and rows(batch) == rows(messages)
+    assert batch.sender_table == ["김철수", "이영희", "(연속)"]
+    assert str(batch[0]) == str(messages[0]) and str(batch[1]) == str(messages[1])
+
+    # 음수 인덱스와 슬라이스
+    assert batch[-1] == batch[3] and batch[-1].content == "김치찌개 어때요"
+    assert rows(batch[1:3]) == rows(messages[1:3]) and rows(batch[::-1]) == rows(messages[::-1])
+    assert batch[5:] == []
+    for index in (4, -5):
+        try:
+            batch[index]
+        except IndexError:
+            pass
+        else:
+            raise AssertionError(f"IndexError가 나야 함: {index}")
+
+    # 시간 정보 없음은 None으로 돌아옴
+    assert batch[1].timestamp is None and batch[1].raw_time is None
+
+    # 초 이하는 분 단위로 버림
+    batch.append("박민수", "12시 30분 45초", "오후 12:30", datetime(2024, 6, 1, 12, 30, 45, 500))
+    assert batch[-1].raw_time == datetime(2024, 6, 1, 12, 30)
+
+    # take: 순서를 바꾼 새 배치 (원본은 그대로)
+    reordered = batch.take([4, 0, 2])
+    assert rows(reordered) == [rows(batch)[4], rows(batch)[0], rows(batch)[2]] and len(batch) == 5
+
+    # 두 파서의 as_batch 결과가 리스트 결과와 같은지 (분 단위로 버린 시간 기준)
+    def minute_rows(messages):
+        return [(m.sender, m.content, m.timestamp, m.raw_time.replace(second=0, microsecond=0) if m.raw_time else None)
+                for m in messages]
+
+    now = datetime(2024, 6, 2, 9, 0)
+    for sample in (SAMPLE_CHAT, SAMPLE_CHAT + SAMPLE_CHAT):
+        parser = KakaoTalkChatParser()
+        with contextlib.redirect_stdout(io.StringIO()):
+            listed = parser.extract_recent_messages(sample, 5)
+            batched = parser.extract_recent_messages(sample, 5, as_batch=True)
+        assert not isinstance(batched, list) and len(batched) == len(listed)
+        assert [(m.sender, m.content, m.timestamp) for m in batched] == \
+               [(m.sender, m.content, m.timestamp) for m in listed]
+
+    for sample in (SAMPLE_DATE_CHAT, SAMPLE_DATE_CHAT + SAMPLE_DATE_CHAT):
+        parser = KakaoTalkDateParser(limit_hours=48)
+        parser.now = parser.classifier.now = now
+        parser.today = parser.classifier.today = now.date()
+        with contextlib.redirect_stdout(io.StringIO()):
+            listed = parser.extract_last_day_messages(sample, seek_tail=False)
+            batched = parser.extract_last_day_messages(sample, seek_tail=False, as_batch=True)
+        assert not isinstance(batched, list) and len(batched) == len(listed)
+        assert listed and minute_rows(batched) == minute_rows(listed)
+
+    print("MessageBatch 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_message_batch()
@@ -0,0 +1,398 @@
+# parallel_parser.py - 큰 대화 텍스트를 여러 프로세스로 나눠 파싱하는 드라이버 (입력은 공유 메모리로 전달)
+
+import contextlib
+import io
+import os
+import re
+from array import array
+from bisect import bisect_right
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+from .chat_date_parser import ChatMessage as DateChatMessage
+from .chat_parser import ChatMessage as CountChatMessage
+from .dedup import NoDedup
+from .line_classifier import LineKind
+from .line_reader import count_lines
+
+# 날짜 구분선 후보 (줄 시작의 "2024년 1월 15일" / "1월 15일"), 실제 구분선인지는 파서의 분류기로 확인
+_DATE_LINE = re.compile(r'^[^\S\n]*(?:\d{4}년[^\S\n]*)?\d{1,2}월[^\S\n]*\d{1,2}일'.encode('utf-8'), re.MULTILINE)
+
+
+def split_line_chunks(data: bytes, chunk_bytes: int,
+                      next_boundary: Optional[Callable[[bytes, int], int]] = None) -> List[Tuple[int, int]]:
+    """data를 약 chunk_bytes 크기의 (시작, 끝) 구간으로 나눔 (구간은 줄 단위, 끝의 줄바꿈은 빼고 다음 구간은 그 뒤부터)
+
+    각 구간을 split('\\n')한 줄들을 이어 붙이면 data.split(b'\\n')과 같습니다 (마지막 빈 줄 포함).
+    next_boundary(data, pos)는 pos 이후 구간을 시작할 수 있는 줄의 시작 위치(없으면 -1)를 반환하며,
+    주지 않으면 아무 줄에서나 나눕니다.
+    """
+    bounds = []
+    start = 0
+    while True:
+        position = start + max(chunk_bytes, 1)
+        if next_boundary:
+            boundary = next_boundary(data, position) if position < len(data) else -1
+        else:
+            newline = data.find(b'\n', position) if position < len(data) else -1
+            boundary = newline + 1 if newline >= 0 else -1
+
+        if boundary < 0:
+            bounds.append((start, len(data)))
+            return bounds
+        bounds.append((start, boundary - 1))
+        start = boundary
+
+
+def date_line_finder(parser) -> Callable[[bytes, int], int]:
+    """파서가 날짜 구분선으로 분류하는 줄의 시작 위치를 찾는 함수 (구간을 그 줄에서 시작하면 앞 구간의 날짜가 필요 없음)"""
+    def next_date_line(data: bytes, position: int) -> int:
+        while True:
+            match = _DATE_LINE.search(data, position)
+            if not match:
+                return -1
+            end = data.find(b'\n', match.start())
+            line = data[match.start():end if end >= 0 else len(data)].decode('utf-8', 'surrogatepass')
+            if parser.classifier.parse_date(line.strip()):
+                return match.start()
+            position = match.end()
+    return next_date_line
+
+
+# 작업 프로세스마다 한 번만 받는 파서 (패턴 컴파일 비용을 구간마다 내지 않도록)
+_worker_parser = None
+
+
+def _init_worker(parser):
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _read_chunk(name: str, start: int, end: int) -> str:
+    """공유 메모리에서 맡은 구간만 읽어서 문자열로 (전체 텍스트를 작업마다 복사해서 보내지 않음)"""
+    from multiprocessing import shared_memory
+
+    # 작업 프로세스는 만든 프로세스의 정리 관리자를 같이 쓰므로 붙기만 하고 지우는 것은 만든 쪽에서 함
+    memory = shared_memory.SharedMemory(name)
+    try:
+        return bytes(memory.buf[start:end]).decode('utf-8', 'surrogatepass')
+    finally:
+        memory.close()
+
+
+def _classify_count_chunk(task):
+    """작업 프로세스: 개수 기반 파서로 구간 분류 → (메시지 후보 [(줄 번호, 발신자, 내용, 시간)], 필터링된 줄 번호)"""
+    name, start, end = task
+    parser = _worker_parser
+    candidates = []
+    filtered = array('I')
+    for number, line in enumerate(_read_chunk(name, start, end).split('\n')):
+        classified = parser.classifier.classify(line)
+        if classified.kind in LineKind.FILTERED:
+            filtered.append(number)
+            continue
+
+        message = parser._message_from_line(classified)
+        if message and message.content:
+            candidates.append((number, message.sender, message.content, message.timestamp))
+    return candidates, filtered
+
+
+def _classify_date_chunk(task):
+    """작업 프로세스: 날짜 기반 파서로 구간 파싱 (중복 확인은 합칠 때)
+
+    (메시지 [(발신자, 내용, 시간, datetime)], 필터링 수, 날짜 섹션 수, 출력 내용) 반환.
+    메시지 객체보다 튜플이 주고받는 비용이 훨씬 적어서 튜플로 보냅니다.
+    """
+    name, start, end, line_number = task
+    parser = _worker_parser
+    state = parser.new_parse_state(line_number)
+    state.dedup = NoDedup()
+
+    # 날짜 섹션 로그는 모아서 돌려주고 합칠 때 구간 순서대로 출력
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        for line in _read_chunk(name, start, end).split('\n'):
+            parser.feed_line(state, line)
+    messages = [(message.sender, message.content, message.timestamp, message.raw_time) for message in state.messages]
+    return messages, state.filtered_count, state.date_sections_found, log.getvalue()
+
+
+class _ParallelDriver:
+    """작업 프로세스 풀과 공유 메모리 입력 관리 (풀은 처음 병렬 파싱할 때 만들고 close까지 재사용)"""
+
+    def __init__(self, parser, workers: int = 0, chunk_bytes: int = 1 << 20, min_parallel_bytes: int = 2 << 20):
+        self.parser = parser
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_bytes = chunk_bytes
+        self.min_parallel_bytes = min_parallel_bytes
+        self._executor = None
+
+    def use_parallel(self, length: int) -> bool:
+        """텍스트 길이(문자 수)로 병렬 파싱 여부 결정 (작은 대화는 인코딩 / 공유 메모리 복사 없이 바로 순차 파싱)
+
+        한글은 UTF-8로 3바이트이므로 문자 수는 실제 바이트 수보다 작게 잡힙니다.
+        """
+        return self.workers > 1 and length >= self.min_parallel_bytes
+
+    def executor(self):
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.parser,))
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    @contextlib.contextmanager
+    def shared_input(self, data: bytes):
+        """data를 공유 메모리에 올리고 이름 반환 (블록이 끝나면 지움)"""
+        from multiprocessing import shared_memory
+
+        memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        try:
+            memory.buf[:len(data)] = data
+            yield memory.name
+        finally:
+            memory.close()
+            memory.unlink()
+
+    @staticmethod
+    def finish(futures):
+        """남은 작업 취소, 이미 실행 중인 작업은 공유 메모리를 지우기 전에 끝날 때까지 대기"""
+        from concurrent.futures import wait
+
+        for future in futures:
+            future.cancel()
+        wait(futures)
+
+
+class ParallelCountParser(_ParallelDriver):
+    """개수 기반 파서(KakaoTalkChatParser)의 병렬 파싱 드라이버
+
+    텍스트를 줄 단위 구간으로 나눠 마지막 구간부터 workers개씩 작업 프로세스에서 분류하고,
+    최근 구간부터 받아서 뒤에서부터 중복 확인 / 개수 제한을 적용합니다. 필요한 개수가 모이면 앞 구간은 파싱하지 않습니다.
+    결과와 통계 출력은 extract_recent_messages와 같습니다.
+    extract_recent_messages도 뒤에서부터 필요한 줄만 읽으므로, 최근 몇 개만 가져올 때는 그쪽이 더 빠릅니다.
+    (앱의 개수 기반 모드는 이 드라이버를 쓰지 않음, 수만 개를 가져오는 일괄 처리용)
+    """
+
+    def __init__(self, parser, max_messages: int = 20, workers: int = 0, chunk_bytes: int = 64 << 10,
+                 min_parallel_bytes: int = 2 << 20):
+        super().__init__(parser, workers, chunk_bytes, min_parallel_bytes)
+        self.max_messages = max_messages
+
+    def parse(self, chat_text: str) -> List:
+        if not self.use_parallel(len(chat_text)):
+            return self.parser.extract_recent_messages(chat_text, self.max_messages)
+
+        data = chat_text.encode('utf-8', 'surrogatepass')
+        bounds = split_line_chunks(data, self.chunk_bytes)
+        messages = []
+        dedup = self.parser.dedup_policy()
+        filtered_count = 0
+
+        with self.shared_input(data) as name:
+            executor = self.executor()
+            remaining = list(bounds)  # 마지막 구간부터 꺼냄
+            pending = deque()
+            try:
+                while len(messages) < self.max_messages:
+                    # 최근 구간부터 작업 프로세스 수의 두 배까지 미리 보냄
+                    while remaining and len(pending) < self.workers * 2:
+                        start, end = remaining.pop()
+                        pending.append(executor.submit(_classify_count_chunk, (name, start, end)))
+                    if not pending:
+                        break
+
+                    candidates, filtered = pending.popleft().result()
+                    stop_line = None
+                    for number, sender, content, timestamp in reversed(candidates):
+                        message = CountChatMessage(sender, content, timestamp)
+                        if not dedup.check_and_add(message):
+                            messages.append(message)
+                            if len(messages) >= self.max_messages:
+                                stop_line = number
+                                break
+
+                    # 순서대로 읽었다면 멈춘 줄보다 뒤의 필터링된 줄만 셌을 것
+                    filtered_count += len(filtered) - (bisect_right(filtered, stop_line) if stop_line is not None else 0)
+            finally:
+                self.finish(list(pending))
+
+        # 시간순으로 정렬 (오래된 것부터)
+        messages.reverse()
+
+        print(f"📊 대화 분석 완료: 총 {count_lines(chat_text)}줄 중 {filtered_count}개 시스템 메시지/URL 제거, {len(messages)}개 메시지 추출")
+        return messages
+
+
+class ParallelDateParser(_ParallelDriver):
+    """날짜 기반 파서(KakaoTalkDateParser)의 병렬 파싱 드라이버
+
+    find_recent_start로 기간 밖의 기록을 건너뛴 뒤 나머지를 날짜 구분선에서 나눠 작업 프로세스에서 파싱하고,
+    구간 순서대로 중복 확인을 적용해서 합칩니다. 결과와 통계 출력은 extract_last_day_messages와 같습니다.
+    """
+
+    def __init__(self, parser, workers: int = 0, chunk_bytes: int = 1 << 20, min_parallel_bytes: int = 2 << 20):
+        super().__init__(parser, workers, chunk_bytes, min_parallel_bytes)
+        self.next_date_line = date_line_finder(parser)
+
+    def parse(self, chat_text: str) -> List:
+        start = self.parser.find_recent_start(chat_text)
+        if not self.use_parallel(len(chat_text) - start):
+            # 찾은 시작 위치를 넘겨서 다시 찾지 않음
+            return self.parser.extract_last_day_messages(chat_text, start=start)
+
+        data = chat_text[start:].encode('utf-8', 'surrogatepass')
+        skipped_lines = chat_text.count('\n', 0, start)
+        state = self.parser.new_parse_state(skipped_lines)
+        print(f"📅 날짜 기반 파싱 시작 - 기준 시간: {self.parser.now.strftime('%Y-%m-%d %H:%M')}")
+
+        bounds = split_line_chunks(data, self.chunk_bytes, self.next_date_line)
+        with self.shared_input(data) as name:
+            executor = self.executor()
+            futures = [executor.submit(_classify_date_chunk, (name, chunk_start, chunk_end,
+                                                              skipped_lines + data.count(b'\n', 0, chunk_start)))
+                       for chunk_start, chunk_end in bounds]
+            try:
+                for future in futures:
+                    messages, filtered_count, date_sections_found, log = future.result()
+                    print(log, end='')
+                    for sender, content, timestamp, raw_time in messages:
+                        # 중복 메시지 확인 (순서대로 파싱했을 때와 같은 순서)
+                        message = DateChatMessage(sender, content, timestamp, raw_time)
+                        if not state.dedup.check_and_add(message):
+                            state.messages.append(message)
+                    state.filtered_count += filtered_count
+                    state.date_sections_found += date_sections_found
+            finally:
+                self.finish(futures)
+
+        messages = self.parser.sorted_messages(state)
+        self.parser.print_parse_stats(chat_text, state, skipped_lines, len(messages))
+        return messages
+
+
+# 사용 예시 및 테스트 함수
+def make_sample_transcript(days: int, messages_per_day: int, start_year: int = 2024) -> str:
+    """테스트용 대화 텍스트 (복사한 대화 형식, 연속 메시지 / 시스템 메시지 / URL / 구간 경계를 넘는 중복 포함)"""
+    from datetime import datetime, timedelta
+
+    senders = ["김철수", "이영희", "박민수"]
+    texts = ["저녁 뭐 먹지", "치킨 어때요", "좋아요 ㅋㅋ", "내일 회의 몇 시죠?", "이 링크 봐보세요 https://example.com"]
+    lines = []
+    for day in range(days):
+        date = datetime(start_year, 1, 1) + timedelta(days=day)
+        lines.append(f"{date.year}년 {date.month}월 {date.day}일")
+        for index in range(messages_per_day):
+            hour, minute = divmod(index * (24 * 60 - 1) // messages_per_day, 60)
+            am_pm = "오전" if hour < 12 else "오후"
+            sender = senders[(day + index) % len(senders)]
+            line = f"{sender} {am_pm} {(hour % 12) or 12}:{minute:02d} {texts[index % len(texts)]}"
+            lines.append(line if index % 4 else f"{line} {day}-{index}")
+            if index % 7 == 3:
+                lines.append("두번째줄메시지입니다")
+            if index % 13 == 5:
+                lines.append(line)  # 같은 시각에 같은 메시지 (중복)
+            if index % 11 == 6:
+                lines.append(f"{sender}님이 들어왔습니다")
+    return '\n'.join(lines) + '\n'
+
+
+def test_parallel_parsers():
+    """작은 구간으로 나눠 병렬 파싱한 결과 / 통계 출력이 순서대로 파싱한 것과 같은지 확인"""
+    from datetime import datetime
+    from .chat_date_parser import KakaoTalkDateParser
+    from .chat_parser import KakaoTalkChatParser
+
+    def run(function, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = function(*args)
+        return result, output.getvalue()
+
+    transcript = make_sample_transcript(days=12, messages_per_day=40)
+    data = transcript.encode('utf-8')
+
+    bounds = split_line_chunks(data, 500)
+    assert b'\n'.join(data[start:end] for start, end in bounds) == data
+
+    count_parser = KakaoTalkChatParser()
+    for max_messages in (20, 300, 100000):
+        driver = ParallelCountParser(count_parser, max_messages, workers=2, chunk_bytes=500, min_parallel_bytes=0)
+        try:
+            expected, expected_output = run(count_parser.extract_recent_messages, transcript, max_messages)
+            actual, actual_output = run(driver.parse, transcript)
+        finally:
+            driver.close()
+        assert [(m.sender, m.content, m.timestamp) for m in actual] == \
+               [(m.sender, m.content, m.timestamp) for m in expected]
+        assert actual_output == expected_output, (actual_output, expected_output)
+
+    date_parser = KakaoTalkDateParser(limit_hours=24 * 5)
+    date_parser.now = date_parser.classifier.now = datetime(2024, 1, 12, 18, 0)
+    date_parser.today = date_parser.classifier.today = date_parser.now.date()
+    driver = ParallelDateParser(date_parser, workers=2, chunk_bytes=2000, min_parallel_bytes=0)
+    try:
+        expected, expected_output = run(date_parser.extract_last_day_messages, transcript)
+        actual, actual_output = run(driver.parse, transcript)
+        assert len(split_line_chunks(data, 2000, driver.next_date_line)) > 1
+    finally:
+        driver.close()
+    assert [(str(m), m.raw_time) for m in actual] == [(str(m), m.raw_time) for m in expected]
+    assert any(m.sender == "(연속)" for m in actual)
+    assert actual_output == expected_output
+
+    # 작은 대화는 찾은 시작 위치를 넘겨 순차 파싱 (같은 결과)
+    sequential, sequential_output = run(ParallelDateParser(date_parser, workers=2).parse, transcript)
+    assert [(str(m), m.raw_time) for m in sequential] == [(str(m), m.raw_time) for m in expected]
+    assert sequential_output == expected_output
+
+    print(f"병렬 파싱 테스트 통과 (날짜 기반 {len(actual)}개, 출력 동일)")
+
+
+def benchmark_parallel_parsers(days: int = 400, messages_per_day: int = 120, worker_counts=(1, 2, 4, 8)):
+    """큰 대화를 작업 프로세스 수별로 파싱한 시간 비교 (1은 기존 순차 파싱)"""
+    import time
+    from datetime import datetime, timedelta
+    from .chat_date_parser import KakaoTalkDateParser
+    from .chat_parser import KakaoTalkChatParser
+
+    transcript = make_sample_transcript(days, messages_per_day)
+    size = len(transcript.encode('utf-8')) / 1e6
+    print(f"대화 크기: {size:.1f}MB, CPU {os.cpu_count()}개")
+
+    date_parser = KakaoTalkDateParser(limit_hours=24 * (days + 1))
+    date_parser.now = date_parser.classifier.now = datetime(2024, 1, 1) + timedelta(days=days)
+    date_parser.today = date_parser.classifier.today = date_parser.now.date()
+    count_parser = KakaoTalkChatParser()
+    drivers = [("날짜 기반 (전체 기간)", lambda workers: ParallelDateParser(date_parser, workers, min_parallel_bytes=0)),
+               ("개수 기반 (최근 20000개)", lambda workers: ParallelCountParser(count_parser, 20000, workers,
+                                                                          min_parallel_bytes=0))]
+
+    for label, make_driver in drivers:
+        print(f"--- {label} ---")
+        baseline = None
+        for workers in worker_counts:
+            driver = make_driver(workers)
+            try:
+                if workers > 1:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        driver.parse(transcript[:len(transcript) // 100])  # 작업 프로세스 시작 시간은 빼고 측정
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    messages = driver.parse(transcript)
+                elapsed = time.perf_counter() - start
+            finally:
+                driver.close()
+            baseline = baseline or elapsed
+            print(f"  프로세스 {workers}개: {elapsed:.2f}초 ({size / elapsed:.1f}MB/s, {baseline / elapsed:.2f}배), "
+                  f"메시지 {len(messages):,}개")
+
+
+if __name__ == "__main__":
+    test_parallel_parsers()
+    benchmark_parallel_parsers()
@@ -0,0 +1,138 @@
+# pattern_matcher.py - 시스템 메시지/URL 패턴 사전 컴파일 판별기
+
+import re
+import time
+from typing import Dict, List, Tuple
+
+# 이 문자가 하나도 없으면 정규식이 아닌 단순 문자열로 취급
+_REGEX_META_CHARS = set('.^$*+?{}[]\\|()')
+
+# 프로세스 전체에서 공유하는 컴파일 결과 캐시
+_matcher_cache: Dict[Tuple[Tuple[str, ...], int], 'PatternMatcher'] = {}
+
+
+def _is_literal(pattern: str) -> bool:
+    """정규식 메타문자가 없는 단순 문자열 패턴인지 확인"""
+    return not (set(pattern) & _REGEX_META_CHARS)
+
+
+def _prune_literals(literals: List[str]) -> List[str]:
+    """다른 문자열을 포함하는 문자열 제거 (검색 결과가 같으므로 불필요)"""
+    unique = sorted(set(literals), key=len)
+    kept = []
+    for literal in unique:
+        if not any(shorter in literal for shorter in kept):
+            kept.append(literal)
+    return kept
+
+
+def _build_trie_regex(literals: List[str]) -> str:
+    """문자열 목록을 공통 접두사로 묶은 트라이 형태의 정규식으로 변환"""
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}  # 단어 끝 표시
+
+    def emit(node):
+        # 여기서 끝나는 문자열이 있으면 더 긴 문자열은 확인할 필요 없음
+        if '' in node:
+            return ''
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return emit(trie)
+
+
+class PatternMatcher:
+    """여러 패턴 중 하나라도 일치하는지 한 번의 검색으로 확인하는 판별기
+
+    - 단순 문자열 패턴: 트라이 정규식 하나로 합침
+    - '.+문자열' 패턴: 앞에 한 글자 이상 있는 문자열이므로 (?<=.) + 트라이로 합침
+    - 나머지 정규식 패턴: 하나의 alternation으로 합침
+    """
+
+    def __init__(self, patterns: List[str], flags: int = re.IGNORECASE):
+        self.patterns = list(patterns)
+
+        literals = []
+        prefixed_literals = []  # '.+' 로 시작하는 문자열 패턴
+        regexes = []
+
+        for pattern in self.patterns:
+            if _is_literal(pattern):
+                literals.append(pattern)
+            elif pattern.startswith('.+') and pattern[2:] and _is_literal(pattern[2:]):
+                prefixed_literals.append(pattern[2:])
+            else:
+                regexes.append(pattern)
+
+        branches = []
+        if literals:
+            branches.append(_build_trie_regex(_prune_literals(literals)))
+        if prefixed_literals:
+            branches.append('(?<=.)' + _build_trie_regex(_prune_literals(prefixed_literals)))
+        branches.extend(f'(?:{pattern})' for pattern in regexes)
+
+        self.regex = re.compile('|'.join(branches), flags) if branches else None
+
+    def search(self, text: str) -> bool:
+        """텍스트에 패턴 중 하나라도 포함되어 있는지 확인"""
+        if self.regex is None:
+            return False
+        return self.regex.search(text) is not None
+
+
+def get_pattern_matcher(patterns: List[str], flags: int = re.IGNORECASE) -> PatternMatcher:
+    """패턴 목록에 대한 판별기 반환 (같은 패턴 목록이면 프로세스당 한 번만 컴파일)"""
+    key = (tuple(patterns), flags)
+    matcher = _matcher_cache.get(key)
+    if matcher is None:
+        matcher = PatternMatcher(patterns, flags)
+        _matcher_cache[key] = matcher
+    return matcher
+
+
+# 성능 비교 함수
+def benchmark_pattern_matcher(line_count: int = 100000):
+    """기존 패턴별 re.search 반복과 사전 컴파일 판별기의 초당 처리 라인 수 비교"""
+    from .chat_parser import KakaoTalkChatParser
+
+    parser = KakaoTalkChatParser()
+    sample_lines = [
+        "김철수 오후 2:30 안녕하세요!",
+        "이영희 오후 2:31 오늘 날씨가 정말 좋네요",
+        "이영희님이 들어왔습니다",
+        "박민수 오전 11:05 그럼 3시에 공원에서 만날까요?",
+        "읽음 2",
+        "김철수 오후 6:45 퇴근하시나요? ㅋㅋㅋ",
+        "2024년 6월 1일 토요일",
+        "사진을 저장했습니다",
+    ]
+    lines = [sample_lines[i % len(sample_lines)] + f" {i}" for i in range(line_count)]
+
+    def naive(line):
+        for pattern in parser.system_patterns:
+            if re.search(pattern, line, re.IGNORECASE):
+                return True
+        return False
+
+    matcher = get_pattern_matcher(parser.system_patterns)
+
+    results = {}
+    for name, func in (("기존 (패턴별 re.search)", naive), ("사전 컴파일 판별기", matcher.search)):
+        start = time.perf_counter()
+        matched = sum(1 for line in lines if func(line))
+        elapsed = time.perf_counter() - start
+        results[name] = matched
+        print(f"{name}: {line_count / elapsed:,.0f} lines/s (일치 {matched}줄)")
+
+    if len(set(results.values())) != 1:
+        print("⚠️ 두 방식의 판별 결과가 다릅니다!")
+
+
+if __name__ == "__main__":
+    benchmark_pattern_matcher()
@@ -0,0 +1,114 @@
+# prompt_cache.py - Claude 프롬프트 캐싱용 system 블록 구성과 요청별 토큰 집계 (Claude / OpenAI usage 형식)
+
+import threading
+from typing import Dict, List, Optional
+
+
+def cached_text_block(text: str) -> Dict:
+    """캐시 지점(cache_control)이 붙은 system 텍스트 블록"""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+def build_system_blocks(*parts: str) -> List[Dict]:
+    """고정 프롬프트 조각들로 system 블록 목록 생성
+
+    조각마다 캐시 지점을 두므로 앞 조각(페르소나)은 모든 톤이, 앞 두 조각(페르소나 + 톤 지시)은
+    같은 톤의 다음 요청이 캐시에서 읽습니다. 캐시는 바이트 단위로 같은 접두사만 재사용하므로
+    조각은 앞뒤 공백을 정리해서 항상 같은 내용이 되게 합니다. (Claude는 캐시 지점을 최대 4개까지 허용)
+    """
+    blocks = [cached_text_block(part.strip()) for part in parts if part and part.strip()]
+    if len(blocks) > 4:
+        raise ValueError("캐시 지점은 최대 4개까지 사용할 수 있습니다")
+    return blocks
+
+
+class TokenUsage:
+    """요청별 토큰 사용량 집계 (캐시에서 읽은 입력 토큰 / 캐시에 쓴 입력 토큰 / 일반 입력 토큰 / 출력 토큰)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.input_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.output_tokens = 0
+
+    def record(self, usage, label: str = "", output_tokens: Optional[int] = None) -> Optional[str]:
+        """응답의 usage를 누적하고 요청 한 건의 요약 문자열 반환 (usage가 없으면 None)
+
+        스트리밍 응답은 시작 시점의 usage만 있으므로 출력 토큰 수를 output_tokens로 따로 넘깁니다.
+        """
+        if usage is None:
+            return None
+
+        if hasattr(usage, 'prompt_tokens'):
+            # OpenAI 형식 (접두사 캐시는 자동, 캐시에서 읽은 토큰은 prompt_tokens에 포함)
+            details = getattr(usage, 'prompt_tokens_details', None)
+            cache_read = getattr(details, 'cached_tokens', 0) or 0
+            cache_write = 0
+            input_tokens = (usage.prompt_tokens or 0) - cache_read
+            reported_output = getattr(usage, 'completion_tokens', 0) or 0
+        else:
+            input_tokens = getattr(usage, 'input_tokens', 0) or 0
+            cache_read = getattr(usage, 'cache_read_input_tokens', 0) or 0
+            cache_write = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+            reported_output = getattr(usage, 'output_tokens', 0) or 0
+        if output_tokens is None:
+            output_tokens = reported_output
+
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += input_tokens
+            self.cache_read_tokens += cache_read
+            self.cache_write_tokens += cache_write
+            self.output_tokens += output_tokens
+
+        prompt_total = input_tokens + cache_read + cache_write
+        prefix = f"{label} " if label else ""
+        return (f"🧮 {prefix}토큰: 입력 {prompt_total} (캐시 읽기 {cache_read} / 캐시 쓰기 {cache_write} / "
+                f"일반 {input_tokens}), 출력 {output_tokens}")
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
+
+    def summary(self) -> str:
+        """누적 요약 (입력 토큰 중 캐시에서 읽은 비율)"""
+        with self._lock:
+            if not self.requests:
+                return "토큰 사용 기록 없음"
+            ratio = self.cache_read_tokens / self.prompt_tokens * 100 if self.prompt_tokens else 0.0
+            return (f"요청 {self.requests}번, 입력 {self.prompt_tokens} 토큰 중 캐시 {self.cache_read_tokens} "
+                    f"({ratio:.0f}%), 캐시 쓰기 {self.cache_write_tokens}, 출력 {self.output_tokens}")
+
+
+# 사용 예시 및 테스트 함수
+def test_prompt_cache():
+    """system 블록 구성과 토큰 집계 테스트"""
+    from types import SimpleNamespace
+
+    persona = "당신은 고경우라는 친구의 말투로 답변해야 합니다.\n"
+    first = build_system_blocks(persona, "\n    긍정적으로 답변해주세요.\n    ")
+    second = build_system_blocks(persona.strip(), "긍정적으로 답변해주세요.")
+    assert first == second  # 공백이 달라도 같은 접두사
+    assert all(block["cache_control"] == {"type": "ephemeral"} for block in first)
+
+    usage = TokenUsage()
+    print(usage.record(SimpleNamespace(input_tokens=30, cache_creation_input_tokens=1200,
+                                       cache_read_input_tokens=0, output_tokens=12), "긍정적"))
+    print(usage.record(SimpleNamespace(input_tokens=30, cache_creation_input_tokens=0,
+                                       cache_read_input_tokens=1200, output_tokens=10), "중립적"))
+    assert usage.prompt_tokens == 2460
+
+    # OpenAI 형식
+    print(usage.record(SimpleNamespace(prompt_tokens=1300, completion_tokens=8,
+                                       prompt_tokens_details=SimpleNamespace(cached_tokens=1024)), "부정적"))
+    assert usage.cache_read_tokens == 2224
+    print(usage.summary())
+
+
+if __name__ == "__main__":
+    test_prompt_cache()
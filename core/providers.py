@@ -0,0 +1,302 @@
+# providers.py - 답변 생성 백엔드 (OpenAI / 파인튜닝 OpenAI / Anthropic) 공통 인터페이스
+
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from .prompt_cache import build_system_blocks
+from .tone_runner import FALLBACK_SUGGESTION
+
+# 백엔드 이름 → 표시 이름
+PROVIDER_LABELS = {
+    "anthropic": "Claude",
+    "openai": "GPT",
+    "openai_finetuned": "GPT (파인튜닝)",
+}
+
+
+def _join_parts(parts: List[str]) -> str:
+    """고정 프롬프트 조각을 한 문자열로 (조각마다 앞뒤 공백 정리)"""
+    return "\n\n".join(part.strip() for part in parts if part and part.strip())
+
+
+class SuggestionProvider:
+    """답변 생성 백엔드 기본 클래스
+
+    프롬프트는 고정 부분(system_parts: 페르소나, 톤 지시)과 매번 달라지는 user_message(대화)로 받고,
+    백엔드마다 알맞은 요청 형식으로 바꿔서 보냅니다. SDK import와 API 클라이언트 생성은 무거우므로
+    client에 처음 접근할 때(첫 요청 또는 창을 띄운 뒤 미리 준비) 한 번만 합니다.
+    """
+
+    name = ""
+    api_key_setting = ""  # config.py의 API 키 이름 (오류 안내용)
+    persona_mode = False  # True면 고경우 프롬프트 / 톤 지시 사용
+
+    def __init__(self, api_key: str, model: str, temperature: float, max_tokens: int, transport=None,
+                 token_usage=None):
+        self.api_key = api_key
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.transport = transport  # 연결 풀 (PooledTransport, None이면 SDK 기본 연결 사용)
+        self.token_usage = token_usage
+        self._client = None
+        self._client_error = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        """API 키가 설정되어 있는지 (SDK를 import하지 않고 확인)"""
+        return bool(self.api_key)
+
+    @property
+    def client(self):
+        """SDK 클라이언트 (처음 접근할 때 SDK를 import해서 생성, 실패하면 None)"""
+        if self._client is None and self._client_error is None and self.configured:
+            with self._client_lock:
+                if self._client is None and self._client_error is None:
+                    started = time.perf_counter()
+                    try:
+                        self._client = self._create_client()
+                        print(f"✅ {self.label} API 클라이언트 준비 완료 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+                    except Exception as e:
+                        self._client_error = e
+                        print(f"❌ {self.label} API 초기화 실패: {e}")
+        return self._client
+
+    @property
+    def ready(self) -> bool:
+        """클라이언트가 이미 만들어졌는지 (생성을 시작하지 않음)"""
+        return self._client is not None
+
+    def _create_client(self):
+        raise NotImplementedError
+
+    def _http_client(self):
+        return self.transport.client if self.transport else None
+
+    @property
+    def label(self) -> str:
+        return PROVIDER_LABELS.get(self.name, self.name)
+
+    @property
+    def display_name(self) -> str:
+        """상태 표시줄용 이름 (고경우 모드면 앞에 표시)"""
+        return f"고경우 {self.label}" if self.persona_mode else self.label
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    @property
+    def base_url(self) -> Optional[str]:
+        return str(self.client.base_url) if self.client else None
+
+    def complete(self, system_parts: List[str], user_message: str, max_tokens: Optional[int] = None,
+                 label: str = "") -> str:
+        """요청 한 번 보내고 전체 답변 텍스트 반환"""
+        raise NotImplementedError
+
+    def stream(self, system_parts: List[str], user_message: str, max_tokens: Optional[int] = None,
+               label: str = "") -> Iterator[str]:
+        """답변 텍스트 조각을 받는 대로 반환 (도중에 close하면 연결을 닫고 나머지는 받지 않음)"""
+        raise NotImplementedError
+
+    def error_suggestion(self, error: Exception) -> str:
+        """생성 오류 시 버튼에 표시할 답변"""
+        return FALLBACK_SUGGESTION
+
+    def _record_usage(self, usage, label: str, output_tokens: Optional[int] = None):
+        if self.token_usage is None:
+            return
+        usage_line = self.token_usage.record(usage, label, output_tokens)
+        if usage_line:
+            print(usage_line)
+
+
+class AnthropicProvider(SuggestionProvider):
+    """Claude (고정 프롬프트는 캐시 지점이 붙은 system 블록으로 전송)"""
+
+    name = "anthropic"
+    api_key_setting = "ANTHROPIC_API_KEY"
+
+    def __init__(self, api_key: str, model: str, temperature: float, max_tokens: int, persona_mode: bool = True,
+                 transport=None, token_usage=None):
+        super().__init__(api_key, model, temperature, max_tokens, transport, token_usage)
+        self.persona_mode = persona_mode
+        self._anthropic = None
+
+    @property
+    def configured(self):
+        return bool(self.api_key) and len(self.api_key) >= 10
+
+    def _create_client(self):
+        import anthropic
+        self._anthropic = anthropic
+        return anthropic.Anthropic(api_key=self.api_key, http_client=self._http_client())
+
+    def _request(self, system_parts, user_message, max_tokens) -> Dict:
+        return dict(
+            model=self.model,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature,
+            system=build_system_blocks(*system_parts),
+            messages=[
+                {"role": "user", "content": user_message}
+            ]
+        )
+
+    def complete(self, system_parts, user_message, max_tokens=None, label=""):
+        response = self.client.messages.create(**self._request(system_parts, user_message, max_tokens))
+        self._record_usage(getattr(response, 'usage', None), label)
+
+        if not response.content:
+            raise Exception("빈 응답을 받았습니다")
+        return response.content[0].text
+
+    def stream(self, system_parts, user_message, max_tokens=None, label=""):
+        usage = None
+        output_tokens = 0
+        try:
+            with self.client.messages.stream(**self._request(system_parts, user_message, max_tokens)) as response:
+                for event in response:
+                    if event.type == "message_start":
+                        usage = event.message.usage
+                    elif event.type == "message_delta" and event.usage:
+                        output_tokens = event.usage.output_tokens
+                    elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+                        output_tokens += 1  # 중간에 멈추면 최종 출력 토큰 수가 오지 않으므로 받은 조각 수로 추정
+                        yield event.delta.text
+        finally:
+            self._record_usage(usage, label, output_tokens)
+
+    def error_suggestion(self, error):
+        if self._anthropic and isinstance(error, self._anthropic.APIError):
+            message = str(error).lower()
+            if "rate_limit" in message:
+                return "사용량 한도 초과"
+            elif "authentication" in message:
+                return "인증 오류"
+            return "API 오류"
+        return FALLBACK_SUGGESTION
+
+
+class OpenAIProvider(SuggestionProvider):
+    """기본 GPT 모델 (고정 프롬프트는 system 메시지, 대화는 user 메시지)"""
+
+    name = "openai"
+    api_key_setting = "OPENAI_API_KEY"
+
+    def _create_client(self):
+        from openai import OpenAI
+        return OpenAI(api_key=self.api_key, http_client=self._http_client())
+
+    def _messages(self, system_parts, user_message) -> List[Dict]:
+        return [
+            {"role": "system", "content": _join_parts(system_parts)},
+            {"role": "user", "content": user_message}
+        ]
+
+    def complete(self, system_parts, user_message, max_tokens=None, label=""):
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(system_parts, user_message),
+            n=1,
+            temperature=self.temperature,
+            max_tokens=max_tokens or self.max_tokens
+        )
+        self._record_usage(getattr(response, 'usage', None), label)
+        return response.choices[0].message.content or ""
+
+    def stream(self, system_parts, user_message, max_tokens=None, label=""):
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(system_parts, user_message),
+            n=1,
+            temperature=self.temperature,
+            max_tokens=max_tokens or self.max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        try:
+            for chunk in response:
+                if chunk.usage:
+                    self._record_usage(chunk.usage, label)  # 끝까지 받은 경우에만 마지막 조각에 포함
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            response.close()
+
+
+class FineTunedOpenAIProvider(OpenAIProvider):
+    """파인튜닝된 고경우 GPT 모델 (학습 때와 같이 프롬프트 전체를 user 메시지 하나로 전송)"""
+
+    name = "openai_finetuned"
+    persona_mode = True
+
+    def _messages(self, system_parts, user_message):
+        return [
+            {"role": "user", "content": _join_parts(list(system_parts) + [user_message])}
+        ]
+
+
+def resolve_provider_name(settings: Dict, requested: Optional[str] = None) -> str:
+    """사용할 백엔드 이름 (실행 인자 → config의 SUGGESTION_PROVIDER 순서)
+
+    파인튜닝 모델이 꺼져 있거나 모델 ID가 없으면 기본 GPT 모델을 사용합니다.
+    """
+    name = requested or settings.get('SUGGESTION_PROVIDER') or "openai"
+    if name == "openai_finetuned" and not (settings.get('USE_FINE_TUNED_MODEL', True)
+                                           and settings.get('FINE_TUNED_MODEL_ID')):
+        name = "openai"
+    return name
+
+
+def create_provider(name: str, settings: Dict, transport=None, token_usage=None) -> SuggestionProvider:
+    """config 값(settings)으로 백엔드 생성 (SDK는 아직 import하지 않음)"""
+    get = settings.get
+    if name == "anthropic":
+        return AnthropicProvider(get('ANTHROPIC_API_KEY', ""), get('CLAUDE_MODEL', "claude-3-5-sonnet-20241022"),
+                                 get('CLAUDE_TEMPERATURE', 0.8), get('CLAUDE_MAX_TOKENS', 150),
+                                 get('USE_KOKYUNGWOO_MODE', True), transport, token_usage)
+    if name == "openai_finetuned":
+        return FineTunedOpenAIProvider(get('OPENAI_API_KEY', ""), get('FINE_TUNED_MODEL_ID', ""),
+                                       get('GPT_TEMPERATURE', 0.8), get('GPT_MAX_TOKENS', 1000),
+                                       transport, token_usage)
+    if name == "openai":
+        return OpenAIProvider(get('OPENAI_API_KEY', ""), get('GPT_MODEL', "gpt-3.5-turbo"),
+                              get('GPT_TEMPERATURE', 0.8), get('GPT_MAX_TOKENS', 1000),
+                              transport, token_usage)
+    raise ValueError(f"알 수 없는 답변 생성 백엔드: {name} (사용 가능: {', '.join(PROVIDER_LABELS)})")
+
+
+# 사용 예시 및 테스트 함수
+def test_providers():
+    """백엔드 선택 / 요청 형식 테스트 (SDK가 없어도 요청 형식은 확인 가능)"""
+    settings = {'SUGGESTION_PROVIDER': "openai_finetuned", 'USE_FINE_TUNED_MODEL': True, 'FINE_TUNED_MODEL_ID': ""}
+    assert resolve_provider_name(settings) == "openai"  # 모델 ID가 없으면 기본 GPT
+    assert resolve_provider_name(settings, "anthropic") == "anthropic"
+    settings['FINE_TUNED_MODEL_ID'] = "ft:gpt-3.5-turbo-0125:kokyungwoo"
+    assert resolve_provider_name(settings) == "openai_finetuned"
+
+    system_parts = ["페르소나 프롬프트\n", "\n    톤 지시\n    "]
+    basic = OpenAIProvider("", "gpt-3.5-turbo", 0.8, 80)
+    assert [m["role"] for m in basic._messages(system_parts, "대화")] == ["system", "user"]
+    assert basic._messages(system_parts, "대화")[0]["content"] == "페르소나 프롬프트\n\n톤 지시"
+
+    fine_tuned = create_provider("openai_finetuned", settings)
+    assert not fine_tuned.configured and not fine_tuned.ready  # 만들기만 해서는 SDK를 import하지 않음
+    assert fine_tuned.persona_mode and fine_tuned.display_name == "고경우 GPT (파인튜닝)"
+    assert fine_tuned._messages(system_parts, "대화 내용:\n김철수: 밥?") == [
+        {"role": "user", "content": "페르소나 프롬프트\n\n톤 지시\n\n대화 내용:\n김철수: 밥?"}]
+
+    try:
+        create_provider("gemini", settings)
+        assert False
+    except ValueError as e:
+        print(e)
+    print("답변 생성 백엔드 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_providers()
@@ -0,0 +1,97 @@
+# speculation.py - 자동 모드에서 클릭 전에 답변을 미리 생성할지 판단 (마지막 발신자 / 시간당 호출 한도)
+
+import time
+from collections import deque
+from typing import Iterable, List, Optional
+
+CONTINUATION_SENDER = "(연속)"
+
+# 내 이름 목록이 비어 있다는 안내를 이미 출력했는지 (한 번만 출력)
+_empty_names_noticed = False
+
+
+def last_sender(messages: List) -> Optional[str]:
+    """마지막 메시지의 발신자 (이어지는 줄 "(연속)"은 건너뛰고 찾음)"""
+    for message in reversed(messages):
+        if message.sender and message.sender != CONTINUATION_SENDER:
+            return message.sender
+    return None
+
+
+def should_speculate(messages: List, my_names: Iterable[str]) -> bool:
+    """마지막 메시지를 상대방이 보냈으면 True
+
+    내 이름 목록이 비어 있으면 내가 보낸 메시지인지 알 수 없으므로 False (안내는 한 번만 출력)
+    """
+    global _empty_names_noticed
+    my_names = set(my_names)
+    if not my_names:
+        if not _empty_names_noticed:
+            _empty_names_noticed = True
+            print("ℹ️ MY_CHAT_NAMES가 비어 있어 답변 미리 생성을 하지 않습니다 (config.py에 내 카카오톡 이름을 넣어주세요)")
+        return False
+
+    sender = last_sender(messages)
+    if sender is None:
+        return False
+    return sender not in my_names
+
+
+class HourlyBudget:
+    """최근 1시간 동안의 호출 수 제한 (미리 생성이 API 비용을 과하게 쓰지 않도록)"""
+
+    def __init__(self, max_calls: int, window_seconds: float = 3600):
+        self.max_calls = max_calls
+        self.window_seconds = window_seconds
+        self.calls = deque()  # 호출 시각 (오래된 것부터)
+
+    def _expire(self, now: float):
+        while self.calls and now - self.calls[0] >= self.window_seconds:
+            self.calls.popleft()
+
+    def remaining(self, now: Optional[float] = None) -> int:
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        return max(self.max_calls - len(self.calls), 0)
+
+    def try_spend(self, count: int = 1, now: Optional[float] = None) -> bool:
+        """count번 호출할 여유가 있으면 기록하고 True"""
+        now = time.monotonic() if now is None else now
+        if self.remaining(now) < count:
+            return False
+        self.calls.extend([now] * count)
+        return True
+
+
+# 사용 예시 및 테스트 함수
+def test_speculation():
+    """발신자 판단 / 시간당 한도 테스트"""
+    import contextlib
+    import io
+    from types import SimpleNamespace
+
+    messages = [SimpleNamespace(sender="김철수"), SimpleNamespace(sender="고경우"),
+                SimpleNamespace(sender=CONTINUATION_SENDER)]
+    assert last_sender(messages) == "고경우"
+    assert not should_speculate(messages, ["고경우"])
+    assert should_speculate(messages[:1], ["고경우"])
+    assert not should_speculate([], ["고경우"])
+
+    # 내 이름 목록이 비어 있으면 발신자와 상관없이 False, 안내는 한 번만
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert not should_speculate(messages, [])
+        assert not should_speculate(messages[:1], [])
+        assert not should_speculate([], [])
+    assert output.getvalue().count("MY_CHAT_NAMES") == 1
+
+    budget = HourlyBudget(max_calls=5)
+    assert budget.try_spend(3, now=0)
+    assert not budget.try_spend(3, now=10)  # 남은 한도 2
+    assert budget.try_spend(2, now=20)
+    assert budget.remaining(now=3600) == 3  # 첫 3번은 1시간이 지나 만료
+    print("미리 생성 판단 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_speculation()
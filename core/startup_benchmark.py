@@ -0,0 +1,148 @@
+# startup_benchmark.py - 프로그램 시작 시 모듈별 import 시간 측정 (python -X importtime 결과 집계)
+
+import argparse
+import ast
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# 시작 경로에서 빼고 처음 쓸 때(또는 창을 띄운 뒤) 불러오는 무거운 모듈
+DEFERRED_MODULES = ["anthropic", "openai", "httpx", "pyperclip", "uiautomation", "concurrent.futures.process",
+                    "multiprocessing.shared_memory"]
+
+# "import time:       453 |      74494 | httpx" (self / cumulative 단위는 마이크로초, 이름 앞 공백이 깊이)
+_IMPORTTIME_LINE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( +)(\S+)\s*$')
+_MARKER = "@@startup_benchmark@@"
+
+# 측정용 하위 프로세스: 모듈을 순서대로 import하고 사이사이에 구분 표시를 stderr에 출력
+# (importlib.import_module은 -X importtime에 기록되지 않으므로 __import__ 사용)
+_RUNNER = f"""
+import sys
+for name in sys.argv[1:]:
+    sys.stderr.write("{_MARKER} " + name + "\\n")
+    sys.stderr.flush()
+    try:
+        __import__(name)
+    except Exception as e:
+        print(name + "\\t" + type(e).__name__ + ": " + str(e))
+"""
+
+
+def startup_modules(app_path: str, package: str = "core") -> List[str]:
+    """app.py가 시작할 때(함수 밖 최상위 코드에서) import하는 모듈 목록 (import 순서대로, 상대 import는 package 기준)"""
+    with open(app_path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+
+    modules = []
+
+    def visit(nodes):
+        for node in nodes:
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                modules.append(f"{package}.{node.module}" if node.level else node.module)
+            elif isinstance(node, (ast.If, ast.Try)):
+                # 파서 선택 같은 조건부 import도 포함 (둘 중 하나만 실행되지만 둘 다 가벼움)
+                visit(node.body)
+                visit(getattr(node, 'orelse', []))
+                for handler in getattr(node, 'handlers', []):
+                    visit(handler.body)
+
+    visit(tree.body)
+    return list(dict.fromkeys(modules))
+
+
+def parse_importtime(stderr: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """importtime 출력 → (요청한 모듈별 누적 시간, import된 모든 모듈의 자체 시간), 단위 마이크로초
+
+    요청한 모듈 하나를 import하는 동안 최상위(깊이 0)로 기록된 항목을 모두 더합니다.
+    (a.b를 import하면 a와 a.b가 각각 최상위로 기록되고, 앞에서 이미 불러온 모듈은 다시 세지 않음)
+    """
+    per_request: Dict[str, int] = {}
+    self_times: Dict[str, int] = {}
+    current = None
+    for line in stderr.splitlines():
+        if line.startswith(_MARKER):
+            current = line[len(_MARKER):].strip()
+            per_request[current] = 0
+            continue
+        match = _IMPORTTIME_LINE.match(line)
+        if not match or current is None:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), match[3], match[4]
+        self_times[name] = self_us
+        if len(indent) == 1:
+            per_request[current] += cumulative_us
+    return per_request, self_times
+
+
+def measure(modules: List[str], cwd: str, runs: int = 5):
+    """하위 프로세스에서 runs번 import해서 모듈별 중앙값(ms), 모든 모듈 자체 시간 중앙값(ms), 실패 목록 반환
+
+    cwd는 클라이언트 폴더 (그 폴더의 config와 상위 폴더의 core 패키지를 불러옴)
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(cwd),
+                                                                   os.environ.get('PYTHONPATH')])))
+    samples: Dict[str, List[float]] = {name: [] for name in modules}
+    self_samples: Dict[str, List[float]] = {}
+    failures: Dict[str, str] = {}
+
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", _RUNNER, *modules],
+                                cwd=cwd, env=env, capture_output=True, text=True, encoding='utf-8', errors='replace')
+        for line in result.stdout.splitlines():
+            name, _, error = line.partition("\t")
+            failures[name] = error
+        per_request, self_times = parse_importtime(result.stderr)
+        for name, us in per_request.items():
+            samples[name].append(us / 1000)
+        for name, us in self_times.items():
+            self_samples.setdefault(name, []).append(us / 1000)
+
+    medians = {name: statistics.median(values) for name, values in samples.items() if values}
+    self_medians = {name: statistics.median(values) for name, values in self_samples.items()}
+    return medians, self_medians, failures
+
+
+def print_table(title: str, medians: Dict[str, float], failures: Dict[str, str]):
+    print(f"\n=== {title} ===")
+    for name, ms in sorted(medians.items(), key=lambda item: -item[1]):
+        note = "  (설치 안 됨 / 불러오기 실패)" if name in failures else ""
+        print(f"{ms:9.1f}ms  {name}{note}")
+    print(f"{sum(medians.values()):9.1f}ms  합계")
+
+
+def run_startup_benchmark(main_path: str, runs: int = 5, top: int = 10):
+    """클라이언트 main.py로 실행한 앱 시작 경로의 모듈별 import 시간과 첫 사용 때로 미룬 모듈의 import 시간 비교"""
+    cwd = os.path.dirname(os.path.abspath(main_path))
+    startup = startup_modules(os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py"))
+
+    medians, self_medians, failures = measure(startup, cwd, runs)
+    print_table(f"시작 경로 import ({os.path.basename(cwd)}/main.py, {runs}회 중앙값)", medians, failures)
+
+    # 시작 경로에서 미뤄 둔 모듈을 (간접적으로라도) 불러오면 경고
+    loaded = set(self_medians)
+    leaked = [name for name in DEFERRED_MODULES if name in loaded]
+    for name in leaked:
+        print(f"⚠️ 시작 경로에서 {name}을(를) 불러옵니다 - 처음 쓸 때 import하도록 옮겨야 합니다")
+
+    print(f"\n--- 자체 import 시간이 가장 긴 모듈 {top}개 ---")
+    for name, ms in sorted(self_medians.items(), key=lambda item: -item[1])[:top]:
+        print(f"{ms:9.1f}ms  {name}")
+
+    deferred, _, deferred_failures = measure(DEFERRED_MODULES, cwd, runs)
+    print_table("첫 사용 때로 미룬 모듈 (창을 띄운 뒤 작업 스레드에서 import)", deferred, deferred_failures)
+    return medians, deferred
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="python -X importtime으로 시작 시 모듈별 import 시간 측정")
+    arg_parser.add_argument('--main', default=os.path.join("clients", "main.py"),
+                            help="측정할 클라이언트의 main.py 경로 (그 폴더의 config 사용)")
+    arg_parser.add_argument('--runs', type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    arg_parser.add_argument('--top', type=int, default=10, help="자체 시간이 긴 모듈 표시 개수")
+    args = arg_parser.parse_args()
+    run_startup_benchmark(args.main, args.runs, args.top)
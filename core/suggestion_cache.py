@@ -0,0 +1,189 @@
+# suggestion_cache.py - 같은 대화 / 같은 설정으로 다시 생성할 때 API 호출 없이 이전 답변을 재사용하는 캐시
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+def normalize_conversation(content: str, last_messages: int = 20) -> str:
+    """대화 텍스트 정규화 (줄 앞뒤 / 중복 공백 정리, 빈 줄 제거 후 마지막 last_messages줄만 사용)
+
+    format_messages_for_gpt 결과는 메시지 하나가 한 줄이므로 마지막 N줄이 곧 마지막 N개 메시지입니다.
+    """
+    lines = [' '.join(line.split()) for line in content.split('\n')]
+    lines = [line for line in lines if line]
+    if last_messages > 0:
+        lines = lines[-last_messages:]
+    return '\n'.join(lines)
+
+
+def prompt_version(prompt: str) -> str:
+    """프롬프트 버전 (내용 해시, 프롬프트를 고치면 자동으로 다른 캐시 키가 됨)"""
+    return hashlib.blake2b(prompt.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def make_cache_key(model: str, prompt: str, tone: str, temperature: float, content: str,
+                   last_messages: int = 20) -> str:
+    """캐시 키: 모델 / 프롬프트 버전 / 톤 / temperature / 정규화한 마지막 N개 메시지의 해시"""
+    conversation = normalize_conversation(content, last_messages)
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in (model, prompt_version(prompt), tone, f"{temperature:g}", conversation):
+        hasher.update(part.encode('utf-8', 'surrogatepass'))
+        hasher.update(b'\0')
+    return hasher.hexdigest()
+
+
+class SuggestionCache:
+    """메모리 LRU + 만료 시간(TTL) 캐시, db_path를 주면 SQLite에도 저장해서 재시작 후에도 사용
+
+    작업 스레드에서 동시에 호출되므로 모든 접근은 lock으로 보호합니다.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # 키 → (만료 시각, 답변)
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._lock = threading.Lock()
+
+        self.db = None
+        if db_path:
+            try:
+                self.db = sqlite3.connect(db_path, check_same_thread=False)
+                self.db.execute("CREATE TABLE IF NOT EXISTS suggestions "
+                                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+                self.db.execute("DELETE FROM suggestions WHERE expires_at < ?", (time.time(),))
+                self.db.commit()
+            except sqlite3.Error as e:
+                print(f"답변 캐시 DB 열기 실패 (메모리 캐시만 사용): {e}")
+                self.db = None
+
+    def _lookup(self, key: str, now: float) -> Optional[str]:
+        entry = self.entries.get(key)
+        if entry:
+            if entry[0] >= now:
+                self.entries.move_to_end(key)
+                return entry[1]
+            del self.entries[key]
+
+        if self.db:
+            row = self.db.execute("SELECT value, expires_at FROM suggestions WHERE key = ?", (key,)).fetchone()
+            if row and row[1] >= now:
+                self.disk_hits += 1
+                self._remember(key, row[0], row[1])
+                return row[0]
+        return None
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """저장된 답변 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            value = self._lookup(key, time.time())
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def get_all(self, keys: List[str]) -> Optional[List[str]]:
+        """모든 키가 저장되어 있을 때만 답변 목록 반환 (한 번에 생성하는 모드용)"""
+        with self._lock:
+            now = time.time()
+            values = [self._lookup(key, now) for key in keys]
+            if all(value is not None for value in values):
+                self.hits += len(keys)
+                return values
+            self.misses += len(keys)
+            return None
+
+    def contains_all(self, keys: List[str]) -> bool:
+        """모든 키가 저장되어 있는지 확인 (적중/실패 횟수는 세지 않음)"""
+        with self._lock:
+            now = time.time()
+            return all(self._lookup(key, now) is not None for key in keys)
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            expires_at = time.time() + self.ttl_seconds
+            self._remember(key, value, expires_at)
+            if self.db:
+                try:
+                    self.db.execute("INSERT OR REPLACE INTO suggestions (key, value, expires_at) VALUES (?, ?, ?)",
+                                    (key, value, expires_at))
+                    self.db.commit()
+                except sqlite3.Error as e:
+                    print(f"답변 캐시 저장 실패: {e}")
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            if self.db:
+                self.db.execute("DELETE FROM suggestions")
+                self.db.commit()
+
+    def stats_text(self) -> str:
+        """상태 표시줄용 적중/실패 횟수"""
+        disk = f" (디스크 {self.disk_hits})" if self.disk_hits else ""
+        return f"캐시 적중 {self.hits}{disk} / 실패 {self.misses}"
+
+    def close(self):
+        with self._lock:
+            if self.db:
+                self.db.close()
+                self.db = None
+
+
+# 사용 예시 및 테스트 함수
+def test_suggestion_cache():
+    """정규화 / LRU / 만료 / SQLite 재시작 테스트"""
+    import os
+    import tempfile
+
+    content = "김철수 [오후 2:30]: 저녁 뭐 먹지\n\n  이영희 [오후 2:31]:   치킨  \n"
+    key = make_cache_key("model", "prompt", "긍정적", 0.8, content)
+    assert key == make_cache_key("model", "prompt", "긍정적", 0.8, "김철수 [오후 2:30]: 저녁 뭐 먹지\n이영희 [오후 2:31]: 치킨")
+    assert key != make_cache_key("model", "prompt", "부정적", 0.8, content)
+    assert key != make_cache_key("model", "prompt v2", "긍정적", 0.8, content)
+    assert key != make_cache_key("model", "prompt", "긍정적", 0.5, content)
+
+    # 마지막 N개 메시지만 키에 사용
+    older = "박민수 [오후 1:00]: 예전 얘기\n" + content
+    assert make_cache_key("model", "prompt", "긍정적", 0.8, older, last_messages=2) == key
+
+    cache = SuggestionCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", "ㅇㅇ")
+    cache.put("b", "ㄴㄴ")
+    assert cache.get("a") == "ㅇㅇ"
+    cache.put("c", "음...")  # 가장 오래 안 쓴 b가 빠짐
+    assert cache.get("b") is None
+    assert cache.get_all(["a", "c"]) == ["ㅇㅇ", "음..."]
+
+    cache.ttl_seconds = -1
+    cache.put("d", "만료")
+    assert cache.get("d") is None
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "cache.sqlite3")
+        cache = SuggestionCache(db_path=db_path)
+        cache.put(key, "ㅇㅇ 좋지 ㅋㅋ")
+        cache.close()
+
+        restarted = SuggestionCache(db_path=db_path)
+        assert restarted.get(key) == "ㅇㅇ 좋지 ㅋㅋ"
+        assert restarted.disk_hits == 1
+        print(f"답변 캐시 테스트 통과 ({restarted.stats_text()})")
+        restarted.close()
+
+
+if __name__ == "__main__":
+    test_suggestion_cache()
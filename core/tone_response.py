@@ -0,0 +1,258 @@
+# tone_response.py - 긍정/중립/부정 답변을 한 번에 요청하는 프롬프트와 모델 응답 파서
+
+import json
+import re
+import time
+from typing import List, Optional
+
+from .tone_runner import TONES
+
+# 톤별 설명 (한 번에 요청할 때 프롬프트에 사용)
+TONE_DESCRIPTIONS = {
+    "긍정적": "밝고 적극적인 반응",
+    "중립적": "균형잡힌 무난한 반응",
+    "부정적": "조심스럽거나 소극적인 반응",
+}
+
+# 모델이 JSON 키로 쓸 수 있는 톤 이름 (앞 두 글자 / 영어)
+TONE_ALIASES = {
+    "긍정적": ("긍정", "positive", "pos"),
+    "중립적": ("중립", "neutral", "neu"),
+    "부정적": ("부정", "negative", "neg"),
+}
+
+# 답변 앞에 붙는 설명 (번호, 이모지, "긍정적인 답변:", "답변:", "[오후 2:30]" 등)
+_NUMBER_PREFIX = re.compile(r'^\s*(?:[0-9]+[.)]|[-*•])\s*')
+_EMOJI_PREFIX = re.compile(r'^[😊😐😔]\s*')
+_LABEL_PREFIX = re.compile(
+    r'^(?:(?:긍정|중립|부정)\w*\s*(?:답변)?|답변|추천\s*답변|고경우(?:의\s*답변)?)\s*[:：]\s*'
+)
+_TONE_ANSWER_PREFIX = re.compile(r'^(?:긍정적인|부정적인|중립적인).*?답변[:：\s]*')
+_TIME_PREFIX = re.compile(r'^\[(?:오전|오후)\s*\d{1,2}:\d{2}\]\s*')
+_QUOTES = ('"', "'", '“', '”', '‘', '’')
+
+# 구분자 형식 ("긍정: ..." 한 줄씩) 파싱용
+_DELIMITED_LINE = re.compile(
+    r'^\s*(?:[0-9]+[.)]\s*)?(?:[😊😐😔]\s*)?(긍정|중립|부정)\S*\s*(?:답변)?\s*[:：\-]\s*(.+?)\s*$'
+)
+
+
+def build_combined_instruction(tones: Optional[List[str]] = None) -> str:
+    """톤마다 답변 하나씩을 JSON 한 개로 받기 위한 지시문"""
+    tones = tones or TONES
+    schema = json.dumps({tone: f"{TONE_DESCRIPTIONS.get(tone, tone)}의 답변" for tone in tones}, ensure_ascii=False)
+    return (f"🎯 {'/'.join(tones)} 답변을 하나씩 만들어 아래 JSON 형식으로만 답해주세요 "
+            f"(설명, 코드 블록, 다른 텍스트 금지):\n{schema}")
+
+
+def _clean_line(line: str) -> str:
+    line = _NUMBER_PREFIX.sub('', line.strip())
+    line = _EMOJI_PREFIX.sub('', line)
+    line = _TONE_ANSWER_PREFIX.sub('', line)
+    line = _LABEL_PREFIX.sub('', line)
+    line = _TIME_PREFIX.sub('', line).strip()
+
+    # 답변 전체를 감싼 따옴표 제거
+    if len(line) >= 2 and line[0] in _QUOTES and line[-1] in _QUOTES:
+        line = line[1:-1].strip()
+    return line
+
+
+def clean_suggestion(text: str, fallback: str = "음...") -> str:
+    """모델 답변에서 번호/톤 설명/따옴표를 떼고 내용이 있는 첫 번째 줄만 반환 (없으면 fallback)
+
+    "긍정적인 답변:"처럼 설명만 있는 줄은 건너뜁니다.
+    """
+    for line in (text or "").split('\n'):
+        line = _clean_line(line)
+        if line:
+            return line
+    return fallback
+
+
+class FirstLineStream:
+    """스트리밍 응답 조각을 모아서 답변으로 쓸 첫 줄이 완성되면 done이 됨
+
+    clean_suggestion은 첫 줄만 쓰므로 done 이후의 토큰은 받을 필요가 없습니다 (스트림을 바로 닫음).
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.line = ""
+        self.done = False
+
+    def feed(self, delta: str) -> str:
+        """조각 추가 후 지금까지의 (표시용) 답변 반환"""
+        self.buffer += delta
+        while not self.done and '\n' in self.buffer:
+            line, self.buffer = self.buffer.split('\n', 1)
+            self.line = _clean_line(line)
+            self.done = bool(self.line)
+        return self.line if self.done else _clean_line(self.buffer)
+
+    def result(self, fallback: str = "음...") -> str:
+        if self.done:
+            return self.line
+        return _clean_line(self.buffer) or fallback
+
+
+def _match_tone(key: str, tones: List[str]) -> Optional[str]:
+    key = key.strip().lower()
+    for tone in tones:
+        if key == tone or key.startswith(TONE_ALIASES.get(tone, (tone,))):
+            return tone
+    return None
+
+
+def _strip_code_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else ''
+        text = text.rsplit('```', 1)[0]
+    return text.strip()
+
+
+def _parse_json(text: str, tones: List[str]) -> Optional[List[str]]:
+    """JSON 객체({"긍정적": ...}) 또는 배열(["...", "...", "..."]) 형식 파싱"""
+    for open_char, close_char in (('{', '}'), ('[', ']')):
+        start, end = text.find(open_char), text.rfind(close_char)
+        if start < 0 or end <= start:
+            continue
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            continue
+
+        # {"suggestions": [...]} 처럼 배열을 감싼 경우
+        if isinstance(data, dict) and len(data) == 1:
+            inner = next(iter(data.values()))
+            if isinstance(inner, (list, dict)):
+                data = inner
+
+        if isinstance(data, list):
+            values = [item for item in data if isinstance(item, str)]
+            if len(values) >= len(tones):
+                return values[:len(tones)]
+        elif isinstance(data, dict):
+            found = {}
+            for key, value in data.items():
+                tone = _match_tone(str(key), tones)
+                if tone and isinstance(value, str) and tone not in found:
+                    found[tone] = value
+            if len(found) == len(tones):
+                return [found[tone] for tone in tones]
+    return None
+
+
+def _parse_delimited(text: str, tones: List[str]) -> Optional[List[str]]:
+    """"긍정: ...", "2. 중립적인 답변: ..." 처럼 한 줄에 하나씩 적은 형식 파싱"""
+    found = {}
+    for line in text.split('\n'):
+        match = _DELIMITED_LINE.match(line)
+        if match:
+            tone = _match_tone(match.group(1), tones)
+            if tone and tone not in found:
+                found[tone] = match.group(2)
+    if len(found) == len(tones):
+        return [found[tone] for tone in tones]
+    return None
+
+
+def parse_multi_tone_response(text: str, tones: Optional[List[str]] = None) -> Optional[List[str]]:
+    """한 번에 요청한 모델 응답에서 톤 순서대로 답변 목록 반환 (톤 하나라도 못 찾으면 None)"""
+    tones = tones or TONES
+    if not text:
+        return None
+
+    body = _strip_code_fence(text)
+    values = _parse_json(body, tones) or _parse_delimited(body, tones)
+    if values is None:
+        return None
+
+    suggestions = [clean_suggestion(value, fallback="") for value in values]
+    if not all(suggestions):
+        return None
+    return suggestions
+
+
+# 사용 예시 및 테스트 함수
+def test_parse_multi_tone_response():
+    """여러 응답 형식 파싱 테스트"""
+    expected = ["ㅇㅇ 좋지 ㅋㅋ", "음... 그냥그냥", "ㄴㄴ 싫어"]
+    samples = [
+        '{"긍정적": "ㅇㅇ 좋지 ㅋㅋ", "중립적": "음... 그냥그냥", "부정적": "ㄴㄴ 싫어"}',
+        '```json\n{"positive": "ㅇㅇ 좋지 ㅋㅋ", "neutral": "음... 그냥그냥", "negative": "ㄴㄴ 싫어"}\n```',
+        '답변입니다:\n{"긍정": "\\"ㅇㅇ 좋지 ㅋㅋ\\"", "중립": "음... 그냥그냥", "부정": "ㄴㄴ 싫어"}',
+        '{"suggestions": ["ㅇㅇ 좋지 ㅋㅋ", "음... 그냥그냥", "ㄴㄴ 싫어"]}',
+        '1. 긍정적인 답변: ㅇㅇ 좋지 ㅋㅋ\n2. 중립적인 답변: 음... 그냥그냥\n3. 부정적인 답변: ㄴㄴ 싫어',
+        '😊 긍정: ㅇㅇ 좋지 ㅋㅋ\n😐 중립: 음... 그냥그냥\n😔 부정: ㄴㄴ 싫어',
+    ]
+    for sample in samples:
+        assert parse_multi_tone_response(sample) == expected, sample
+
+    # 톤이 빠졌거나 형식이 없는 응답은 None (톤별 요청으로 대체)
+    assert parse_multi_tone_response('{"긍정적": "ㅇㅇ", "중립적": "음"}') is None
+    assert parse_multi_tone_response('ㅇㅇ 좋지 ㅋㅋ') is None
+    assert parse_multi_tone_response('{"긍정적": "ㅇㅇ", "중립적": "", "부정적": "ㄴㄴ"}') is None
+
+    # 한 톤 답변 정리 (시간이 들어간 답변은 그대로 유지)
+    assert clean_suggestion("긍정적인 답변: ㅇㅇ 좋지") == "ㅇㅇ 좋지"
+    assert clean_suggestion("1. 오후 3:30에 보자\n설명...") == "오후 3:30에 보자"
+    assert clean_suggestion("[오후 2:30] ㄱㄱ") == "ㄱㄱ"
+    assert clean_suggestion("  ") == "음..."
+    assert clean_suggestion("긍정적인 답변:\nㅇㅇ 좋지") == "ㅇㅇ 좋지"
+
+    # 스트리밍: 첫 줄이 완성되면 done
+    stream = FirstLineStream()
+    for delta in ["긍정적인 답변:", "\n", "ㅇㅇ ", "좋지", " ㅋㅋ\n설명", "..."]:
+        stream.feed(delta)
+        if stream.done:
+            break
+    assert stream.done and stream.result() == "ㅇㅇ 좋지 ㅋㅋ"
+    print(f"응답 파싱 테스트 통과 ({len(samples)}개 형식)")
+
+
+def benchmark_generation_modes(latency: float = 0.5, message_count: int = 200):
+    """가짜 LLM 서버로 톤별 3번 호출과 한 번 호출의 요청 수 / 전송량 / 소요 시간 비교"""
+    from .fake_llm_server import FakeLLMServer
+    from .tone_runner import ToneRunner
+
+    base_prompt = "당신은 카카오톡 대화에 대한 자연스럽고 적절한 답변을 추천해주는 도우미입니다. " * 10
+    content = "\n".join(f"[김철수] [오후 2:{i % 60:02d}] 오늘 저녁에 뭐 먹을지 정했어? {i}" for i in range(message_count))
+    combined_reply = json.dumps({"긍정적": "ㅇㅇ 좋지 ㅋㅋ", "중립적": "음... 그냥그냥", "부정적": "ㄴㄴ 싫어"},
+                                ensure_ascii=False)
+
+    with FakeLLMServer(latency=latency) as server:
+        server.tone_replies = {"all": combined_reply}
+
+        start = time.perf_counter()
+        separate = ToneRunner().run(
+            lambda tone: server.request(tone, prompt=f"{base_prompt}\n\n{TONE_DESCRIPTIONS[tone]}\n\n{content}"),
+            lambda index, tone, text: None)
+        separate_time = time.perf_counter() - start
+        separate_requests, separate_bytes = server.request_count, server.received_bytes
+
+        def run_combined():
+            server.request_count = server.received_bytes = 0
+            start = time.perf_counter()
+            suggestions = ToneRunner().run_combined(
+                lambda: parse_multi_tone_response(
+                    server.request("all", prompt=f"{base_prompt}\n\n{build_combined_instruction()}\n\n{content}")),
+                lambda tone: server.request(tone, prompt=f"{base_prompt}\n\n{TONE_DESCRIPTIONS[tone]}\n\n{content}"),
+                lambda index, tone, text: None)
+            return suggestions, time.perf_counter() - start, server.request_count, server.received_bytes
+
+        combined, combined_time, combined_requests, combined_bytes = run_combined()
+
+        # 모델이 형식을 지키지 않은 경우: 톤별 호출로 대체되어 한 번 더 기다림
+        server.tone_replies = {}
+        fallback, fallback_time, fallback_requests, fallback_bytes = run_combined()
+
+    print(f"톤별 호출: 요청 {separate_requests}번, 전송 {separate_bytes / 1024:.1f}KB, {separate_time:.2f}초 → {separate}")
+    print(f"한 번 호출: 요청 {combined_requests}번, 전송 {combined_bytes / 1024:.1f}KB, {combined_time:.2f}초 → {combined}")
+    print(f"해석 실패 후 대체: 요청 {fallback_requests}번, 전송 {fallback_bytes / 1024:.1f}KB, {fallback_time:.2f}초 → {fallback}")
+
+
+if __name__ == "__main__":
+    test_parse_multi_tone_response()
+    benchmark_generation_modes()
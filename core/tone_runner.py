@@ -0,0 +1,171 @@
+# tone_runner.py - 긍정/중립/부정 답변 요청을 동시에 실행하고 도착하는 대로 전달
+
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, TimeoutError as FutureTimeoutError, wait
+from typing import Callable, List, Optional
+
+# 답변 톤 (버튼 순서와 같음)
+TONES = ["긍정적", "중립적", "부정적"]
+
+# 시간 초과 / 오류 시 사용할 기본 답변
+FALLBACK_SUGGESTION = "음..."
+
+
+class ToneRunner:
+    """톤별 답변 생성 함수를 스레드 풀에서 동시에 실행
+
+    결과는 run을 호출한 스레드에서 on_result로 도착 순서대로 전달하며,
+    UI 스레드에서 호출할 때는 pump(예: QApplication.processEvents)를 주면 기다리는 동안 주기적으로 호출합니다.
+    톤별 timeout을 넘기면 해당 톤만 fallback 답변으로 채우고 나머지는 계속 기다립니다.
+    """
+
+    def __init__(self, max_workers: int = 3, timeout: float = 20.0, fallback: str = FALLBACK_SUGGESTION,
+                 poll_interval: float = 0.05):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.fallback = fallback
+        self.poll_interval = poll_interval
+
+    def run(self, generate: Callable[[str], str], on_result: Callable[[int, str, str], None],
+            tones: Optional[List[str]] = None, pump: Optional[Callable[[], None]] = None,
+            should_stop: Optional[Callable[[], bool]] = None, deadline: Optional[float] = None) -> List[str]:
+        """tones마다 generate(tone)를 실행하고 on_result(index, tone, 답변)를 호출, 톤 순서대로 답변 목록 반환
+
+        should_stop()이 True가 되면 남은 요청은 기다리지 않고 바로 반환합니다 (on_result도 호출하지 않음).
+        deadline(time.monotonic() 기준)을 주면 지금부터 timeout 대신 그 시각까지만 기다립니다.
+        """
+        tones = tones or TONES
+        results = [self.fallback] * len(tones)
+        if deadline is None:
+            deadline = time.monotonic() + self.timeout
+
+        # 시간 초과된 요청을 기다리지 않도록 with 대신 shutdown(wait=False) 사용
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            pending = {executor.submit(generate, tone): index for index, tone in enumerate(tones)}
+
+            while pending:
+                if should_stop and should_stop():
+                    for future in pending:
+                        future.cancel()
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # 남은 톤은 기본 답변으로 대체
+                    for future, index in pending.items():
+                        future.cancel()
+                        print(f"{tones[index]} 답변 시간 초과 - 기본 답변 사용")
+                        on_result(index, tones[index], self.fallback)
+                    break
+
+                done, _ = wait(pending, timeout=min(self.poll_interval, remaining), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        results[index] = future.result() or self.fallback
+                    except Exception as e:
+                        print(f"{tones[index]} 답변 생성 오류: {e}")
+                    on_result(index, tones[index], results[index])
+
+                if pump:
+                    pump()
+        finally:
+            executor.shutdown(wait=False)
+
+        return results
+
+    def run_combined(self, generate_all: Callable[[], Optional[List[str]]], generate: Callable[[str], str],
+                     on_result: Callable[[int, str, str], None], tones: Optional[List[str]] = None,
+                     pump: Optional[Callable[[], None]] = None,
+                     should_stop: Optional[Callable[[], bool]] = None) -> List[str]:
+        """generate_all()로 모든 톤 답변을 한 번에 받고, 실패하면 톤별 run으로 대체
+
+        generate_all은 톤 순서대로 답변 목록을 반환하며, None 반환 / 예외 / 시간 초과를 실패로 봅니다.
+        톤별 run은 남은 시간만 기다리므로 전체가 timeout을 넘지 않습니다.
+        """
+        tones = tones or TONES
+        suggestions = None
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(generate_all)
+            deadline = time.monotonic() + self.timeout
+
+            while True:
+                if should_stop and should_stop():
+                    future.cancel()
+                    return [self.fallback] * len(tones)
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    future.cancel()
+                    print(f"한 번에 답변 생성 시간 초과 ({self.timeout:.0f}초)")
+                    break
+
+                try:
+                    suggestions = future.result(timeout=min(self.poll_interval, remaining))
+                    break
+                except FutureTimeoutError:
+                    pass
+                except Exception as e:
+                    print(f"한 번에 답변 생성 오류: {e}")
+                    break
+                finally:
+                    if pump:
+                        pump()
+        finally:
+            executor.shutdown(wait=False)
+
+        if suggestions and len(suggestions) == len(tones):
+            for index, tone in enumerate(tones):
+                on_result(index, tone, suggestions[index])
+            return list(suggestions)
+
+        if time.monotonic() >= deadline:
+            # 남은 시간이 없으면 톤별 요청을 보내지 않고 기본 답변 사용
+            for index, tone in enumerate(tones):
+                on_result(index, tone, self.fallback)
+            return [self.fallback] * len(tones)
+
+        print("한 번에 받은 답변을 해석하지 못함 - 톤별 요청으로 대체")
+        return self.run(generate, on_result, tones, pump, should_stop, deadline)
+
+
+# 사용 예시 및 벤치마크 함수
+def benchmark_tone_runner(latency: float = 0.5):
+    """가짜 LLM 서버로 순차 호출과 동시 호출의 전체 소요 시간 비교"""
+    from .fake_llm_server import FakeLLMServer
+
+    with FakeLLMServer(latency=latency) as server:
+        start = time.perf_counter()
+        for tone in TONES:
+            server.request(tone)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        arrivals = []
+        ToneRunner().run(server.request, lambda index, tone, text: arrivals.append(time.perf_counter() - start))
+        concurrent = time.perf_counter() - start
+
+        # 한 톤만 느린 경우: 그 톤만 기본 답변으로 대체되고 나머지는 바로 도착
+        server.slow_tones = {"부정적": latency * 10}
+        start = time.perf_counter()
+        slow_results = ToneRunner(timeout=latency * 2).run(server.request, lambda index, tone, text: None)
+        slow = time.perf_counter() - start
+
+        # 한 번에 받기가 실패한 뒤 톤별 요청으로 대체해도 전체가 timeout 안에 끝남
+        start = time.perf_counter()
+        ToneRunner(timeout=latency * 2).run_combined(lambda: time.sleep(latency), server.request,
+                                                     lambda index, tone, text: None)
+        combined_fallback = time.perf_counter() - start
+        assert combined_fallback < latency * 2.5
+
+    print(f"순차 호출: {sequential:.2f}초")
+    print(f"동시 호출: {concurrent:.2f}초 (도착: {', '.join(f'{t:.2f}' for t in arrivals)}초)")
+    print(f"느린 톤 시간 초과: {slow:.2f}초 → {slow_results}")
+    print(f"한 번에 받기 실패 후 톤별 대체: {combined_fallback:.2f}초 (제한 {latency * 2:.2f}초)")
+
+
+if __name__ == "__main__":
+    benchmark_tone_runner()
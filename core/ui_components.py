@@ -1,10 +1,10 @@
-# ui_components.py - UI 컴포넌트 생성 및 관리
+# ui_components.py - UI 컴포넌트 생성 및 관리 (문구 / 색상은 실행한 폴더 config의 THEME)
 
 from PyQt5.QtWidgets import (QFrame, QHBoxLayout, QVBoxLayout, QLabel,
                              QPushButton, QComboBox, QTextEdit)
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
-from config import COLORS, STYLES
+from config import COLORS, STYLES, THEME
 
 
 class UIComponents:
@@ -17,7 +17,7 @@ class UIComponents:
         title_frame.setStyleSheet(STYLES['title_frame'])
         title_layout = QHBoxLayout(title_frame)
 
-        title_label = QLabel("카카오톡 답변 도우미")
+        title_label = QLabel(THEME['title'])
         title_label.setFont(QFont("맑은 고딕", 10, QFont.Bold))
         title_label.setStyleSheet(f"color: #3C1E1E; padding: 5px;")
 
@@ -50,6 +50,14 @@ class UIComponents:
         status_label.setStyleSheet(f"color: {COLORS['text_light']}; font-size: 10px; padding: 5px;")
         return status_label
 
+    @staticmethod
+    def create_debug_stats_label():
+        """디버그 통계 라벨 생성 (HTTP 연결 재사용 등)"""
+        stats_label = QLabel("")
+        stats_label.setWordWrap(True)
+        stats_label.setStyleSheet(f"color: {COLORS['text_light']}; font-size: 9px; padding: 2px 5px;")
+        return stats_label
+
     @staticmethod
     def create_window_selection_frame():
         """창 선택 영역 생성"""
@@ -88,17 +96,13 @@ class UIComponents:
     def create_chat_text_area():
         """대화 내용 입력 영역 생성"""
         chat_text = QTextEdit()
-        chat_text.setPlaceholderText(
-            "1. 카카오톡 창을 선택하세요\n"
-            "2. '대화 가져오기' 버튼을 클릭하세요\n"
-            "3. 답변을 생성하고 선택하세요"
-        )
+        chat_text.setPlaceholderText(THEME['chat_placeholder'])
         chat_text.setStyleSheet(STYLES['chat_text'])
         return chat_text
 
     @staticmethod
-    def create_button_layout():
-        """버튼 레이아웃 생성"""
+    def create_button_layout(provider_label=""):
+        """버튼 레이아웃 생성 (답변 생성 버튼 문구의 {provider}는 사용 중인 백엔드 이름)"""
         layout = QVBoxLayout()
 
         # 상단 버튼들
@@ -145,12 +149,12 @@ class UIComponents:
         layout.addLayout(top_layout)
 
         # 답변 생성 버튼
-        generate_btn = QPushButton("🤖 답변 추천 받기")
+        generate_btn = QPushButton(THEME['generate_button'].format(provider=provider_label))
         generate_btn.setFont(QFont("맑은 고딕", 11, QFont.Bold))
         generate_btn.setStyleSheet(f"""
             QPushButton {{
-                background-color: {COLORS['primary']};
-                color: #3C1E1E;
+                background-color: {THEME['generate_color']};
+                color: {THEME['generate_text_color']};
                 font-weight: bold;
                 border: none;
                 border-radius: 8px;
@@ -158,7 +162,7 @@ class UIComponents:
                 margin-top: 5px;
             }}
             QPushButton:hover {{
-                background-color: {COLORS['primary_hover']};
+                background-color: {THEME['generate_hover']};
             }}
         """)
         layout.addWidget(generate_btn)
@@ -173,7 +177,7 @@ class UIComponents:
         frame.setStyleSheet(f"""
             QFrame {{
                 background-color: {COLORS['white']};
-                border: 1px solid {COLORS['border']};
+                border: {THEME['suggestion_frame_border']};
                 border-radius: 8px;
                 padding: 8px;
             }}
@@ -181,35 +185,29 @@ class UIComponents:
 
         layout = QVBoxLayout(frame)
 
-        title = QLabel("💬 고경우 답변 추천 (클릭하여 전송)")
+        title = QLabel(THEME['suggestion_title'])
         title.setFont(QFont("맑은 고딕", 9, QFont.Bold))
-        title.setStyleSheet(f"color: {COLORS['text']}; margin-bottom: 5px;")
+        title.setStyleSheet(f"color: {THEME['suggestion_title_color']}; margin-bottom: 5px;")
         layout.addWidget(title)
 
-        # 추천 답변 버튼들
+        # 추천 답변 버튼들 (긍정 / 중립 / 부정)
         suggestion_buttons = []
-        button_configs = [
-            ("😊", "#E6FFFA"),  # 민트색 - 긍정
-            ("😐", "#F0F9FF"),  # 연한 파란색 - 중립
-            ("😔", "#FFF5E6"),  # 연한 주황색 - 부정
-        ]
-
-        for i, (emoji, color) in enumerate(button_configs):
-            btn = QPushButton(f"{emoji} 답변 생성 중...")
+        for emoji, color in zip(("😊", "😐", "😔"), THEME['suggestion_colors']):
+            btn = QPushButton(f"{emoji} {THEME['loading_text']}")
             btn.setFont(QFont("맑은 고딕", 9))
             btn.setStyleSheet(f"""
                 QPushButton {{
                     background-color: {color};
                     color: {COLORS['text']};
-                    border: 1px solid #E2E8F0;
+                    border: 1px solid {THEME['suggestion_border']};
                     border-radius: 6px;
                     padding: 10px;
                     text-align: left;
                     margin: 2px;
                 }}
                 QPushButton:hover {{
-                    background-color: #CBD5E0;
-                    border-color: #A0AEC0;
+                    background-color: {THEME['suggestion_hover']};
+                    border-color: {THEME['suggestion_hover_border']};
                 }}
             """)
             layout.addWidget(btn)
@@ -238,5 +236,6 @@ class UIComponents:
             QWidget {{
                 background-color: rgba(255, 255, 255, 240);
                 border-radius: 10px;
+                {THEME['window_style']}
             }}
-        """)
\ No newline at end of file
+        """)
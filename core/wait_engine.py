@@ -0,0 +1,218 @@
+# wait_engine.py - 고정 sleep 대신 실제 상태(포커스 / 클립보드 변경 등)를 확인하며 기다리는 대기 엔진
+
+import json
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional
+
+
+class WaitStats:
+    """대기 이름별로 실제 걸린 시간 기록 (최근 history개)"""
+
+    def __init__(self, history: int = 50):
+        self.samples = deque(maxlen=history)
+        self.timeouts = 0
+        self.fallbacks = 0  # 상태를 확인할 수 없어 기본 시간만큼 기다린 횟수
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, ratio: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * ratio), len(ordered) - 1)]
+
+
+class WaitEngine:
+    """조건이 참이 될 때까지 짧은 간격(점점 늘어남)으로 확인하며 기다림
+
+    DELAYS의 값은 최대 대기 시간(상한)으로 사용합니다. 성공한 대기 시간을 기록해서
+    상한을 "최근 95% 지점 x timeout_margin"으로 줄여 가므로, 잘 안 되는 환경에서는 빨리 포기하고
+    느린 환경에서는 설정값까지 기다립니다. 조건이 None을 반환하면 상태를 확인할 수 없는 것으로 보고
+    기본 시간만큼 기다립니다. adaptive=False면 예전처럼 기본 시간만큼 sleep한 뒤 한 번만 확인합니다.
+    fixed_limits에 넣은 대기(예: 포커스처럼 시간 초과가 곧 동작 실패인 대기)는 상한을 줄이지 않고 항상 설정값까지 기다립니다.
+    """
+
+    def __init__(self, defaults: Dict[str, float], adaptive: bool = True, initial_poll: float = 0.005,
+                 max_poll: float = 0.02, backoff: float = 1.5, timeout_margin: float = 3.0,
+                 min_timeout: float = 0.05, history: int = 50, fixed_limits: Iterable[str] = (),
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.defaults = dict(defaults)
+        self.adaptive = adaptive
+        self.initial_poll = initial_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.timeout_margin = timeout_margin
+        self.min_timeout = min_timeout
+        self.history = history
+        self.fixed_limits = frozenset(fixed_limits)
+        self.clock = clock
+        self.sleep = sleep
+        self.stats: Dict[str, WaitStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, name: str) -> WaitStats:
+        with self._lock:
+            if name not in self.stats:
+                self.stats[name] = WaitStats(self.history)
+            return self.stats[name]
+
+    def default(self, name: str) -> float:
+        return self.defaults.get(name, 0.2)
+
+    def timeout(self, name: str) -> float:
+        """현재 최대 대기 시간 (기록이 충분하면 관측값 기준으로 줄어들고, 설정값을 넘지 않음)"""
+        limit = self.default(name)
+        stats = self._stats(name)
+        if name in self.fixed_limits or len(stats.samples) < 5:
+            return limit
+        tuned = stats.percentile(0.95) * self.timeout_margin
+        return min(limit, max(tuned, self.min_timeout))
+
+    def wait_for(self, name: str, condition: Callable[[], Optional[bool]],
+                 should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """condition()이 True가 될 때까지 대기 (시간 초과 / 중단이면 False)"""
+        stats = self._stats(name)
+        start = self.clock()
+
+        if not self.adaptive:
+            self.sleep(self.default(name))
+            return condition() is not False
+
+        deadline = start + self.timeout(name)
+        poll = self.initial_poll
+        while True:
+            result = condition()
+            if result is None:
+                # 상태를 확인할 수 없는 대기 → 기본 시간만큼 (남은 시간만) 기다림
+                stats.fallbacks += 1
+                remaining = start + self.default(name) - self.clock()
+                if remaining > 0:
+                    self.sleep(remaining)
+                return True
+            if result:
+                stats.record(self.clock() - start)
+                return True
+            if should_stop and should_stop():
+                return False
+            now = self.clock()
+            if now >= deadline:
+                stats.timeouts += 1
+                stats.samples.clear()  # 환경이 느려졌을 수 있으므로 다시 설정값까지 기다림
+                return False
+            self.sleep(min(poll, deadline - now))
+            poll = min(poll * self.backoff, self.max_poll)
+
+    def settle(self, name: str):
+        """확인할 상태가 없는 동작 뒤 기본 시간만큼 대기"""
+        self.wait_for(name, lambda: None)
+
+    def stats_text(self) -> str:
+        """대기 이름별 횟수 / 중앙값 / 95% / 현재 상한 / 시간 초과 횟수"""
+        lines = []
+        for name, stats in sorted(self.stats.items()):
+            if stats.samples:
+                median = statistics.median(stats.samples) * 1000
+                p95 = stats.percentile(0.95) * 1000
+                lines.append(f"{name}: {len(stats.samples)}회 중앙값 {median:.0f}ms / 95% {p95:.0f}ms / "
+                             f"상한 {self.timeout(name) * 1000:.0f}ms / 시간 초과 {stats.timeouts}회")
+            elif stats.timeouts or stats.fallbacks:
+                lines.append(f"{name}: 시간 초과 {stats.timeouts}회 / 고정 대기 {stats.fallbacks}회")
+        return "\n".join(lines) if lines else "대기 기록 없음"
+
+    def save(self, path: str):
+        """관측한 대기 시간을 파일에 저장 (다음 실행에서도 조정된 상한 사용)"""
+        with self._lock:
+            data = {name: list(stats.samples) for name, stats in self.stats.items() if stats.samples}
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"대기 기록 저장 실패: {e}")
+
+    def load(self, path: str):
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"대기 기록 불러오기 실패: {e}")
+            return
+        for name, samples in data.items():
+            stats = self._stats(name)
+            for seconds in samples:
+                stats.record(float(seconds))
+
+
+class SimulatedClock:
+    """테스트용 가상 시계 (sleep하면 실제로 기다리지 않고 시간만 앞으로 감)"""
+
+    def __init__(self):
+        self.current = 0.0
+        self.slept = 0.0
+
+    def now(self) -> float:
+        return self.current
+
+    def sleep(self, seconds: float):
+        seconds = max(seconds, 0.0)
+        self.current += seconds
+        self.slept += seconds
+
+
+# 사용 예시 및 테스트 함수
+def test_wait_engine():
+    """가상 시계로 조건 대기 / 시간 초과 / 상한 자동 조정 테스트"""
+    clock = SimulatedClock()
+    engine = WaitEngine({'focus_wait': 0.3}, clock=clock.now, sleep=clock.sleep)
+
+    # 0.04초 뒤에 포커스가 바뀌는 창
+    for _ in range(10):
+        ready_at = clock.now() + 0.04
+        assert engine.wait_for('focus_wait', lambda: clock.now() >= ready_at)
+    stats = engine.stats['focus_wait']
+    assert all(0.04 <= seconds < 0.06 for seconds in stats.samples)
+    assert engine.timeout('focus_wait') < 0.3  # 관측값 기준으로 상한이 줄어듦
+    print(f"포커스 대기 {len(stats.samples)}회 평균 {clock.slept / 10 * 1000:.0f}ms (고정 대기 300ms)")
+
+    # 상한을 고정한 대기는 빨리 끝나도 설정값까지 기다림
+    fixed_focus = WaitEngine({'focus_wait': 0.3}, fixed_limits=('focus_wait',), clock=clock.now, sleep=clock.sleep)
+    for _ in range(10):
+        assert fixed_focus.wait_for('focus_wait', lambda: True)
+    assert fixed_focus.timeout('focus_wait') == 0.3
+
+    # 끝나지 않는 조건은 상한에서 포기하고, 다음에는 다시 설정값까지 기다림
+    assert not engine.wait_for('focus_wait', lambda: False)
+    assert engine.timeout('focus_wait') == 0.3
+
+    # 확인할 수 없는 조건은 기본 시간만큼 대기
+    before = clock.now()
+    engine.settle('paste_wait')
+    assert abs(clock.now() - before - 0.2) < 1e-9
+
+    # 예전 방식 (고정 sleep)
+    fixed = WaitEngine({'focus_wait': 0.3}, adaptive=False, clock=clock.now, sleep=clock.sleep)
+    before = clock.now()
+    assert fixed.wait_for('focus_wait', lambda: True)
+    assert abs(clock.now() - before - 0.3) < 1e-9
+    print(engine.stats_text())
+
+    # 저장 후 다시 불러오면 조정된 상한 유지
+    import os
+    import tempfile
+    for _ in range(5):
+        engine.wait_for('copy_wait', lambda: True)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "wait_stats.json")
+        engine.save(path)
+        restarted = WaitEngine({'copy_wait': 0.5})
+        restarted.load(path)
+        assert restarted.timeout('copy_wait') == engine.timeout('copy_wait') == 0.05
+
+
+if __name__ == "__main__":
+    test_wait_engine()
@@ -0,0 +1,325 @@
+from config import (DELAYS, CHAT_AREA_POSITIONS, INPUT_AREA_POSITIONS, ADAPTIVE_WAITS, WAIT_POLL_INITIAL,
+                    WAIT_POLL_MAX, WAIT_TIMEOUT_MARGIN, WAIT_STATS_FILE, TYPE_CHUNK_UNITS)
+from .automation import create_default_automation
+from .wait_engine import WaitEngine
+
+
+class SafeWindowHandler:
+    """안전한 윈도우 핸들링 클래스
+
+    고정 시간 sleep 대신 실제 상태(포커스가 옮겨졌는지, 클립보드가 바뀌었는지, 선택이 되었는지)를
+    대기 엔진으로 확인합니다. 자동화 백엔드는 처음 쓸 때 만들고, 테스트에서는 set_automation으로 바꿉니다.
+    """
+
+    automation = None
+    waits = None
+    # 시간 초과가 곧 입력 실패(다른 창에 입력될 수 있어 중단)이므로 관측값으로 상한을 줄이지 않는 대기
+    FIXED_WAIT_LIMITS = ('focus_wait',)
+
+    @classmethod
+    def set_automation(cls, backend, waits=None):
+        """자동화 백엔드 / 대기 엔진 교체 (가상 백엔드 테스트용)"""
+        cls.automation = backend
+        cls.waits = waits
+
+    @classmethod
+    def backend(cls):
+        if cls.automation is None:
+            cls.automation = create_default_automation()
+        return cls.automation
+
+    @classmethod
+    def wait_engine(cls):
+        if cls.waits is None:
+            cls.waits = WaitEngine(DELAYS, ADAPTIVE_WAITS, WAIT_POLL_INITIAL, WAIT_POLL_MAX, WAIT_TIMEOUT_MARGIN,
+                                   fixed_limits=cls.FIXED_WAIT_LIMITS)
+            if WAIT_STATS_FILE:
+                cls.waits.load(WAIT_STATS_FILE)
+        return cls.waits
+
+    @classmethod
+    def safe_get_window_text(cls, hwnd):
+        """안전하게 윈도우 제목 가져오기"""
+        try:
+            return cls.backend().get_window_text(hwnd)
+        except Exception as e:
+            print(f"윈도우 제목 가져오기 실패: {e}")
+            return ""
+
+    @classmethod
+    def get_window_rect(cls, hwnd):
+        """윈도우 크기와 위치 가져오기"""
+        try:
+            return cls.backend().get_window_rect(hwnd)
+        except Exception as e:
+            print(f"윈도우 크기 가져오기 실패: {e}")
+            return None
+
+    @classmethod
+    def click_window_area(cls, hwnd, x_ratio=0.5, y_ratio=0.4, should_stop=None):
+        """윈도우 내 특정 비율 위치 클릭 (창이 앞으로 온 것을 확인한 뒤 클릭)"""
+        try:
+            rect = cls.get_window_rect(hwnd)
+            if not rect:
+                return False
+
+            # 클릭할 절대 좌표 계산
+            click_x = rect['left'] + int(rect['width'] * x_ratio)
+            click_y = rect['top'] + int(rect['height'] * y_ratio)
+
+            # 창을 앞으로 가져오기
+            if not cls.focus_window(hwnd, should_stop):
+                return False
+
+            # 마우스 클릭 (입력 이벤트는 순서대로 처리되므로 뒤따르는 키 입력 전에 기다릴 필요 없음)
+            cls.backend().click(click_x, click_y)
+            return True
+
+        except Exception as e:
+            print(f"윈도우 클릭 실패: {e}")
+            return False
+
+    @classmethod
+    def wait_for_selection(cls, hwnd, should_stop=None):
+        """Ctrl+A 뒤 선택이 생길 때까지 대기
+
+        선택 여부를 확인할 수 없는 백엔드(Win32)는 기다리지 않습니다. 입력 이벤트는 순서대로 처리되므로
+        뒤따르는 Ctrl+C는 선택이 끝난 뒤에 처리되고, 복사가 안 되면 클립보드 변경 대기에서 걸러집니다.
+        """
+        backend = cls.backend()
+        if backend.has_selection(hwnd) is None:
+            return True
+        return cls.wait_engine().wait_for('select_wait', lambda: backend.has_selection(hwnd), should_stop)
+
+    @classmethod
+    def find_chat_area_and_click(cls, hwnd, should_stop=None):
+        """카카오톡 대화 영역을 찾아서 클릭"""
+        try:
+            rect = cls.get_window_rect(hwnd)
+            if not rect:
+                return False
+
+            for x_ratio, y_ratio in CHAT_AREA_POSITIONS:
+                try:
+                    if cls.click_window_area(hwnd, x_ratio, y_ratio, should_stop):
+                        # Ctrl+A를 눌러서 선택이 되는지 테스트
+                        if cls.safe_send_keys("^a") and cls.wait_for_selection(hwnd, should_stop):
+                            return True
+                except Exception as e:
+                    print(f"클릭 위치 시도 실패: {e}")
+                    continue
+
+            return False
+
+        except Exception as e:
+            print(f"대화 영역 찾기 실패: {e}")
+            return False
+
+    @classmethod
+    def find_input_area_and_click(cls, hwnd, should_stop=None):
+        """카카오톡 입력창을 찾아서 클릭"""
+        try:
+            rect = cls.get_window_rect(hwnd)
+            if not rect:
+                return False
+
+            for x_ratio, y_ratio in INPUT_AREA_POSITIONS:
+                try:
+                    if cls.click_window_area(hwnd, x_ratio, y_ratio, should_stop):
+                        # 입력창인지 테스트 (간단한 텍스트 입력 시도)
+                        test_text = "test"
+
+                        # 기존 내용 선택 후 테스트 텍스트 입력
+                        cls.safe_send_keys("^a")
+
+                        # 테스트 텍스트 입력
+                        cls.type_text(test_text)
+
+                        # 테스트 텍스트 삭제 (Ctrl+A 후 Delete)
+                        cls.safe_send_keys("^a")
+                        cls.backend().send_delete()
+
+                        return True  # 입력이 성공했다면 입력창으로 간주
+                except Exception as e:
+                    print(f"입력창 테스트 실패: {e}")
+                    continue
+
+            return False
+
+        except Exception as e:
+            print(f"입력창 찾기 실패: {e}")
+            return False
+
+    @classmethod
+    def safe_get_process_name(cls, hwnd):
+        """안전하게 프로세스 이름 가져오기"""
+        try:
+            return cls.backend().get_process_name(hwnd)
+        except Exception as e:
+            print(f"프로세스 이름 가져오기 실패: {e}")
+            return ""
+
+    @classmethod
+    def safe_send_keys(cls, keys, hwnd=None, should_stop=None):
+        """안전한 키 입력 (hwnd를 주면 그 창이 앞으로 온 것을 확인한 뒤 입력)"""
+        try:
+            if hwnd:
+                # 창이 여전히 유효한지 확인
+                if not cls.is_window_valid(hwnd):
+                    return False
+
+                # 창을 앞으로 가져오기 (다른 창에 단축키가 들어가지 않도록 확인될 때만 입력)
+                if not cls.focus_window(hwnd, should_stop):
+                    return False
+
+            # 키 입력
+            cls.backend().send_keys(keys)
+            return True
+        except Exception as e:
+            print(f"키 입력 실패: {e}")
+            return False
+
+    @classmethod
+    def copy_selection(cls, hwnd, should_stop=None):
+        """Ctrl+A → Ctrl+C 후 클립보드가 실제로 바뀔 때까지 기다려서 복사된 텍스트 반환 (실패하면 None)
+
+        클립보드 변경 번호를 지원하면 같은 내용을 다시 복사해도 새 복사로 인식합니다.
+        """
+        backend = cls.backend()
+        waits = cls.wait_engine()
+        try:
+            before_sequence = backend.clipboard_sequence()
+            before_text = backend.clipboard_text() if before_sequence is None else None
+
+            if not cls.safe_send_keys("^a", hwnd, should_stop):
+                return None
+            if not cls.safe_send_keys("^c", hwnd, should_stop):
+                return None
+
+            if before_sequence is not None:
+                changed = lambda: backend.clipboard_sequence() != before_sequence
+            else:
+                changed = lambda: backend.clipboard_text() != before_text
+            if not waits.wait_for('copy_wait', changed, should_stop):
+                return None
+            return backend.clipboard_text()
+        except Exception as e:
+            print(f"복사 실패: {e}")
+            return None
+
+    @classmethod
+    def type_text(cls, text, hwnd=None, should_stop=None):
+        """텍스트 직접 입력 (유니코드 키 이벤트를 묶어서 한 번에 보냄, hwnd를 주면 그 창이 앞으로 온 것을 확인한 뒤 입력)"""
+        try:
+            if hwnd and not (cls.is_window_valid(hwnd) and cls.focus_window(hwnd, should_stop)):
+                return False
+            cls.backend().type_text(text, TYPE_CHUNK_UNITS)
+            return True
+        except Exception as e:
+            print(f"문자 입력 실패: {e}")
+            return False
+
+    @classmethod
+    def send_enter(cls):
+        """엔터 키 입력"""
+        try:
+            cls.backend().send_enter()
+            return True
+        except Exception as e:
+            print(f"엔터 입력 실패: {e}")
+            return False
+
+    @classmethod
+    def is_window_valid(cls, hwnd):
+        """윈도우가 유효한지 확인"""
+        try:
+            return cls.backend().is_window(hwnd)
+        except:
+            return False
+
+    @classmethod
+    def focus_window(cls, hwnd, should_stop=None):
+        """윈도우에 포커스 설정 (실제로 앞으로 올 때까지 대기, 이미 앞에 있으면 바로 반환)"""
+        try:
+            backend = cls.backend()
+            if backend.foreground_window() == hwnd:
+                return True
+            backend.set_foreground(hwnd)
+            return cls.wait_engine().wait_for('focus_wait', lambda: backend.foreground_window() == hwnd,
+                                              should_stop)
+        except Exception as e:
+            print(f"포커스 설정 실패: {e}")
+            return False
+
+
+# 사용 예시 및 벤치마크 함수
+def benchmark_fetch_waits(runs=20):
+    """가상 백엔드로 대화 가져오기(클릭 → 전체 선택 → 복사) 대기 시간 비교: 상태 확인 vs 고정 sleep"""
+    from .automation import SimulatedAutomation, SimulatedWindow
+    from .wait_engine import SimulatedClock
+
+    chat_text = "김철수 [오후 2:30] 저녁 뭐 먹지\n이영희 [오후 2:31] 치킨"
+    results = {}
+    for adaptive in (False, True):
+        clock = SimulatedClock()
+        backend = SimulatedAutomation(clock)
+        waits = WaitEngine(DELAYS, adaptive, WAIT_POLL_INITIAL, WAIT_POLL_MAX, WAIT_TIMEOUT_MARGIN,
+                           fixed_limits=SafeWindowHandler.FIXED_WAIT_LIMITS, clock=clock.now, sleep=clock.sleep)
+        SafeWindowHandler.set_automation(backend, waits)
+        window = backend.add_window(SimulatedWindow(100, "친구들", (0, 0, 400, 600), chat_text))
+        backend.add_window(SimulatedWindow(200, "메모장", (500, 0, 900, 600), process_name="notepad.exe"))
+
+        elapsed = []
+        for run in range(runs):
+            backend.foreground = 200  # 다른 창이 앞에 있는 상태에서 시작
+            window.chat_text = f"{chat_text}\n박민수 [오후 2:{32 + run}] ㅋㅋ"
+            start = clock.now()
+            assert SafeWindowHandler.find_chat_area_and_click(100)
+            assert SafeWindowHandler.copy_selection(100) == window.chat_text
+            elapsed.append(clock.now() - start)
+
+        label = "상태 확인" if adaptive else "고정 sleep"
+        results[label] = sum(elapsed) / runs
+        print(f"{label}: 평균 {results[label] * 1000:.0f}ms (처음 {elapsed[0] * 1000:.0f}ms / 마지막 {elapsed[-1] * 1000:.0f}ms)")
+        if adaptive:
+            print(waits.stats_text())
+
+    SafeWindowHandler.set_automation(None)
+    return results
+
+
+def test_focus_guard():
+    """카카오톡 창이 앞으로 오지 않으면 클릭 / 단축키 / 직접 입력을 모두 하지 않는지 확인 (가상 백엔드)"""
+    from .automation import SimulatedAutomation, SimulatedWindow
+    from .wait_engine import SimulatedClock
+
+    clock = SimulatedClock()
+    backend = SimulatedAutomation(clock, focus_latency=60.0)  # 앞으로 오지 않는 창 (다른 프로그램이 포커스를 막음)
+    waits = WaitEngine(DELAYS, True, WAIT_POLL_INITIAL, WAIT_POLL_MAX, WAIT_TIMEOUT_MARGIN,
+                       fixed_limits=SafeWindowHandler.FIXED_WAIT_LIMITS, clock=clock.now, sleep=clock.sleep)
+    SafeWindowHandler.set_automation(backend, waits)
+    kakao = backend.add_window(SimulatedWindow(100, "친구들", (0, 0, 400, 600)))
+    notepad = backend.add_window(SimulatedWindow(200, "메모장", (500, 0, 900, 600), process_name="notepad.exe"))
+    notepad.area, notepad.input_text = "input", "메모 내용"
+
+    backend.foreground = 200
+    assert not SafeWindowHandler.click_window_area(100, 0.5, 0.85)
+    assert not SafeWindowHandler.safe_send_keys("^a", 100)
+    assert not SafeWindowHandler.type_text("ㅇㅇ 좋지", 100)
+    assert notepad.input_text == "메모 내용" and not notepad.input_selected and backend.input_calls == 0
+
+    # 포커스가 빨리 옮겨지는 창에서는 입력되고, 여러 번 빨리 성공해도 포커스 대기 상한은 설정값 유지
+    clock.sleep(60.0)  # 막혀 있던 포커스 요청이 모두 처리된 뒤
+    backend.focus_latency = 0.01
+    for _ in range(10):
+        backend.foreground = 200
+        assert SafeWindowHandler.click_window_area(100, 0.5, 0.85)
+    assert SafeWindowHandler.type_text("ㅇㅇ 좋지", 100) and kakao.input_text == "ㅇㅇ 좋지"
+    assert waits.timeout('focus_wait') == DELAYS['focus_wait']
+    SafeWindowHandler.set_automation(None)
+    print("포커스 확인 테스트 통과")
+
+
+if __name__ == "__main__":
+    test_focus_guard()
+    benchmark_fetch_waits()
@@ -0,0 +1,87 @@
+# window_scanner.py - 카카오톡 창 목록 관리 (창 생성 / 종료 / 제목 변경 이벤트로 바로 갱신)
+
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+from .window_handler import SafeWindowHandler
+from .window_tracker import WindowDiff, WindowTracker, create_default_event_source
+
+
+class WindowListSignal(QObject):
+    """이벤트 스레드에서 창 목록 변경분(WindowDiff)을 UI 스레드로 전달"""
+    windows_found = pyqtSignal(object)
+
+
+class WindowManager:
+    """윈도우 관리 클래스"""
+
+    def __init__(self, backend=None, events=None):
+        self.kakao_windows = {}  # hwnd → 창 정보 (발견한 순서)
+        self.selected_window = None
+        self.signal = WindowListSignal()
+        self.backend = backend
+        self.events = events
+        self.tracker = None
+
+    def start_scanning(self, callback):
+        """창 추적 시작 (처음 한 번 전체 창을 확인하고, 그 뒤로는 창 이벤트로 갱신)"""
+        self.signal.windows_found.connect(callback)
+        if self.tracker is not None:
+            return
+
+        def start():
+            try:
+                backend = self.backend or SafeWindowHandler.backend()
+                events = self.events or create_default_event_source()
+                self.tracker = WindowTracker(backend, events, self.signal.windows_found.emit)
+                self.tracker.start()
+            except Exception as e:
+                print(f"창 추적 시작 오류: {e}")
+                self.signal.windows_found.emit(WindowDiff())
+
+        threading.Thread(target=start, name="window-tracker-start", daemon=True).start()
+
+    def rescan(self):
+        """전체 창 다시 확인 (새로고침 버튼)"""
+        if self.tracker:
+            threading.Thread(target=self.tracker.rescan, name="window-rescan", daemon=True).start()
+
+    def stop_scanning(self):
+        """창 추적 중지"""
+        if self.tracker:
+            self.tracker.stop()
+
+    def update_windows(self, diff):
+        """창 목록 변경분 반영"""
+        for window in diff.removed:
+            self.kakao_windows.pop(window['hwnd'], None)
+        for window in diff.renamed + diff.added:
+            self.kakao_windows[window['hwnd']] = window
+
+    def select_window(self, window_data):
+        """창 선택"""
+        self.selected_window = window_data
+        if window_data:
+            print(f"선택된 창: {window_data['title']}")
+
+    def get_selected_hwnd(self):
+        """선택된 창의 핸들 반환"""
+        if self.selected_window:
+            return self.selected_window['hwnd']
+        return None
+
+    def is_selected_window_valid(self):
+        """선택된 창이 유효한지 확인"""
+        hwnd = self.get_selected_hwnd()
+        if hwnd:
+            return SafeWindowHandler.is_window_valid(hwnd)
+        return False
+
+    def get_window_list(self):
+        """창 목록 반환"""
+        return list(self.kakao_windows.values())
+
+    def format_window_title(self, title, max_length=30):
+        """창 제목 포맷팅"""
+        if len(title) > max_length:
+            return title[:max_length - 3] + "..."
+        return title
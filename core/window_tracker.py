@@ -0,0 +1,541 @@
+# window_tracker.py - 창 생성 / 종료 / 제목 변경 이벤트로 카카오톡 창 목록 유지 (주기적인 전체 스캔 없음)
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 카카오톡과 관계없는 시스템 창 클래스 (제목이 있어도 프로세스를 확인하지 않고 건너뜀)
+IGNORED_WINDOW_CLASSES = frozenset({
+    "Shell_TrayWnd", "Shell_SecondaryTrayWnd", "Progman", "WorkerW", "Windows.UI.Core.CoreWindow",
+    "ApplicationFrameWindow", "IME", "MSCTFIME UI", "tooltips_class32", "ConsoleWindowClass",
+})
+
+
+def is_kakao_title(title: str) -> bool:
+    return '카카오톡' in title
+
+
+def is_kakao_process(process_name: str) -> bool:
+    return 'kakao' in process_name.lower()  # kakaotalk.exe 포함
+
+
+def is_kakao_window(title: str, process_name: str) -> bool:
+    """카카오톡 창인지 판단"""
+    kakao_indicators = [
+        is_kakao_process(process_name),
+        is_kakao_title(title),
+        # 카카오톡 대화방 제목 패턴 추가 가능
+    ]
+    return any(kakao_indicators)
+
+
+class ProcessNameCache:
+    """pid → 실행 파일 이름 캐시
+
+    창마다 OpenProcess / GetProcessImageFileNameW / CloseHandle을 부르지 않고 프로세스마다 한 번만 조회합니다.
+    pid는 프로세스가 끝나면 다시 쓰일 수 있으므로, 종료 이벤트(invalidate)와 함께 전체 스캔 세대로도 확인합니다.
+    (스캔마다 세대가 올라가고, 이번 스캔에서 창이 하나도 없던 pid는 스캔이 끝날 때 지움)
+    """
+
+    def __init__(self, resolve: Callable[[int], str]):
+        self.resolve = resolve
+        self.names: Dict[int, Tuple[str, int]] = {}  # pid → (이름, 마지막으로 본 세대)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, pid: int) -> Optional[str]:
+        """캐시에 있으면 이름, 없으면 None"""
+        with self._lock:
+            entry = self.names.get(pid)
+            if entry is None:
+                return None
+            self.hits += 1
+            self.names[pid] = (entry[0], self.generation)
+            return entry[0]
+
+    def lookup(self, pid: int) -> str:
+        name = self.get(pid)
+        if name is None:
+            name = self.resolve(pid)
+            with self._lock:
+                self.misses += 1
+                self.names[pid] = (name, self.generation)
+        return name
+
+    def invalidate(self, pid: int):
+        with self._lock:
+            self.names.pop(pid, None)
+
+    def begin_scan(self):
+        with self._lock:
+            self.generation += 1
+
+    def end_scan(self) -> int:
+        """이번 스캔에서 보지 못한 pid 정리, 지운 개수 반환"""
+        with self._lock:
+            stale = [pid for pid, (_, seen) in self.names.items() if seen != self.generation]
+            for pid in stale:
+                del self.names[pid]
+            return len(stale)
+
+
+def inspect_window(backend, hwnd, cache: ProcessNameCache) -> Optional[Dict]:
+    """대상 창이면 창 정보, 아니면 None
+
+    싼 확인부터 합니다: 표시 여부 → 제목 → 창 클래스 → (제목에 "카카오톡"이 없을 때만) 프로세스 이름.
+    제목으로 판단한 창은 프로세스 이름을 조회하지 않으므로 캐시에 없으면 'process'가 빈 문자열입니다.
+    """
+    if not backend.is_window_visible(hwnd):
+        return None
+    title = backend.get_window_text(hwnd)
+    if not title:
+        return None
+    if backend.get_class_name(hwnd) in IGNORED_WINDOW_CLASSES:
+        return None
+
+    pid = backend.get_window_pid(hwnd)
+    if is_kakao_title(title):
+        process_name = cache.get(pid) or ""
+    else:
+        process_name = cache.lookup(pid)
+        if not is_kakao_process(process_name):
+            return None
+    return {'hwnd': hwnd, 'title': title, 'process': process_name, 'pid': pid}
+
+
+def scan_windows(backend, cache: ProcessNameCache) -> Dict[int, Dict]:
+    """전체 창을 훑어서 hwnd → 창 정보 (Z 순서)"""
+    cache.begin_scan()
+    windows = {}
+    for hwnd in backend.enum_windows():
+        try:
+            window = inspect_window(backend, hwnd, cache)
+        except Exception as e:
+            print(f"창 열거 중 오류: {e}")
+            continue
+        if window:
+            windows[hwnd] = window
+    cache.end_scan()
+    return windows
+
+
+class WindowDiff:
+    """창 목록 변경 내용 (추가 / 삭제 / 제목 변경된 창 정보 목록)"""
+
+    def __init__(self, added=None, removed=None, renamed=None):
+        self.added: List[Dict] = added or []
+        self.removed: List[Dict] = removed or []
+        self.renamed: List[Dict] = renamed or []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.renamed)
+
+    def __repr__(self):
+        return f"WindowDiff(추가 {len(self.added)}, 삭제 {len(self.removed)}, 제목 변경 {len(self.renamed)})"
+
+
+def diff_windows(old: Dict[int, Dict], new: Dict[int, Dict]) -> WindowDiff:
+    diff = WindowDiff()
+    for hwnd, window in old.items():
+        if hwnd not in new:
+            diff.removed.append(window)
+    for hwnd, window in new.items():
+        previous = old.get(hwnd)
+        if previous is None:
+            diff.added.append(window)
+        elif previous['title'] != window['title']:
+            diff.renamed.append(window)
+    return diff
+
+
+class WindowEventSource:
+    """창 이벤트 기본 클래스
+
+    callback(kind, value)로 알립니다. kind는 "created" / "shown" / "renamed" / "hidden" / "destroyed"(value는 hwnd)와
+    "process_exited"(value는 pid)입니다. 콜백은 이벤트 스레드에서 호출됩니다.
+    """
+
+    def start(self, callback: Callable[[str, int], None]):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+    def watch_process(self, pid: int):
+        """pid가 종료되면 "process_exited" 이벤트를 보내도록 등록"""
+        pass
+
+
+class Win32WindowEventSource(WindowEventSource):
+    """SetWinEventHook으로 창 생성 / 종료 / 표시 / 숨김 / 제목 변경을 받음 (전용 스레드의 메시지 루프)
+
+    프로세스 종료는 RegisterWaitForSingleObject로 받습니다.
+    """
+
+    EVENT_KINDS = {
+        0x8000: "created",  # EVENT_OBJECT_CREATE
+        0x8001: "destroyed",  # EVENT_OBJECT_DESTROY
+        0x8002: "shown",  # EVENT_OBJECT_SHOW
+        0x8003: "hidden",  # EVENT_OBJECT_HIDE
+        0x800C: "renamed",  # EVENT_OBJECT_NAMECHANGE
+    }
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._WinEventProc = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                                wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        self._WaitCallback = ctypes.WINFUNCTYPE(None, ctypes.c_void_p, wintypes.BOOLEAN)
+        self._user32.SetWinEventHook.restype = wintypes.HANDLE
+        self._user32.SetWinEventHook.argtypes = [wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE,
+                                                 self._WinEventProc, wintypes.DWORD, wintypes.DWORD, wintypes.DWORD]
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+        self.callback = None
+        self._thread = None
+        self._thread_id = None
+        self._waits: Dict[int, tuple] = {}  # pid → (프로세스 핸들, 대기 핸들, 콜백)
+        self._exited: List[tuple] = []  # 종료 알림이 끝난 대기 (콜백 안에서는 해제할 수 없으므로 다음에 정리)
+        self._lock = threading.Lock()
+
+    def start(self, callback):
+        self.callback = callback
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="window-events", daemon=True)
+        self._thread.start()
+        ready.wait(1.0)
+
+    def _run(self, ready):
+        ctypes, wintypes = self._ctypes, self._wintypes
+        self._thread_id = self._kernel32.GetCurrentThreadId()
+        procedure = self._WinEventProc(self._on_event)  # 참조를 유지해야 콜백이 해제되지 않음
+        flags = 0x0000 | 0x0002  # WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        hooks = [self._user32.SetWinEventHook(0x8000, 0x8003, None, procedure, 0, 0, flags),
+                 self._user32.SetWinEventHook(0x800C, 0x800C, None, procedure, 0, 0, flags)]
+        ready.set()
+
+        msg = wintypes.MSG()
+        while self._user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            self._user32.TranslateMessage(ctypes.byref(msg))
+            self._user32.DispatchMessageW(ctypes.byref(msg))
+
+        for hook in hooks:
+            if hook:
+                self._user32.UnhookWinEvent(hook)
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        # 창 자체의 이벤트만 (OBJID_WINDOW / CHILDID_SELF), 컨트롤 내부 항목 이벤트는 무시
+        if not hwnd or id_object != 0 or id_child != 0:
+            return
+        kind = self.EVENT_KINDS.get(event)
+        if kind and self.callback:
+            try:
+                self.callback(kind, hwnd)
+            except Exception as e:
+                print(f"창 이벤트 처리 오류: {e}")
+
+    def _release(self, entry):
+        handle, wait, _ = entry
+        self._kernel32.UnregisterWait(wait)
+        self._kernel32.CloseHandle(handle)
+
+    def watch_process(self, pid):
+        with self._lock:
+            exited, self._exited = self._exited, []
+        for entry in exited:
+            self._release(entry)
+
+        with self._lock:
+            if pid in self._waits:
+                return
+            handle = self._kernel32.OpenProcess(0x00100000, False, pid)  # SYNCHRONIZE
+            if not handle:
+                return
+            wait = self._wintypes.HANDLE()
+
+            def exited(context, timed_out):
+                with self._lock:
+                    entry = self._waits.pop(pid, None)
+                    if entry:
+                        self._exited.append(entry)
+                if self.callback:
+                    self.callback("process_exited", pid)
+
+            callback = self._WaitCallback(exited)
+            if not self._kernel32.RegisterWaitForSingleObject(self._ctypes.byref(wait), handle, callback, None,
+                                                              0xFFFFFFFF, 0x00000008):  # INFINITE, WT_EXECUTEONLYONCE
+                self._kernel32.CloseHandle(handle)
+                return
+            self._waits[pid] = (handle, wait, callback)
+
+    def stop(self):
+        if self._thread_id:
+            self._user32.PostThreadMessageW(self._thread_id, 0x0012, 0, 0)  # WM_QUIT
+            self._thread.join(1.0)
+            self._thread_id = None
+        with self._lock:
+            entries = list(self._waits.values()) + self._exited
+            self._waits, self._exited = {}, []
+        for entry in entries:
+            self._release(entry)
+
+
+class SimulatedWindowEventSource(WindowEventSource):
+    """테스트용 이벤트 원천 (emit하면 바로 콜백 호출)"""
+
+    def __init__(self):
+        self.callback = None
+        self.watched = set()
+
+    def start(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        self.callback = None
+
+    def watch_process(self, pid):
+        self.watched.add(pid)
+
+    def emit(self, kind: str, value: int):
+        if self.callback:
+            self.callback(kind, value)
+
+    def exit_process(self, pid: int):
+        """감시 중인 프로세스 종료 알림"""
+        if pid in self.watched:
+            self.watched.discard(pid)
+            self.emit("process_exited", pid)
+
+
+def create_default_event_source() -> WindowEventSource:
+    """Windows 창 이벤트 원천 생성"""
+    return Win32WindowEventSource()
+
+
+class WindowTracker:
+    """이벤트로 카카오톡 창 목록을 유지하고, 바뀔 때마다 on_change(WindowDiff) 호출
+
+    처음 시작할 때와 새로고침할 때만 전체 창을 훑고, 그 뒤에는 이벤트가 온 창만 다시 확인합니다.
+    """
+
+    def __init__(self, backend, events: WindowEventSource, on_change: Callable[[WindowDiff], None]):
+        self.backend = backend
+        self.events = events
+        self.on_change = on_change
+        self.cache = ProcessNameCache(backend.get_process_image_name)
+        self.windows: Dict[int, Dict] = {}
+        self._lock = threading.RLock()
+
+    def start(self):
+        self.events.start(self.handle_event)
+        self.rescan()
+
+    def stop(self):
+        self.events.stop()
+
+    def window_list(self) -> List[Dict]:
+        with self._lock:
+            return list(self.windows.values())
+
+    def _watch_new_processes(self, before: int):
+        """새로 조회한 pid는 종료 이벤트를 받도록 등록"""
+        if self.cache.misses != before:
+            for pid in list(self.cache.names):
+                self.events.watch_process(pid)
+
+    def _refresh(self, hwnd) -> WindowDiff:
+        """창 하나 다시 확인"""
+        before = self.cache.misses
+        try:
+            window = None
+            if self.backend.is_window(hwnd) and self.backend.is_top_level(hwnd):
+                window = inspect_window(self.backend, hwnd, self.cache)
+        except Exception as e:
+            print(f"창 확인 중 오류: {e}")
+            window = None
+        self._watch_new_processes(before)
+
+        previous = self.windows.get(hwnd)
+        if window is None:
+            if previous is None:
+                return WindowDiff()
+            del self.windows[hwnd]
+            return WindowDiff(removed=[previous])
+        self.windows[hwnd] = window
+        if previous is None:
+            return WindowDiff(added=[window])
+        if previous['title'] != window['title']:
+            return WindowDiff(renamed=[window])
+        return WindowDiff()
+
+    def rescan(self):
+        """전체 창 다시 확인 (시작할 때 / 새로고침 버튼), 바뀐 것이 없어도 on_change 호출"""
+        with self._lock:
+            before = self.cache.misses
+            windows = scan_windows(self.backend, self.cache)
+            self._watch_new_processes(before)
+            diff = diff_windows(self.windows, windows)
+            self.windows = windows
+        self.on_change(diff)
+
+    def handle_event(self, kind: str, value: int):
+        with self._lock:
+            if kind in ("created", "shown", "renamed"):
+                diff = self._refresh(value)
+            elif kind in ("hidden", "destroyed"):
+                window = self.windows.pop(value, None)
+                diff = WindowDiff(removed=[window] if window else [])
+            elif kind == "process_exited":
+                # pid는 다시 쓰일 수 있으므로 캐시에서 지우고, 그 프로세스의 창도 목록에서 뺌
+                self.cache.invalidate(value)
+                closed = [hwnd for hwnd, window in self.windows.items() if window['pid'] == value]
+                diff = WindowDiff(removed=[self.windows.pop(hwnd) for hwnd in closed])
+            else:
+                diff = WindowDiff()
+        if diff:
+            self.on_change(diff)
+
+
+# 사용 예시 및 테스트 함수
+def test_window_tracker():
+    """가상 이벤트로 창 추가 / 제목 변경 / 종료 / 프로세스 종료 처리 테스트"""
+    from .automation import SimulatedAutomation, SimulatedWindow
+
+    backend = SimulatedAutomation()
+    events = SimulatedWindowEventSource()
+    changes = []
+    tracker = WindowTracker(backend, events, changes.append)
+
+    backend.add_window(SimulatedWindow(1, "카카오톡", (0, 0, 400, 600), pid=100))
+    backend.add_window(SimulatedWindow(2, "메모장", (0, 0, 400, 600), process_name="notepad.exe", pid=200))
+    tracker.start()
+    assert [window['hwnd'] for window in changes[-1].added] == [1]
+    assert backend.process_lookups == 1  # 제목이 "카카오톡"인 창은 프로세스를 조회하지 않음
+
+    # 새 대화방 창 (제목만으로는 알 수 없어 프로세스 이름 조회)
+    backend.add_window(SimulatedWindow(3, "친구들", (0, 0, 400, 600), pid=100))
+    started = time.perf_counter()
+    events.emit("created", 3)
+    latency = time.perf_counter() - started
+    assert [window['title'] for window in changes[-1].added] == ["친구들"]
+    assert backend.process_lookups == 2
+
+    # 관계없는 창의 이벤트는 목록을 바꾸지 않음
+    count = len(changes)
+    events.emit("renamed", 2)
+    assert len(changes) == count and backend.process_lookups == 2
+
+    backend.windows[3].title = "친구들 (3)"
+    events.emit("renamed", 3)
+    assert changes[-1].renamed[0]['title'] == "친구들 (3)" and not changes[-1].added
+
+    backend.remove_window(3)
+    events.emit("destroyed", 3)
+    assert [window['hwnd'] for window in changes[-1].removed] == [3]
+
+    # 프로세스가 끝나면 캐시에서 지움 (같은 pid를 카카오톡이 다시 써도 이전 이름을 쓰지 않음)
+    backend.remove_window(1)
+    events.exit_process(100)
+    assert changes[-1].removed[0]['hwnd'] == 1 and tracker.cache.get(100) is None
+    backend.remove_window(2)
+    events.exit_process(200)
+    backend.processes[200] = "kakaotalk.exe"
+    backend.add_window(SimulatedWindow(4, "친구들", (0, 0, 400, 600), pid=200))
+    events.emit("created", 4)
+    assert changes[-1].added[0]['process'] == "kakaotalk.exe"
+
+    # 스캔에서 창이 없던 pid는 세대 확인으로 정리
+    backend.add_window(SimulatedWindow(5, "계산기", (0, 0, 400, 600), process_name="calc.exe", pid=300))
+    tracker.rescan()
+    assert tracker.cache.get(300) == "calc.exe"
+    backend.remove_window(5)
+    tracker.rescan()
+    assert tracker.cache.get(300) is None and not changes[-1]
+
+    print(f"창 추적 테스트 통과 (새 창 반영 {latency * 1000:.3f}ms, 10초 주기 스캔은 평균 5000ms 뒤 반영, "
+          f"프로세스 이름 조회 {backend.process_lookups}번)")
+
+
+def _legacy_scan(backend) -> List[Dict]:
+    """예전 방식: 보이는 창마다 프로세스 이름 조회, 전체 목록 반환"""
+    windows = []
+    for hwnd in backend.enum_windows():
+        if not backend.is_window_visible(hwnd):
+            continue
+        title = backend.get_window_text(hwnd)
+        if not title:
+            continue
+        process_name = backend.get_process_name(hwnd)
+        if is_kakao_window(title, process_name):
+            windows.append({'hwnd': hwnd, 'title': title, 'process': process_name})
+    return windows
+
+
+def benchmark_window_scan(window_count: int = 200, runs: int = 20, lookup_cost: float = 0.0002):
+    """가상 창 window_count개 스캔 비교: 예전 방식 vs 창 클래스 / 제목 우선 확인 + pid 캐시 + 변경분만 반환
+
+    프로세스 이름 조회 한 번에 lookup_cost초(OpenProcess + GetProcessImageFileNameW + CloseHandle)가 걸린다고 보고,
+    콤보 상자 작업 수는 예전 방식이 전체 다시 채우기(clear + 항목 수), 새 방식은 변경분 수입니다.
+    """
+    from .automation import SimulatedAutomation, SimulatedWindow
+    from .wait_engine import SimulatedClock
+
+    def build():
+        clock = SimulatedClock()
+        backend = SimulatedAutomation(clock, process_lookup_cost=lookup_cost)
+        backend.add_window(SimulatedWindow(1, "카카오톡", (0, 0, 400, 600), pid=100))
+        for room in range(4):
+            backend.add_window(SimulatedWindow(2 + room, f"대화방 {room}", (0, 0, 400, 600), pid=100))
+        for index in range(window_count - 5):
+            hwnd = 1000 + index
+            pid = 2000 + index % 40  # 프로세스 40개
+            visible = index % 3 != 0
+            title = f"창 {index}" if index % 4 != 0 else ""
+            class_name = "Shell_TrayWnd" if index % 25 == 0 else "Chrome_WidgetWin_1"
+            backend.add_window(SimulatedWindow(hwnd, title, (0, 0, 100, 100), process_name=f"app{pid}.exe",
+                                               pid=pid, visible=visible, class_name=class_name))
+        return clock, backend
+
+    # 예전 방식
+    clock, backend = build()
+    started = time.perf_counter()
+    combo_ops = 0
+    for _ in range(runs):
+        windows = _legacy_scan(backend)
+        combo_ops += 1 + len(windows)
+    legacy_wall = (time.perf_counter() - started) / runs
+    legacy_lookups = backend.process_lookups / runs
+    legacy_cost = clock.now() / runs
+    print(f"예전 방식: 스캔당 프로세스 조회 {legacy_lookups:.0f}번 (약 {legacy_cost * 1000:.1f}ms), "
+          f"파이썬 {legacy_wall * 1000:.2f}ms, 콤보 작업 {combo_ops / runs:.0f}번")
+
+    # 새 방식 (첫 스캔 이후에는 제목 하나가 바뀐 상태에서 다시 스캔)
+    clock, backend = build()
+    cache = ProcessNameCache(backend.get_process_image_name)
+    current = scan_windows(backend, cache)
+    first_lookups = backend.process_lookups
+    first_cost = clock.now()
+    started = time.perf_counter()
+    combo_ops = 0
+    for run in range(runs):
+        backend.windows[2].title = f"대화방 0 ({run + 1})"
+        windows = scan_windows(backend, cache)
+        diff = diff_windows(current, windows)
+        current = windows
+        combo_ops += len(diff.added) + len(diff.removed) + len(diff.renamed)
+    new_wall = (time.perf_counter() - started) / runs
+    new_lookups = (backend.process_lookups - first_lookups) / runs
+    print(f"새 방식: 첫 스캔 프로세스 조회 {first_lookups}번, 이후 스캔당 {new_lookups:.0f}번 "
+          f"(약 {(clock.now() - first_cost) / runs * 1000:.1f}ms), "
+          f"파이썬 {new_wall * 1000:.2f}ms, 콤보 작업 {combo_ops / runs:.0f}번")
+    return legacy_lookups, new_lookups
+
+
+if __name__ == "__main__":
+    test_window_tracker()
+    benchmark_window_scan()
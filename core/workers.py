@@ -0,0 +1,149 @@
+# workers.py - 대화 가져오기 / 분석 / 답변 생성을 UI 스레드 밖에서 실행하는 작업 스레드
+
+import threading
+import time
+from typing import Callable, Iterable, List
+
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+
+class TaskCancelled(Exception):
+    """작업이 취소되었을 때 작업 함수 안에서 발생"""
+    pass
+
+
+class TaskWorker(QThread):
+    """함수 하나를 별도 스레드에서 실행하는 작업 스레드
+
+    task(worker)는 작업 스레드에서 실행되며 worker.report / worker.emit_partial로 진행 상황을 알리고,
+    worker.sleep / worker.check_cancelled로 취소 여부를 확인합니다.
+    시그널은 UI 객체의 메서드에 연결하면 UI 스레드에서 실행됩니다.
+    """
+    progress = pyqtSignal(str, str)  # 상태 메시지, 상태 종류 (info/success/warning/error)
+    partial = pyqtSignal(object)  # 중간 결과 (톤별 답변 등)
+    succeeded = pyqtSignal(object)  # 최종 결과
+    failed = pyqtSignal(object)  # 발생한 예외
+    cancelled = pyqtSignal()
+
+    def __init__(self, task: Callable[['TaskWorker'], object], parent=None):
+        super().__init__(parent)
+        self.task = task
+        self._cancel_event = threading.Event()
+
+        # 끝난 작업 스레드는 자동 정리
+        self.finished.connect(self.deleteLater)
+
+    def cancel(self):
+        """작업 취소 요청 (진행 중인 네트워크 요청은 결과를 버림)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+
+    def sleep(self, seconds: float):
+        """취소되면 바로 깨어나는 time.sleep"""
+        if self._cancel_event.wait(seconds):
+            raise TaskCancelled()
+
+    def report(self, message: str, kind: str = "info"):
+        if not self.is_cancelled():
+            self.progress.emit(message, kind)
+
+    def emit_partial(self, result):
+        if not self.is_cancelled():
+            self.partial.emit(result)
+
+    def run(self):
+        try:
+            result = self.task(self)
+        except TaskCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            print(f"작업 스레드 오류: {e}")
+            if not self.is_cancelled():
+                self.failed.emit(e)
+            return
+
+        if self.is_cancelled():
+            self.cancelled.emit()
+        else:
+            self.succeeded.emit(result)
+
+
+# 종료할 때 제한 시간 안에 끝나지 않은 작업 스레드 (실행 중인 QThread가 삭제되지 않도록 참조 유지)
+_detached_workers: List[TaskWorker] = []
+
+
+def shutdown_workers(workers: Iterable[TaskWorker], timeout_ms: int = 2000) -> int:
+    """작업 스레드를 모두 취소하고 합쳐서 timeout_ms까지 끝나기를 기다림, 아직 실행 중인 스레드 수 반환
+
+    실행 중인 QThread가 부모 위젯과 함께 삭제되면 프로그램이 비정상 종료되므로,
+    끝나지 않은 스레드는 부모에서 떼어내고 참조를 유지합니다.
+    """
+    workers = [worker for worker in workers if worker]
+    for worker in workers:
+        worker.cancel()
+
+    deadline = time.monotonic() + timeout_ms / 1000
+    still_running = 0
+    for worker in workers:
+        remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+        try:
+            if worker.wait(remaining_ms):
+                continue
+            worker.setParent(None)
+        except RuntimeError:
+            # 이미 끝나서 deleteLater로 삭제된 스레드
+            continue
+        _detached_workers.append(worker)
+        still_running += 1
+    return still_running
+
+
+class FrameTimeProbe(QObject):
+    """UI 스레드 응답성 측정 (interval_ms마다 타이머를 돌려 실제 호출 간격을 기록)
+
+    작업 중 UI 스레드가 막히면 간격이 길어지므로, 최대 간격이 곧 UI가 멈춘 최대 시간입니다.
+    """
+
+    def __init__(self, interval_ms: int = 16, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._tick)
+        self.reset()
+
+    def reset(self):
+        self.last_tick = None
+        self.tick_count = 0
+        self.total_gap = 0.0
+        self.max_gap = 0.0
+
+    def start(self):
+        self.reset()
+        self.last_tick = time.perf_counter()
+        self.timer.start(self.interval_ms)
+
+    def stop(self) -> str:
+        """측정 중지 후 요약 문자열 반환"""
+        self.timer.stop()
+        return self.summary()
+
+    def _tick(self):
+        now = time.perf_counter()
+        gap = (now - self.last_tick) * 1000
+        self.last_tick = now
+        self.tick_count += 1
+        self.total_gap += gap
+        self.max_gap = max(self.max_gap, gap)
+
+    def summary(self) -> str:
+        if not self.tick_count:
+            return "UI 프레임 간격: 측정 없음"
+        average = self.total_gap / self.tick_count
+        return f"UI 프레임 간격: 평균 {average:.1f}ms / 최대 {self.max_gap:.1f}ms ({self.tick_count}회)"